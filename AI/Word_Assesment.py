@@ -1,14 +1,272 @@
 import os
 import json
+import logging
+import asyncio
+import heapq
+import itertools
 import re
-from typing import Dict, Any, Tuple, List
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Dict, Any, Tuple, List, Callable, Optional, Iterator
+
+from score_cache import ScoreCache
+from spell_checker import SpellChecker
+from word_frequency import WordFrequencyIndex
+from spelling_complexity import SpellingComplexityScorer
+from single_flight import SingleFlight
+from llm_stats import LLMCallStats
+from answer_index import AnswerIndex, AnswerIndexStore
+from embedding_compatibility import EmbeddingCompatibilityScorer
+from llm_scheduler import LLMScheduler, INTERACTIVE
+from plurals import word_forms
+
+logger = logging.getLogger(__name__)
+
+# How many LLM scoring calls may be in flight at once for a single round
+DEFAULT_MAX_CONCURRENCY = 5
+
+# together  - one combined rubric call per player
+# separately - one call per criterion per player
+# batch     - one combined rubric call for the whole round
+SCORING_MODES = ("together", "separately", "batch")
+
+# Large lobbies score each distinct word once, this many words per batched call
+LARGE_LOBBY_BATCH_SIZE = 25
+# Players ranked in a large lobby's leaderboard, the rest are only scored
+DEFAULT_LEADERBOARD_SIZE = 10
+
+# Ties are broken on the sub-scores the round already has, best first, spelling as the negated penalty.
+# A criterion missing for any tied player is skipped rather than guessed
+TIE_BREAK_CRITERIA = ("compatibility", "complexity", "commonality", "spelling")
+# Distinct words still tied after that go to one pairwise LLM call, past this many they share the win
+TIE_BREAK_MAX_WORDS = 8
+
+# Fast mode turns reasoning off, caps the reply length and constrains it to a JSON schema.
+# Output token caps per operation, batch is per word in the round
+FAST_MODE_MAX_TOKENS = {
+    "commonality": 24,
+    "complexity": 24,
+    "compatibility": 24,
+    "combined": 24,
+    "spelling": 4,
+    "batch": 20,
+    "prompt": 80,
+    "answers": 600,
+    "tie_break": 12,
+}
+
+# Extra attempts in fast mode when a reply doesn't decode to a score in range
+FAST_MODE_MAX_RETRIES = 2
+
+# Score every rubric can produce, anything outside is a bad reply
+SCORE_RANGES = {
+    "commonality": (1, 10),
+    "complexity": (1, 7),
+    "compatibility": (1, 15),
+    "combined": (-2, 32),
+}
+
+DEFAULT_SCORE = 5.0
+
+# What the local estimators fall back to for prompt compatibility (1-15) when the LLM missed the deadline
+ESTIMATED_COMPATIBILITY = 8.0
+ESTIMATED_COMPATIBILITY_IN_PROMPT = 12.0
+
+SCORE_SCHEMA = {
+    "type": "object",
+    "properties": {"id": {"type": ["integer", "string"]}, "score": {"type": "number"}},
+    "required": ["id", "score"],
+}
+
+BATCH_SCORE_SCHEMA = {"type": "array", "items": SCORE_SCHEMA}
+
+RESPONSE_SCHEMAS = {criterion: SCORE_SCHEMA for criterion in SCORE_RANGES}
+RESPONSE_SCHEMAS["batch"] = BATCH_SCORE_SCHEMA
+RESPONSE_SCHEMAS["tie_break"] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"pair": {"type": "integer"}, "winner": {"type": "string", "enum": ["A", "B"]}},
+        "required": ["pair", "winner"],
+    },
+}
+RESPONSE_SCHEMAS["answers"] = {
+    "type": "object",
+    "properties": {
+        "prompt": {"type": "string"},
+        "answers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"word": {"type": "string"}, "score": {"type": "number"}},
+                "required": ["word", "score"],
+            },
+        },
+    },
+    "required": ["prompt", "answers"],
+}
+
+
+# Scoring prompts start with a fixed rubric and end with the short part that changes between calls (word,
+# game prompt, player id, known scores), so Ollama can reuse the rubric's KV cache instead of reading it again
+COMMONALITY_RUBRIC = """Getting Commonality score:
+Analyze the word and rate its commonality in everyday English conversation among Elementary students from the Ages 7 to 11.
+Consider how frequently an average ELEMENTARY student from the AGES 7 to 11 would use this word in everyday conversation.
+
+Scored from 1-10 using this scale:
+1 – Universal: Used in almost every conversation. (e.g., I, you, yes, no, mom, dad, school)
+2 – Extremely Common: Very frequent in everyday talk. (e.g., friend, play, game, eat, teacher)
+3 – Very Common: Appears often in casual or school-related conversations. (e.g., book, movie, fun, house, run)
+4 – Common: Known and sometimes used, though not in every chat. (e.g., homework, pet, candy, music)
+5 – Fairly Common: Recognized by most kids but used only in certain contexts. (e.g., castle, balloon, brave, computer)
+6 – Moderately Common: Kids understand the word, but don't say it often. (e.g., science, travel, concert, clever)
+7 – Less Common: Kids may know it but would need context to use it naturally. (e.g., enormous, invent, mystery, forest)
+8 – Rare: Recognized occasionally (through reading, shows, or class), but rarely used in their own speech. (e.g., galaxy, experiment, rescue, adventure)
+9 – Very Rare: Kids might understand if explained, but don't use it conversationally. (e.g., democracy, microscope, ancient, universe)
+10 – Uncommon / Advanced: Almost never appears in everyday conversations of 7–11-year-olds. (e.g., hypothesis, algorithm, nostalgia, philosophy)
+
+Higher scores mean the word is LESS common (better for the game).
+"""
+
+COMPLEXITY_RUBRIC = """Getting Complexity score:
+Analyze the spelling complexity of the word. Consider:
+- Unusual letter combinations
+- Silent letters
+- Double letters
+- Exceptions to common spelling rules
+- Overall predictability of spelling
+
+Scored from 1-7 using this scale:
+1-2: Very simple (cat, dog, run)
+3-4: Simple (happy, water, table)
+5-6: Moderate (receive, necessary, rhythm)
+7 : Complex (conscience, questionnaire, bureaucracy)
+
+Higher scores mean the word is HARDER to spell (better for the game).
+"""
+
+COMPATIBILITY_RUBRIC = """Getting Compatability score:
+How perfectly does the word capture the essence of the prompt?
+
+Scored from 1-15 using this scale:
+1-3: Poor match (tangentially related at best)
+4-7: Fair match (somewhat related but not ideal)
+8-11: Good match (clearly related and appropriate)
+12-15: Excellent match (perfectly captures the prompt's meaning)
+
+Consider: specificity, relevance, and how well it embodies the concept.
+
+Higher scores mean the word is very closely related to the prompt.
+"""
+
+SPELLING_CORRECTION_RUBRIC = """Getting Spelling Correction score:
+If the word IS NOT spelled correctly then set the Spelling Correction score = 2
+If the word IS spelled correctly then set the Spelling Correction score = 0
+"""
+
+SINGLE_SCORE_INSTRUCTIONS = """
+The word to score comes last. Return ONLY the JSON object shown after it, with score replaced by the rating.
+"""
+
+COMBINED_RUBRIC = f"""Score a word submitted for a word association game prompt on every criterion below.
+
+{COMMONALITY_RUBRIC}
+Assign the rating as commonality_score.
+
+{COMPLEXITY_RUBRIC}
+Assign the rating as complexity_score.
+
+{COMPATIBILITY_RUBRIC}
+Assign the rating as compatability_score.
+
+{SPELLING_CORRECTION_RUBRIC}
+Scores listed under KNOWN SCORES are already known, use them as they are instead of rating those criteria again.
+
+Calculate: TOTAL = COMMONALITY + SPELLING + COMPATIBILITY - (Spelling Correction score)
+"""
+
+COMBINED_PROMPT = COMBINED_RUBRIC + """
+The prompt and word to score come last. Return ONLY the JSON object shown after them, with TOTAL_SCORE replaced by the total.
+"""
+
+BATCH_PROMPT = COMBINED_RUBRIC + """
+Score EVERY word in the list that comes last against the prompt given with it.
+
+Return ONLY a JSON array with one object per word, using the ids from the list:
+[{"id": ID, "score": TOTAL}, ...]
+
+Example: [{"id": 1, "score": 25}, {"id": 2, "score": 18}]
+"""
+
+COMMONALITY_PROMPT = COMMONALITY_RUBRIC + SINGLE_SCORE_INSTRUCTIONS
+COMPLEXITY_PROMPT = COMPLEXITY_RUBRIC + SINGLE_SCORE_INSTRUCTIONS
+COMPATIBILITY_PROMPT = COMPATIBILITY_RUBRIC + SINGLE_SCORE_INSTRUCTIONS
+
+SPELLING_PROMPT = """Check if the word that comes last is spelled correctly.
+
+If the word IS NOT spelled correctly then return ONLY: false
+If the word IS spelled correctly then return ONLY: true
+
+Return only true or false in lowercase.
+"""
+
+TIE_BREAK_PROMPT = """Players of a word association game submitted different words for the same prompt and tied on score.
+For every numbered pair of words below, pick the word that answers the prompt better: the closer fit to the
+prompt first, then the more interesting and less obvious word.
+
+Return ONLY a JSON array with one object per pair, "A" or "B" being the better word of that pair:
+[{"pair": 1, "winner": "A"}, ...]
+"""
+
+# Fixed prefixes per scoring mode, sent by the warm-up to keep them in the model's KV cache
+RUBRIC_PREFIXES = {
+    "together": [COMBINED_PROMPT],
+    "separately": [SPELLING_PROMPT, COMMONALITY_PROMPT, COMPLEXITY_PROMPT, COMPATIBILITY_PROMPT],
+    "batch": [BATCH_PROMPT],
+}
 
 
 class Word_Assesment:
     """Handles scoring for words based on various criteria"""
 
-    def __init__(self, llm):
+    def __init__(self, llm, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, scoring_mode: str = "together",
+                 cache: Optional[ScoreCache] = None, model_name: Optional[str] = None,
+                 spell_checker: Optional[SpellChecker] = None,
+                 frequency_index: Optional[WordFrequencyIndex] = None,
+                 complexity_scorer: Optional[SpellingComplexityScorer] = None,
+                 single_flight: Optional[SingleFlight] = None, fast_mode: bool = False,
+                 call_stats: Optional[LLMCallStats] = None, deadline_seconds: Optional[float] = None,
+                 answer_index: Optional[AnswerIndexStore] = None, large_lobby_players: Optional[int] = None,
+                 scheduler: Optional[LLMScheduler] = None, priority: str = INTERACTIVE,
+                 compatibility_scorer: Optional[EmbeddingCompatibilityScorer] = None):
+        if scoring_mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{scoring_mode}', expected one of {SCORING_MODES}")
+
         self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.scoring_mode = scoring_mode
+        self.cache = cache
+        # Cached scores are only valid for the model that produced them
+        self.model_name = model_name or getattr(llm, 'model', None) or type(llm).__name__
+        self.spell_checker = spell_checker
+        self.frequency_index = frequency_index
+        self.complexity_scorer = complexity_scorer
+        self.single_flight = single_flight
+        self.fast_mode = fast_mode
+        self.call_stats = call_stats if call_stats is not None else LLMCallStats()
+        # Default time budget for one evaluate_words call, None waits for the LLM however long it takes
+        self.deadline_seconds = deadline_seconds
+        # Expected answers of generated prompts, so listed words skip the LLM for compatibility
+        self.answer_index = answer_index
+        # Embedding similarity for words the answer index doesn't list, compatibility then never needs the LLM
+        self.compatibility_scorer = compatibility_scorer
+        # Rounds with at least this many players go through evaluate_large_lobby, None never does
+        self.large_lobby_players = large_lobby_players
+        # Shared admission control, every LLM call of this scorer waits in the priority lane for a slot
+        self.scheduler = scheduler
+        self.priority = priority
 
 
     def clean_json_response(self, response: str) -> str:
@@ -21,61 +279,302 @@ class Word_Assesment:
         return cleaned
 
 
-    def prompt_template(self, llm, playerId: int, prompt: str, operationName: str) -> Dict[str, Any]:
-        response = self.llm.invoke(prompt).content.strip()
+    def prompt_template(self, llm, playerId: int, prompt: str, operationName: str,
+                        cacheKey: Optional[Tuple[str, str, Optional[str]]] = None) -> Dict[str, Any]:
+        cached = self.cached_score(playerId, operationName, cacheKey)
+        if cached is not None:
+            return cached
+
+        result = self.coalesce(cacheKey, lambda: self.request_score(prompt, playerId, operationName, cacheKey))
+
+        # A shared result carries the id of whichever player asked first
+        return {**result, 'id': playerId}
+
+
+    async def aprompt_template(self, llm, playerId: int, prompt: str, operationName: str,
+                               cacheKey: Optional[Tuple[str, str, Optional[str]]] = None) -> Dict[str, Any]:
+        """prompt_template for the async server, awaiting the LLM instead of blocking a thread"""
+
+        cached = self.cached_score(playerId, operationName, cacheKey)
+        if cached is not None:
+            return cached
+
+        result = await self.acoalesce(cacheKey, lambda: self.arequest_score(prompt, playerId, operationName, cacheKey))
+
+        return {**result, 'id': playerId}
+
+
+    def call_options(self, operation: str) -> Dict[str, Any]:
+        """Per-call model settings, empty unless fast mode is on"""
+
+        if not self.fast_mode:
+            return {}
+
+        options = {'reasoning': False, 'options': {'num_predict': FAST_MODE_MAX_TOKENS[operation], 'temperature': 0}}
+        if operation in RESPONSE_SCHEMAS:
+            options['format'] = RESPONSE_SCHEMAS[operation]
+
+        return options
+
+
+    def invoke_llm(self, prompt: str, operation: str, maxTokens: Optional[int] = None) -> str:
+        """Every LLM call goes through here, returns the reply with any reasoning stripped"""
+
+        options = self.call_options(operation)
+        if maxTokens is not None and 'options' in options:
+            options['options']['num_predict'] = maxTokens
+
+        with self.llm_slot() as queueSeconds:
+            started = time.perf_counter()
+            message = self.llm.invoke(prompt, **options)
+            seconds = time.perf_counter() - started
+        self.record_call(operation, seconds, message, queueSeconds)
+
+        return message.content.strip().split('</think>')[-1].strip()
+
+
+    async def ainvoke_llm(self, prompt: str, operation: str, maxTokens: Optional[int] = None) -> str:
+        options = self.call_options(operation)
+        if maxTokens is not None and 'options' in options:
+            options['options']['num_predict'] = maxTokens
+
+        async with self.llm_aslot() as queueSeconds:
+            started = time.perf_counter()
+            message = await self.llm.ainvoke(prompt, **options)
+            seconds = time.perf_counter() - started
+        self.record_call(operation, seconds, message, queueSeconds)
+
+        return message.content.strip().split('</think>')[-1].strip()
+
+
+    def llm_slot(self):
+        """A scheduler slot in this scorer's lane for the length of one call, yielding the seconds waited"""
+
+        return self.scheduler.slot(self.priority) if self.scheduler is not None else nullcontext(0.0)
+
+
+    def llm_aslot(self):
+        return self.scheduler.aslot(self.priority) if self.scheduler is not None else nullcontext(0.0)
+
+
+    def record_call(self, operation: str, seconds: float, message: Any, queueSeconds: float = 0.0):
+        usage = getattr(message, 'usage_metadata', None) or {}
+        # Ollama reports prompt_eval_duration in nanoseconds, and only for the tokens it didn't have cached
+        promptEvalSeconds = ((getattr(message, 'response_metadata', None) or {}).get('prompt_eval_duration') or 0) / 1e9
+        self.call_stats.record_call(operation, seconds, usage.get('input_tokens', 0), usage.get('output_tokens', 0),
+                                    promptEvalSeconds, queueSeconds)
+
+
+    def request_score(self, prompt: str, playerId: int, operationName: str,
+                      cacheKey: Optional[Tuple[str, str, Optional[str]]]) -> Dict[str, Any]:
+        """Ask the LLM for one score, retrying bad replies in fast mode before falling back to a local estimate"""
+
+        criterion = cacheKey[0] if cacheKey is not None else "combined"
+
+        for attempt in range(self.score_attempts()):
+            if attempt:
+                self.call_stats.record(criterion, 'retries')
+
+            scores = self.parse_score_response(self.invoke_llm(prompt, criterion), playerId, operationName, cacheKey)
+            if scores is not None:
+                return scores
+
+        return self.default_score(playerId, cacheKey, operationName)
+
+
+    async def arequest_score(self, prompt: str, playerId: int, operationName: str,
+                             cacheKey: Optional[Tuple[str, str, Optional[str]]]) -> Dict[str, Any]:
+        criterion = cacheKey[0] if cacheKey is not None else "combined"
+
+        for attempt in range(self.score_attempts()):
+            if attempt:
+                self.call_stats.record(criterion, 'retries')
+
+            response = await self.ainvoke_llm(prompt, criterion)
+            scores = self.parse_score_response(response, playerId, operationName, cacheKey)
+            if scores is not None:
+                return scores
+
+        # Estimating compatibility may ask a remote embedder, which would block the event loop
+        return await asyncio.to_thread(self.default_score, playerId, cacheKey, operationName)
+
+
+    def score_attempts(self) -> int:
+        return 1 + (FAST_MODE_MAX_RETRIES if self.fast_mode else 0)
+
+
+    def default_score(self, playerId: int, cacheKey: Optional[Tuple[str, str, Optional[str]]],
+                      operationName: str) -> Dict[str, Any]:
+        """The local estimate the deadline would have used, flagged degraded, when the LLM gave no usable score"""
+
+        criterion = cacheKey[0] if cacheKey is not None else "combined"
+        self.call_stats.record(criterion, 'fallbacks')
+
+        if cacheKey is None:
+            score = {'id': playerId, 'score': DEFAULT_SCORE}
+        else:
+            _, word, gamePrompt = cacheKey
+            score = self.estimate_criterion(criterion, word, playerId, gamePrompt)
+        logger.warning("No usable score for %s, using estimate %s", operationName, score['score'])
+
+        return {**score, 'degraded': True}
+
+
+    def estimate_criterion(self, criterion: str, word: str, playerId: int, prompt: Optional[str]) -> Dict[str, Any]:
+        if criterion == "commonality":
+            return self.estimate_commonality(word, playerId)
+        if criterion == "complexity":
+            return self.estimate_complexity(word, playerId)
+        if criterion == "compatibility":
+            return self.estimate_compatibility(word, playerId, prompt or "")
+
+        return self.estimate_combined(word, playerId, prompt or "")
+
+
+    def coalesce(self, cacheKey: Optional[Tuple[str, str, Optional[str]]], call: Callable[[], Any]) -> Any:
+        """Share one in-flight LLM call between identical concurrent requests, across games"""
+
+        if self.single_flight is None or cacheKey is None:
+            return call()
+
+        criterion, word, gamePrompt = cacheKey
+        return self.single_flight.do(ScoreCache.make_key(criterion, word, gamePrompt, self.model_name), call)
+
+
+    async def acoalesce(self, cacheKey: Optional[Tuple[str, str, Optional[str]]], call: Callable[[], Any]) -> Any:
+        if self.single_flight is None or cacheKey is None:
+            return await call()
+
+        criterion, word, gamePrompt = cacheKey
+        return await self.single_flight.ado(ScoreCache.make_key(criterion, word, gamePrompt, self.model_name), call)
+
+
+    def cached_score(self, playerId: int, operationName: str,
+                     cacheKey: Optional[Tuple[str, str, Optional[str]]]) -> Optional[Dict[str, Any]]:
+        # cacheKey is (criterion, word, game prompt) and skips the LLM when that word was scored before
+        if self.cache is not None and cacheKey is not None:
+            criterion, word, gamePrompt = cacheKey
+            cachedScore = self.cache.get(criterion, word, gamePrompt, self.model_name)
+            if cachedScore is not None:
+                self.call_stats.record(criterion, 'cache_hits')
+                logger.debug("Cache hit for %s: %s", operationName, word)
+                return {'id': playerId, 'score': cachedScore}
+
+        return None
+
+
+    def parse_score_response(self, response: str, playerId: int, operationName: str,
+                             cacheKey: Optional[Tuple[str, str, Optional[str]]]) -> Optional[Dict[str, Any]]:
+        """Decode one {"id", "score"} reply, None when it is unusable"""
 
         # Clean up the response
         final_response = response.split('</think>')[-1].strip()
-        print(f"LLM response: {final_response}")
+        logger.debug("LLM response: %s", final_response)
+
+        criterion = cacheKey[0] if cacheKey is not None else "combined"
 
         try:
-            # Clean the JSON response
-            cleaned_response = self.clean_json_response(final_response)
-            scores = json.loads(cleaned_response)
-            print(f"Parsed Scores: {scores}")
+            # Schema-constrained replies are plain JSON, otherwise clean up markdown first
+            scores = json.loads(final_response if self.fast_mode else self.clean_json_response(final_response))
+            logger.debug("Parsed Scores: %s", scores)
 
             # Validate the response structure
-            if 'id' in scores and 'score' in scores:
-                return scores
-            else:
-                print("Invalid JSON structure, using default score")
-                return {'id': playerId, 'score': 5.0}
+            if not isinstance(scores, dict) or 'id' not in scores or 'score' not in scores:
+                raise ValueError("Invalid JSON structure")
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            print(f"Error while parsing response for {operationName}: {e}")
-            print(f"Response Failed: {final_response}")
-            return {'id': playerId, 'score': 5.0}
+            score = float(scores['score'])
 
+            # Fast mode also rejects scores outside the rubric so they get retried
+            low, high = SCORE_RANGES.get(criterion, (float('-inf'), float('inf')))
+            if self.fast_mode and not low <= score <= high:
+                raise ValueError(f"Score {score} outside {low}-{high}")
 
-    def score_word_commonality(self, llm, word: str, playerId: int) -> Dict[str, Any]:
-        """Score word based on how common it is in elementary conversation"""
+            if self.cache is not None and cacheKey is not None:
+                _, word, gamePrompt = cacheKey
+                self.cache.set(criterion, word, score, gamePrompt, self.model_name)
 
-        prompt = f"""
-            Analyze the word and rate its commonality in everyday English conversation among Elementary students from the Ages 7 to 11. 
-            Consider how frequently an average ELEMENTARY student from the AGES 7 to 11 would use this word in everyday conversation.
+            return {**scores, 'score': score} if self.fast_mode else scores
 
-            Word to analyze and score: "{word}"
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            self.call_stats.record(criterion, 'parse_failures')
+            logger.warning("Error while parsing response for %s: %s. Response: %r", operationName, e, final_response)
+            return None
 
-            Return ONLY a JSON object with this exact format:
-            {{"id": {playerId}, "score": score}}
 
-            Where id is the player ID and score is the player score, scored from 1-10 using this scale:
+    def known_commonality(self, word: str) -> Optional[int]:
+        """Commonality band from the frequency table, None when the LLM has to rate it"""
 
-            1 – Universal: Used in almost every conversation. (e.g., I, you, yes, no, mom, dad, school)  
-            2 – Extremely Common: Very frequent in everyday talk. (e.g., friend, play, game, eat, teacher)  
-            3 – Very Common: Appears often in casual or school-related conversations. (e.g., book, movie, fun, house, run)  
-            4 – Common: Known and sometimes used, though not in every chat. (e.g., homework, pet, candy, music)  
-            5 – Fairly Common: Recognized by most kids but used only in certain contexts. (e.g., castle, balloon, brave, computer)  
-            6 – Moderately Common: Kids understand the word, but don't say it often. (e.g., science, travel, concert, clever)  
-            7 – Less Common: Kids may know it but would need context to use it naturally. (e.g., enormous, invent, mystery, forest)  
-            8 – Rare: Recognized occasionally (through reading, shows, or class), but rarely used in their own speech. (e.g., galaxy, experiment, rescue, adventure)  
-            9 – Very Rare: Kids might understand if explained, but don't use it conversationally. (e.g., democracy, microscope, ancient, universe)  
-            10 – Uncommon / Advanced: Almost never appears in everyday conversations of 7–11-year-olds. (e.g., hypothesis, algorithm, nostalgia, philosophy)
+        if self.frequency_index is None:
+            return None
 
-            Higher scores mean the word is LESS common (better for the game).
-        """
+        return self.frequency_index.commonality(word)
+
+
+    def known_compatibility(self, word: str, prompt: str) -> Optional[float]:
+        """Compatibility from the prompt's answer index or embeddings, None when the LLM has to rate it"""
+
+        knownCompatibilities = self.known_compatibilities([word], prompt)
+        return knownCompatibilities[0] if knownCompatibilities is not None else None
+
+
+    def known_compatibilities(self, words: List[str], prompt: str) -> Optional[List[Optional[float]]]:
+        """Compatibility for a batch of words: the answer index where it lists the word, then embedding similarity
+        for the rest in one vectorized pass. None for a word the LLM has to rate, None overall without either"""
+
+        if self.answer_index is None and self.compatibility_scorer is None:
+            return None
+
+        compatibilities = [self.answer_index.compatibility(word, prompt) if self.answer_index is not None else None
+                           for word in words]
+
+        unlisted = [index for index, compatibility in enumerate(compatibilities) if compatibility is None]
+        if self.compatibility_scorer is not None and unlisted:
+            similarities = self.embedding_compatibilities([words[index] for index in unlisted], prompt)
+            for index, compatibility in zip(unlisted, similarities or []):
+                compatibilities[index] = compatibility
+
+        return compatibilities
+
+
+    def embedding_compatibilities(self, words: List[str], prompt: str) -> Optional[List[float]]:
+        """Embedding similarity scores, None when the embedder failed or timed out so the LLM or the estimate
+        takes over. A remote embedder shares the LLM scheduler's slots with the scoring calls"""
+
+        scorer = self.compatibility_scorer
+        try:
+            if scorer.local:
+                return scorer.score_words(words, prompt)
+
+            with self.llm_slot():
+                return scorer.score_words(words, prompt)
+        except Exception as e:
+            logger.warning("Embedding compatibility failed for %d words, falling back: %s", len(words), e)
+            return None
+
+
+    def known_complexities(self, words: List[str]) -> Optional[List[int]]:
+        """Spelling complexity for a batch of words from the local scorer, None when the LLM has to rate them"""
+
+        if self.complexity_scorer is None:
+            return None
+
+        return self.complexity_scorer.score_words(words)
 
-        result = self.prompt_template(llm, playerId = playerId, prompt = prompt, operationName = "Word Commonality")
+
+    def score_word_commonality(self, llm, word: str, playerId: int) -> Dict[str, Any]:
+        """Score word based on how common it is in elementary conversation"""
+
+        knownCommonality = self.known_commonality(word)
+        if knownCommonality is not None:
+            return {'id': playerId, 'score': float(knownCommonality)}
+
+        prompt = COMMONALITY_PROMPT + f"""
+Word to analyze and score: "{word}"
+{{"id": {playerId}, "score": score}}
+"""
+
+        result = self.prompt_template(llm, playerId = playerId, prompt = prompt, operationName = "Word Commonality",
+                                      cacheKey = ("commonality", word, None))
 
         return result
 
@@ -83,31 +582,17 @@ class Word_Assesment:
     def score_spelling_complexity(self, llm, word: str, playerId: int) -> Dict[str, Any]:
         """Score word based on spelling complexity"""
 
-        prompt = f"""
-            Analyze the spelling complexity of the word "{word}". Consider:
-            - Unusual letter combinations
-            - Silent letters
-            - Double letters
-            - Exceptions to common spelling rules
-            - Overall predictability of spelling
-                
-            Word to analyze and score: "{word}"
-
-            Return ONLY a JSON object with this exact format:
-            {{"id": {playerId}, "score": score}}
-            
-            Where id is the player ID and score is the player score, scored from 1-7 using this scale:
-        
-            Scoring scale:
-            1-2: Very simple (cat, dog, run)
-            3-4: Simple (happy, water, table)
-            5-6: Moderate (receive, necessary, rhythm)
-            7 : Complex (conscience, questionnaire, bureaucracy)
-                
-            Higher scores mean the word is HARDER to spell (better for the game).
-            """
-
-        result = self.prompt_template(llm, playerId=playerId, prompt=prompt, operationName="Word Spelling Complexity")
+        knownComplexity = self.known_complexities([word])
+        if knownComplexity is not None:
+            return {'id': playerId, 'score': float(knownComplexity[0])}
+
+        prompt = COMPLEXITY_PROMPT + f"""
+Word to analyze and score: "{word}"
+{{"id": {playerId}, "score": score}}
+"""
+
+        result = self.prompt_template(llm, playerId=playerId, prompt=prompt, operationName="Word Spelling Complexity",
+                                      cacheKey=("complexity", word, None))
 
         return result
 
@@ -115,239 +600,745 @@ class Word_Assesment:
     def score_prompt_compatibility(self, llm, word: str, playerId: int, prompt: str) -> Dict[str, Any]:
         """Score word based on prompt compatibility"""
 
-        prompt = f"""
-        PROMPT: "{prompt}"
-        WORD TO EVALUATE: "{word}"
+        knownCompatibility = self.known_compatibility(word, prompt)
+        if knownCompatibility is not None:
+            return {'id': playerId, 'score': knownCompatibility}
 
-        How perfectly does this word capture the essence of the prompt?
-                
-        Word to analyze and score: "{word}"
+        cacheKey = ("compatibility", word, prompt)
 
-        Return ONLY a JSON object with this exact format:
-        {{"id": {playerId}, "score": score}}
+        prompt = COMPATIBILITY_PROMPT + f"""
+PROMPT: "{prompt}"
+Word to analyze and score: "{word}"
+{{"id": {playerId}, "score": score}}
+"""
 
-        Where id is the player ID and score is the player score, scored from 1-15 using this scale:
-        1-3: Poor match (tangentially related at best)
-        4-7: Fair match (somewhat related but not ideal)
-        8-11: Good match (clearly related and appropriate)
-        12-15: Excellent match (perfectly captures the prompt's meaning)
-
-        Consider: specificity, relevance, and how well it embodies the concept.
-                
-        Higher scores mean the word is very closely related to the prompt.
-        """
-
-        result = self.prompt_template(llm, playerId=playerId, prompt=prompt, operationName="Word Prompt Compatibility")
+        result = self.prompt_template(llm, playerId=playerId, prompt=prompt, operationName="Word Prompt Compatibility",
+                                      cacheKey=cacheKey)
 
         return result
 
 
     def check_spelling(self, llm, word: str) -> bool:
         """Check if word is spelled correctly"""
-        print("[✔] Checking Spelling...")
+        logger.debug("Checking spelling of %s", word)
 
-        prompt = f"""
-        Check if the word "{word}" is spelled correctly.
+        # Dictionary words are spelled correctly, only unknown words need the LLM
+        if self.spell_checker is not None and self.spell_checker.is_known(word):
+            return True
 
-        If the word IS NOT spelled correctly then return ONLY: false
-        If the word IS spelled correctly then return ONLY: true
+        if self.cache is not None:
+            cachedSpelling = self.cache.get("spelling", word, None, self.model_name)
+            if cachedSpelling is not None:
+                self.call_stats.record("spelling", 'cache_hits')
+                return cachedSpelling == 1.0
 
-        Return only true or false in lowercase.
-        """
+        return self.coalesce(("spelling", word, None), lambda: self.ask_spelling(word))
+
+
+    def ask_spelling(self, word: str) -> bool:
+        """The LLM half of check_spelling"""
 
-        response = self.llm.invoke(prompt).content.strip()
-        final_response = response.split('</think>')[-1].strip().lower()
+        prompt = SPELLING_PROMPT + f"""
+Word: "{word}"
+"""
 
-        print(f"[✔] Spelling Checked: {final_response}")
+        final_response = self.invoke_llm(prompt, "spelling").lower()
+
+        logger.debug("Spelling checked for %s: %s", word, final_response)
+
+        # Only cache answers the model actually gave, not garbled output
+        if self.cache is not None and final_response in ('true', 'false'):
+            self.cache.set("spelling", word, 1.0 if final_response == 'true' else 0.0, None, self.model_name)
 
         # Convert string response to boolean
         return final_response == 'true'
 
 
     def score_combined_rating(self, llm, word: str, playerId: int, prompt: str) -> Dict[str, Any]:
-        print(f"[✔]  Generating Promp Scoring Criteria")
+        logger.debug("Scoring combined criteria for player %s: %s", playerId, word)
 
-        prompt = f"""
-                PROMPT: "{prompt}"
-                WORD TO EVALUATE: "{word}"
-                
-                
-                
-                Getting Commonality score:
-                Analyze the word and rate its commonality in everyday English conversation among Elementary students from the Ages 7 to 11. 
-                Consider how frequently an average ELEMENTARY student from the AGES 7 to 11 would use this word in everyday conversation.
-    
-                Word to analyze and score: "{word}"
-    
-                Where id is the player ID and score is the player score, scored from 1-10 using this scale:
-    
-                1 – Universal: Used in almost every conversation. (e.g., I, you, yes, no, mom, dad, school)  
-                2 – Extremely Common: Very frequent in everyday talk. (e.g., friend, play, game, eat, teacher)  
-                3 – Very Common: Appears often in casual or school-related conversations. (e.g., book, movie, fun, house, run)  
-                4 – Common: Known and sometimes used, though not in every chat. (e.g., homework, pet, candy, music)  
-                5 – Fairly Common: Recognized by most kids but used only in certain contexts. (e.g., castle, balloon, brave, computer)  
-                6 – Moderately Common: Kids understand the word, but don't say it often. (e.g., science, travel, concert, clever)  
-                7 – Less Common: Kids may know it but would need context to use it naturally. (e.g., enormous, invent, mystery, forest)  
-                8 – Rare: Recognized occasionally (through reading, shows, or class), but rarely used in their own speech. (e.g., galaxy, experiment, rescue, adventure)  
-                9 – Very Rare: Kids might understand if explained, but don't use it conversationally. (e.g., democracy, microscope, ancient, universe)  
-                10 – Uncommon / Advanced: Almost never appears in everyday conversations of 7–11-year-olds. (e.g., hypothesis, algorithm, nostalgia, philosophy)
-    
-                Higher scores mean the word is LESS common (better for the game).
-                
-                Assign the rating as commonality_score.
-                
-                
-                
-                Getting Complexity score:
-                Analyze the spelling complexity of the word "{word}". Consider:
-                - Unusual letter combinations
-                - Silent letters
-                - Double letters
-                - Exceptions to common spelling rules
-                - Overall predictability of spelling
-                    
-                Word to analyze and score: "{word}"
-                
-                Where id is the player ID and score is the player score, scored from 1-7 using this scale:
-            
-                Scoring scale:
-                1-2: Very simple (cat, dog, run)
-                3-4: Simple (happy, water, table)
-                5-6: Moderate (receive, necessary, rhythm)
-                7 : Complex (conscience, questionnaire, bureaucracy)
-                    
-                Higher scores mean the word is HARDER to spell (better for the game).
-                
-                Assign the rating as complexity_score.
-                
-                
-                
-                Getting Compatability score:
-                How perfectly does this word capture the essence of the prompt?
-
-                Word to analyze and score: "{word}"
-
-                Where id is the player ID and score is the player score, scored from 1-15 using this scale:
-                1-3: Poor match (tangentially related at best)
-                4-7: Fair match (somewhat related but not ideal)
-                8-11: Good match (clearly related and appropriate)
-                12-15: Excellent match (perfectly captures the prompt's meaning)
-
-                Consider: specificity, relevance, and how well it embodies the concept.
-
-                Higher scores mean the word is very closely related to the prompt.
-                
-                Assign the rating as compatability_score.
-
-
-                Getting Spelling Correction score:
-                Check if the word "{word}" is spelled correctly.
-
-                If the word IS NOT spelled correctly then set the Spelling Correction score = 2
-                If the word IS spelled correctly then set the Spelling Correction score = 0
-                
-
-
-
-                Calculate: TOTAL = COMMONALITY + SPELLING + COMPATIBILITY - (Spelling Correction score)
-        
-                Return ONLY a JSON object with this exact format:
-                {{"id": {playerId}, "score": TOTAL_SCORE}}
-                
-                Example: {{"id": 1, "score": 25}}
-                
-                """
-
-        result = self.prompt_template(llm, playerId=playerId, prompt=prompt, operationName="Word Combined Rating")
-        
-        print(f"[✔]  Scoring Completed")
+        result = self.prompt_template(llm, playerId=playerId, prompt=self.combined_rating_prompt(word, playerId, prompt),
+                                      operationName="Word Combined Rating", cacheKey=("combined", word, prompt))
+
+        logger.debug("Scoring completed for player %s", playerId)
 
         return result
 
 
-    def break_tie(self, llm, players_scores: List[Dict]) -> List[int]:
-        """Break ties between players with same scores"""
+    async def ascore_combined_rating(self, llm, word: str, playerId: int, prompt: str) -> Dict[str, Any]:
+        if self.compatibility_scorer is not None and not self.compatibility_scorer.local:
+            # A remote embedder blocks on the network and on a scheduler slot, so not on the event loop
+            ratingPrompt = await asyncio.to_thread(self.combined_rating_prompt, word, playerId, prompt)
+        else:
+            ratingPrompt = self.combined_rating_prompt(word, playerId, prompt)
 
-        # For now, return the original order
-        return [score['id'] for score in players_scores]
+        result = await self.aprompt_template(llm, playerId=playerId, prompt=ratingPrompt,
+                                             operationName="Word Combined Rating", cacheKey=("combined", word, prompt))
 
+        logger.debug("Scoring completed for player %s", playerId)
 
-    def calculate_total_score_separately(self, llm, words: Dict[int, str], prompt: str) -> List[Dict[str, Any]]:
-        """Calculate total scores for all players but using separate functions to handle scoring"""
+        return result
 
-        print("Starting Calculation")
 
-        playerScores = []
-        for player_id, word in words.items():
+    def combined_rating_prompt(self, word: str, playerId: int, prompt: str) -> str:
+        """Rubric asking for every criterion and the total in one go"""
+
+        knownScores = self.known_scores(word, prompt)
+        knownScoresLine = f"KNOWN SCORES: {', '.join(knownScores)}\n" if knownScores else ""
+
+        return COMBINED_PROMPT + f"""
+PROMPT: "{prompt}"
+WORD TO EVALUATE: "{word}"
+{knownScoresLine}{{"id": {playerId}, "score": TOTAL_SCORE}}
+"""
+
+
+    def known_scores(self, word: str, prompt: str, knownComplexity: Optional[int] = None,
+                     knownCompatibility: Optional[float] = None) -> List[str]:
+        """Scores the frequency table, local complexity scorer, answer index and embeddings already have, so the
+        model doesn't rate them again. knownComplexity and knownCompatibility save a lookup when the caller scored
+        a batch at once"""
+
+        knownScores = []
+
+        knownCommonality = self.known_commonality(word)
+        if knownCommonality is not None:
+            knownScores.append(f"commonality_score = {knownCommonality}")
+
+        if knownComplexity is None:
+            knownComplexities = self.known_complexities([word])
+            knownComplexity = knownComplexities[0] if knownComplexities is not None else None
+        if knownComplexity is not None:
+            knownScores.append(f"complexity_score = {knownComplexity}")
+
+        if knownCompatibility is None:
+            knownCompatibility = self.known_compatibility(word, prompt)
+        if knownCompatibility is not None:
+            knownScores.append(f"compatability_score = {knownCompatibility:g}")
+
+        return knownScores
+
+
+    def score_batch_rating(self, llm, words: Dict[int, str], prompt: str) -> Dict[str, Dict[str, Any]]:
+        """Score every player's word with a single LLM call, keyed by str(player id)"""
+        logger.debug("Scoring a batch of %d players", len(words))
+
+        knownComplexities = self.known_complexities(list(words.values()))
+        knownCompatibilities = self.known_compatibilities(list(words.values()), prompt)
+
+        wordLines = []
+        for index, (player_id, word) in enumerate(words.items()):
+            knownScores = self.known_scores(word, prompt,
+                                            knownComplexities[index] if knownComplexities is not None else None,
+                                            knownCompatibilities[index] if knownCompatibilities is not None else None)
+
+            if knownScores:
+                wordLines.append(f'- id {player_id}: "{word}" (KNOWN SCORES: {", ".join(knownScores)})')
+            else:
+                wordLines.append(f'- id {player_id}: "{word}"')
+        wordLines = "\n".join(wordLines)
+
+        batchPrompt = BATCH_PROMPT + f"""
+PROMPT: "{prompt}"
+
+WORDS TO EVALUATE:
+{wordLines}
+"""
+
+        final_response = self.invoke_llm(batchPrompt, "batch", maxTokens=FAST_MODE_MAX_TOKENS["batch"] * len(words))
+        logger.debug("LLM response: %s", final_response)
 
-            isSpellingCorrect = self.check_spelling(llm, word)
-            print(isSpellingCorrect)
+        scores = {}
+        try:
+            cleaned_response = self.clean_json_response(final_response)
+            parsed = json.loads(cleaned_response[cleaned_response.find('['):cleaned_response.rfind(']') + 1])
+
+            for entry in parsed:
+                if isinstance(entry, dict) and 'id' in entry and 'score' in entry:
+                    scores[str(entry['id'])] = {'id': entry['id'], 'score': float(entry['score'])}
+
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            self.call_stats.record("batch", 'parse_failures')
+            logger.warning("Error while parsing response for Word Batch Rating: %s. Response: %r", e, final_response)
+
+        # Only keep scores for players that were actually asked about
+        return {str(player_id): scores[str(player_id)] for player_id in words if str(player_id) in scores}
+
+
+    def break_tie(self, llm, players_scores: List[Dict], prompt: str = "",
+                  submitted: Optional[Dict[Any, float]] = None, deadline: Optional[float] = None) -> List[int]:
+        """Break ties between players with same scores, the winners' ids"""
+
+        winnerIds, _ = self.decide_tie(llm, players_scores, prompt, submitted, deadline)
+        return winnerIds
+
+
+    def decide_tie(self, llm, players_scores: List[Dict], prompt: str,
+                   submitted: Optional[Dict[Any, float]] = None,
+                   deadline: Optional[float] = None) -> Tuple[List[Any], Optional[str]]:
+        """Winners' ids and what decided it: a sub-score, 'submission_time', 'llm', or None when they share the win.
+
+        Sub-scores the round already has come first, then who submitted first when submitted has every tied
+        player's time. Only players still tied after that cost an LLM call, one for all of their distinct words,
+        and only within the round's deadline. Past it the tied players share the win"""
+
+        candidates = list(zip(players_scores, self.tie_break_scores(prompt, players_scores)))
+
+        for criterion in TIE_BREAK_CRITERIA:
+            values = [subScore[criterion] for _, subScore in candidates]
+            if any(value is None for value in values):
+                continue
 
-            wrongSpellingNegation = 0.0
-            if wrongSpellingNegation is False:
-                wrongSpellingNegation = 2.0
+            best = max(values)
+            candidates = [candidate for candidate, value in zip(candidates, values) if value == best]
+            if len(candidates) == 1:
+                return [candidates[0][0]['id']], criterion
 
-            print(f"negation amount is {wrongSpellingNegation}")
+        remaining = [score for score, _ in candidates]
 
-            # Get commonality score
-            print(f"[✔]  Getting commonality score for Player {player_id}: {word}")
-            commonalityScore = self.score_word_commonality(llm, word, player_id)
+        if submitted and all(score['id'] in submitted for score in remaining):
+            first = min(submitted[score['id']] for score in remaining)
+            remaining = [score for score in remaining if submitted[score['id']] == first]
+            if len(remaining) == 1:
+                return [remaining[0]['id']], "submission_time"
 
-            # Get Spelling Complexity Score
-            print(f"[✔]  Getting Spelling Complexity score for Player {player_id}: {word}")
-            complexityScore = self.score_spelling_complexity(llm, word, player_id)
+        # Players who typed the same word can't be told apart by comparing words
+        words = list(dict.fromkeys(score['word'].strip().lower() for score in remaining))
+        if not 1 < len(words) <= TIE_BREAK_MAX_WORDS:
+            return [score['id'] for score in remaining], None
 
-            # Get Prompt Combatability Score
-            print(f"[✔]  Getting Prompt Compatability score for Player {player_id}: {word}")
-            combatabilityScore = self.score_prompt_compatibility(llm, word, prompt, player_id)
+        if deadline is not None and self.remaining_seconds(deadline) <= 0:
+            logger.info("Round deadline spent, %d tied players share the win", len(remaining))
+            return [score['id'] for score in remaining], None
 
-            # You can add other scoring components later
-            totalScore = commonalityScore['score'] + complexityScore['score'] + combatabilityScore["score"] - wrongSpellingNegation
-            print(f"[✔] Got {player_id} total score from answer - {word}")
+        (wins,), _ = self.run_until([partial(self.compare_pairwise, prompt, words)], [lambda: None], deadline)
+        if wins is None:
+            return [score['id'] for score in remaining], None
 
-            playerScores.append({
-                'id': player_id,
-                'word': word,
-                'commonality': commonalityScore['score'],
-                'complexity': complexityScore['score'],
-                'compatability' : combatabilityScore["score"],
-                'total': totalScore
+        mostWins = max(wins.values())
+        winners = [score['id'] for score in remaining if wins[score['word'].strip().lower()] == mostWins]
+        return winners, "llm" if len(winners) < len(remaining) else None
+
+
+    def tie_break_scores(self, prompt: str, players_scores: List[Dict]) -> List[Dict[str, Optional[float]]]:
+        """Sub-scores of tied players without an LLM call: their own criteria when scored separately, otherwise
+        the local scorers and the score cache. A criterion nothing has kept is None"""
+
+        words = [score['word'] for score in players_scores]
+        knownComplexities = self.known_complexities(words)
+        knownCompatibilities = self.known_compatibilities(words, prompt)
+
+        subScores = []
+        for index, score in enumerate(players_scores):
+            word = score['word']
+
+            if 'compatability' in score:
+                subScores.append({
+                    'compatibility': score['compatability'],
+                    'complexity': score['complexity'],
+                    'commonality': score['commonality'],
+                    'spelling': score['total'] - score['commonality'] - score['complexity'] - score['compatability'],
+                })
+                continue
+
+            compatibility = knownCompatibilities[index] if knownCompatibilities is not None else None
+            complexity = knownComplexities[index] if knownComplexities is not None else None
+            commonality = self.known_commonality(word)
+
+            subScores.append({
+                'compatibility': compatibility if compatibility is not None else self.kept_score("compatibility", word, prompt),
+                'complexity': complexity if complexity is not None else self.kept_score("complexity", word, None),
+                'commonality': commonality if commonality is not None else self.kept_score("commonality", word, None),
+                'spelling': self.kept_spelling_penalty(word),
             })
 
+        return subScores
+
+
+    def kept_score(self, criterion: str, word: str, prompt: Optional[str]) -> Optional[float]:
+        """A past LLM score, looked up without counting towards the cache hit rate"""
+
+        return self.cache.peek(criterion, word, prompt, self.model_name) if self.cache is not None else None
+
+
+    def kept_spelling_penalty(self, word: str) -> Optional[float]:
+        """0 for a word known to be spelled right, -2 for one known to be wrong, None when nobody checked"""
+
+        if self.spell_checker is not None and self.spell_checker.is_known(word):
+            return 0.0
+
+        spelling = self.kept_score("spelling", word, None)
+        return None if spelling is None else (0.0 if spelling == 1.0 else -2.0)
+
+
+    def compare_pairwise(self, prompt: str, words: List[str]) -> Optional[Dict[str, int]]:
+        """Pairwise wins per word from one LLM call comparing every pair, None when no usable reply came back"""
+
+        pairs = list(itertools.combinations(words, 2))
+        pairLines = "\n".join(f'{number}. A: "{first}" B: "{second}"' for number, (first, second) in enumerate(pairs, 1))
+
+        tieBreakPrompt = TIE_BREAK_PROMPT + f"""
+PROMPT: "{prompt}"
+
+PAIRS:
+{pairLines}
+"""
+
+        try:
+            final_response = self.invoke_llm(tieBreakPrompt, "tie_break", maxTokens=FAST_MODE_MAX_TOKENS["tie_break"] * len(pairs))
+        except Exception as e:
+            # The round is already scored, a failed tie-break only means the tied players share the win
+            logger.warning("Tie-break call failed, tied players share the win: %s", e)
+            return None
+
+        logger.debug("LLM response: %s", final_response)
+
+        wins = dict.fromkeys(words, 0)
+        try:
+            cleaned_response = self.clean_json_response(final_response)
+            parsed = json.loads(cleaned_response[cleaned_response.find('['):cleaned_response.rfind(']') + 1])
+
+            for entry in parsed:
+                pair = int(entry['pair'])
+                winner = str(entry['winner']).strip().upper()
+                if 1 <= pair <= len(pairs) and winner in ("A", "B"):
+                    wins[pairs[pair - 1][0 if winner == "A" else 1]] += 1
+
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            self.call_stats.record("tie_break", 'parse_failures')
+            logger.warning("Error while parsing response for Tie Break: %s. Response: %r", e, final_response)
+            return None
+
+        return wins
+
+
+    def run_concurrently(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """Run scoring calls at once on a bounded thread pool, keeping results in call order"""
+
+        if self.max_concurrency <= 1 or len(calls) <= 1:
+            return [call() for call in calls]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(calls))) as executor:
+            return list(executor.map(lambda call: call(), calls))
+
+
+    def run_until(self, calls: List[Callable[[], Any]], estimates: List[Callable[[], Any]],
+                  deadline: Optional[float]) -> Tuple[List[Any], List[bool]]:
+        """run_concurrently against a time.monotonic() deadline. Calls that haven't finished (or failed) by then
+        are replaced by their local estimate, the second list flags which ones"""
+
+        if deadline is None:
+            return self.run_concurrently(calls), [False] * len(calls)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(calls))))
+        futures = [executor.submit(call) for call in calls]
+        # Calls still running after the deadline finish in the background and fill the cache for later rounds
+        executor.shutdown(wait=False)
+
+        wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+        results, degraded = [], []
+        for future, estimate in zip(futures, estimates):
+            if future.done() and not future.cancelled() and future.exception() is None:
+                results.append(future.result())
+                degraded.append(False)
+                continue
+
+            if future.done() and not future.cancelled():
+                logger.warning("Scoring call failed, using the local estimate: %s", future.exception())
+            future.cancel()
+            results.append(estimate())
+            degraded.append(True)
+
+        if any(degraded):
+            logger.warning("%d of %d scoring calls missed the deadline or failed, used local estimates",
+                           sum(degraded), len(calls))
+
+        return results, degraded
+
+
+    def remaining_seconds(self, deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+    def estimate_commonality(self, word: str, playerId: int) -> Dict[str, Any]:
+        """Commonality without the LLM: frequency table, then a past LLM score, then word length"""
+
+        knownCommonality = self.known_commonality(word)
+        if knownCommonality is not None:
+            return {'id': playerId, 'score': float(knownCommonality)}
+
+        kept = self.kept_score("commonality", word, None)
+        if kept is not None:
+            return {'id': playerId, 'score': kept}
+
+        # Longer words are rarer in kids' speech, 3 letters is about a 2, 11 letters about a 9
+        return {'id': playerId, 'score': float(min(10, max(1, round(len(word.strip()) * 0.9 - 1))))}
+
+
+    def estimate_complexity(self, word: str, playerId: int) -> Dict[str, Any]:
+        """Spelling complexity from letter patterns, the local scorer needs no LLM"""
+
+        # Without a configured local scorer, a past LLM score is closer to what this round would have got
+        if self.complexity_scorer is None:
+            kept = self.kept_score("complexity", word, None)
+            if kept is not None:
+                return {'id': playerId, 'score': kept}
+
+        scorer = self.complexity_scorer or SpellingComplexityScorer()
+        return {'id': playerId, 'score': float(scorer.score_words([word])[0])}
+
+
+    def estimate_compatibility(self, word: str, playerId: int, prompt: str) -> Dict[str, Any]:
+        """Prompt compatibility without the LLM: the answer index or a past score, otherwise whether the word
+        shows up in the prompt"""
+
+        knownCompatibility = self.known_compatibility(word, prompt)
+        if knownCompatibility is not None:
+            return {'id': playerId, 'score': knownCompatibility}
+
+        kept = self.kept_score("compatibility", word, prompt)
+        if kept is not None:
+            return {'id': playerId, 'score': kept}
+
+        promptForms = {form for promptWord in re.findall(r"[a-z]+", prompt.lower()) for form in word_forms(promptWord)}
+        inPrompt = any(form in promptForms for form in word_forms(word.strip().lower()))
+
+        return {'id': playerId, 'score': ESTIMATED_COMPATIBILITY_IN_PROMPT if inPrompt else ESTIMATED_COMPATIBILITY}
+
+
+    def estimate_spelling(self, word: str) -> bool:
+        """Dictionary or past answer, unknown words get the benefit of the doubt"""
+
+        if self.spell_checker is not None and self.spell_checker.is_known(word):
+            return True
+
+        keptSpelling = self.kept_score("spelling", word, None)
+        if keptSpelling is not None:
+            return keptSpelling == 1.0
+
+        return True
+
+
+    def estimate_combined(self, word: str, playerId: int, prompt: str) -> Dict[str, Any]:
+        """Combined rubric score from a past LLM score or the sum of the local estimates"""
+
+        kept = self.kept_score("combined", word, prompt)
+        if kept is not None:
+            return {'id': playerId, 'score': kept}
+
+        total = (self.estimate_commonality(word, playerId)['score'] + self.estimate_complexity(word, playerId)['score']
+                 + self.estimate_compatibility(word, playerId, prompt)['score'] - (0.0 if self.estimate_spelling(word) else 2.0))
+
+        return {'id': playerId, 'score': total}
+
+
+    def estimate_player_score(self, player_id: int, word: str, prompt: str) -> Dict[str, Any]:
+        """A whole playerScores entry from local estimates, in the shape of the current scoring mode"""
+
+        if self.scoring_mode == "separately":
+            playerScore = self.separate_player_score(
+                player_id, word,
+                self.estimate_spelling(word),
+                self.estimate_commonality(word, player_id),
+                self.estimate_complexity(word, player_id),
+                self.estimate_compatibility(word, player_id, prompt),
+            )
+            playerScore['degraded'] = ["spelling", "commonality", "complexity", "compatibility"]
+        else:
+            playerScore = self.together_player_score(player_id, word, self.estimate_combined(word, player_id, prompt))
+            playerScore['degraded'] = ["combined"]
+
+        return playerScore
+
+
+    def calculate_total_score_separately(self, llm, words: Dict[int, str], prompt: str,
+                                         deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Calculate total scores for all players but using separate functions to handle scoring"""
+
+        logger.debug("Starting calculation for %d players", len(words))
+
+        # Complexity and compatibility for the whole round in one vectorized pass each when local scorers are available
+        localComplexities = self.known_complexities(list(words.values()))
+        localCompatibilities = self.known_compatibilities(list(words.values()), prompt)
+
+        # Fan out every criterion for every player, 4 calls per player
+        calls, estimates = [], []
+        for index, (player_id, word) in enumerate(words.items()):
+            logger.debug("Queueing criteria scoring for player %s: %s", player_id, word)
+
+            if localComplexities is not None:
+                complexityCall = partial(dict, id=player_id, score=float(localComplexities[index]))
+            else:
+                complexityCall = partial(self.score_spelling_complexity, llm, word, player_id)
+
+            if localCompatibilities is not None and localCompatibilities[index] is not None:
+                compatibilityCall = partial(dict, id=player_id, score=localCompatibilities[index])
+            else:
+                compatibilityCall = partial(self.score_prompt_compatibility, llm, word, player_id, prompt)
+
+            calls.extend([
+                partial(self.check_spelling, llm, word),
+                partial(self.score_word_commonality, llm, word, player_id),
+                complexityCall,
+                compatibilityCall,
+            ])
+            estimates.extend([
+                partial(self.estimate_spelling, word),
+                partial(self.estimate_commonality, word, player_id),
+                partial(self.estimate_complexity, word, player_id),
+                partial(self.estimate_compatibility, word, player_id, prompt),
+            ])
+
+        results, degraded = self.run_until(calls, estimates, deadline)
+
+        criteria = ["spelling", "commonality", "complexity", "compatibility"]
+        playerScores = []
+        for index, (player_id, word) in enumerate(words.items()):
+            playerScore = self.separate_player_score(player_id, word, *results[index * 4:index * 4 + 4])
+
+            # Estimated past the deadline, or because the LLM's reply was unusable
+            degradedCriteria = [criterion for criterion, flag in zip(criteria, degraded[index * 4:index * 4 + 4])
+                                if flag or criterion in playerScore.get('degraded', [])]
+            if degradedCriteria:
+                playerScore['degraded'] = degradedCriteria
+
+            playerScores.append(playerScore)
+
         return playerScores
 
 
+    def separate_player_score(self, player_id: int, word: str, isSpellingCorrect: bool, commonalityScore: Dict[str, Any],
+                              complexityScore: Dict[str, Any], combatabilityScore: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine one player's separate criterion results into their playerScores entry"""
+
+        wrongSpellingNegation = 0.0
+        if isSpellingCorrect is False:
+            wrongSpellingNegation = 2.0
+
+        logger.debug("Spelling negation for player %s is %s", player_id, wrongSpellingNegation)
+
+        # You can add other scoring components later
+        totalScore = commonalityScore['score'] + complexityScore['score'] + combatabilityScore["score"] - wrongSpellingNegation
+        logger.debug("Got player %s total score from answer - %s", player_id, word)
+
+        playerScore = {
+            'id': player_id,
+            'word': word,
+            'commonality': commonalityScore['score'],
+            'complexity': complexityScore['score'],
+            'compatability' : combatabilityScore["score"],
+            'total': totalScore
+        }
+
+        degradedCriteria = [criterion for criterion, score in (("commonality", commonalityScore), ("complexity", complexityScore),
+                                                               ("compatibility", combatabilityScore)) if score.get('degraded')]
+        if degradedCriteria:
+            playerScore['degraded'] = degradedCriteria
+
+        return playerScore
+
+
+    def score_player_separately(self, llm, player_id: int, word: str, prompt: str) -> Dict[str, Any]:
+        """Score a single player with one call per criterion"""
+
+        return self.separate_player_score(
+            player_id, word,
+            self.check_spelling(llm, word),
+            self.score_word_commonality(llm, word, player_id),
+            self.score_spelling_complexity(llm, word, player_id),
+            self.score_prompt_compatibility(llm, word, player_id, prompt),
+        )
+
+
     ### Main Scoring System
-    def calculate_total_score_together(self, llm, words: Dict[int, str], prompt: str) -> List[Dict[str, Any]]:
+    def calculate_total_score_together(self, llm, words: Dict[int, str], prompt: str,
+                                       deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """Calculate total scores for all players but using a single function to handle scoring"""
 
-        print("Starting Calculation")
+        logger.debug("Starting calculation for %d players", len(words))
 
-        playerScores = []
-        for player_id, word in words.items():
+        # Get Prompt Criteria Result scores for every player at once
+        playerScores, _ = self.run_until(
+            [partial(self.score_player_together, llm, player_id, word, prompt) for player_id, word in words.items()],
+            [partial(self.estimate_player_score, player_id, word, prompt) for player_id, word in words.items()],
+            deadline)
 
-            # Get Prompt Combatability Score
-            print(f"[✔]  Getting Prompt Criteria Result score for Player {player_id}: {word}")
-            getCriteriaResult = self.score_combined_rating(llm, word, prompt, player_id)
+        return playerScores
 
-            # You can add other scoring components later
-            totalScore = getCriteriaResult["score"]
-            print(f"[✔] Got {player_id} total score of {totalScore} from answer - {word}")
 
-            playerScores.append({
-                'id': player_id,
-                'word': word,
-                'criteriaResult': getCriteriaResult['score'],
-                'total': totalScore
-            })
+    def score_player_together(self, llm, player_id: int, word: str, prompt: str) -> Dict[str, Any]:
+        """Score a single player with the combined rubric"""
+
+        logger.debug("Getting combined criteria score for player %s: %s", player_id, word)
+        getCriteriaResult = self.score_combined_rating(llm, word, player_id, prompt)
+
+        return self.together_player_score(player_id, word, getCriteriaResult)
+
+
+    async def ascore_player_together(self, llm, player_id: int, word: str, prompt: str) -> Dict[str, Any]:
+        getCriteriaResult = await self.ascore_combined_rating(llm, word, player_id, prompt)
+
+        return self.together_player_score(player_id, word, getCriteriaResult)
+
+
+    def together_player_score(self, player_id: int, word: str, getCriteriaResult: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn one player's combined rubric result into their playerScores entry"""
+
+        # You can add other scoring components later
+        totalScore = getCriteriaResult["score"]
+        logger.debug("Got player %s total score of %s from answer - %s", player_id, totalScore, word)
+
+        playerScore = {
+            'id': player_id,
+            'word': word,
+            'criteriaResult': getCriteriaResult['score'],
+            'total': totalScore
+        }
+        if getCriteriaResult.get('degraded'):
+            playerScore['degraded'] = ["combined"]
+
+        return playerScore
+
+
+    def calculate_total_score_batched(self, llm, words: Dict[int, str], prompt: str,
+                                      deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Calculate total scores for all players with one batched call, retrying missing players one by one"""
+
+        if deadline is not None:
+            # The batch is one call, so it either makes the deadline for everybody or nobody
+            (playerScores,), _ = self.run_until(
+                [partial(self.calculate_total_score_batched, llm, words, prompt)],
+                [lambda: [self.estimate_player_score(player_id, word, prompt) for player_id, word in words.items()]],
+                deadline)
+            return playerScores
+
+        logger.debug("Starting calculation for %d players", len(words))
+
+        # Words scored in an earlier round never go back to the LLM
+        batchScores = {}
+        if self.cache is not None:
+            for player_id, word in words.items():
+                cachedScore = self.cache.get("combined", word, prompt, self.model_name)
+                if cachedScore is not None:
+                    self.call_stats.record("combined", 'cache_hits')
+                    batchScores[str(player_id)] = {'id': player_id, 'score': cachedScore}
+
+        uncached = {player_id: word for player_id, word in words.items() if str(player_id) not in batchScores}
+        if uncached:
+            newScores = self.score_batch_rating(llm, uncached, prompt)
+            batchScores.update(newScores)
+
+            if self.cache is not None:
+                for player_id, word in uncached.items():
+                    if str(player_id) in newScores:
+                        self.cache.set("combined", word, newScores[str(player_id)]['score'], prompt, self.model_name)
+
+        missing = [(player_id, word) for player_id, word in words.items() if str(player_id) not in batchScores]
+        if missing:
+            logger.info("Batch response missing %d players, retrying them separately", len(missing))
+
+            retried = self.run_concurrently([
+                partial(self.score_combined_rating, llm, word, player_id, prompt)
+                for player_id, word in missing
+            ])
+            for (player_id, word), result in zip(missing, retried):
+                batchScores[str(player_id)] = result
+
+        return [self.together_player_score(player_id, word, batchScores[str(player_id)]) for player_id, word in words.items()]
+
+
+    def generate_prompt(self, llm,  theme: str, with_answers: bool = False):
+        """Generate a prompt covering a certain theme for the word game. with_answers also asks for the
+        expected answers, returning (prompt, [(answer, compatibility), ...]) and indexing them for scoring"""
+
+        logger.debug("Generating prompt for theme %r", theme)
+
+        if with_answers:
+            prompt, answers = self.parse_prompt_answers(self.invoke_llm(self.answers_prompt(theme), "answers"))
+            if prompt is None:
+                prompt = self.invoke_llm(self.theme_prompt(theme), "prompt")
+
+            return prompt, self.index_answers(prompt, answers)
+
+        finalResponse = self.invoke_llm(self.theme_prompt(theme), "prompt")
+
+        logger.debug("Prompt generated")
+
+        return finalResponse
 
-        return playerScores
 
+    async def agenerate_prompt(self, llm, theme: str, with_answers: bool = False):
+        if with_answers:
+            prompt, answers = self.parse_prompt_answers(await self.ainvoke_llm(self.answers_prompt(theme), "answers"))
+            if prompt is None:
+                prompt = await self.ainvoke_llm(self.theme_prompt(theme), "prompt")
 
-    def generate_prompt(self, llm,  theme: str) -> str:
-        """Generate a prompt covering a certain theme for the word game"""
+            return prompt, self.index_answers(prompt, answers)
 
-        print("[✔] Generating prompt...")
+        return await self.ainvoke_llm(self.theme_prompt(theme), "prompt")
+
+
+    def answers_prompt(self, theme: str) -> str:
+        """theme_prompt, also asking for the words players are likely to answer with"""
+
+        prompt = self.theme_prompt(theme).replace("Return only the prompt text without any additional explanation.", "")
+
+        return prompt + """
+        Also list 15 to 25 single words that players aged 7 to 11 might answer with, from best to worst fit,
+        each with how well it fits the prompt, scored from 1-15 using this scale:
+        1-3: Poor match (tangentially related at best)
+        4-7: Fair match (somewhat related but not ideal)
+        8-11: Good match (clearly related and appropriate)
+        12-15: Excellent match (perfectly captures the prompt's meaning)
+
+        Return ONLY a JSON object with this exact format:
+        {"prompt": "PROMPT TEXT", "answers": [{"word": "WORD", "score": SCORE}, ...]}
+        """
+
+
+    def parse_prompt_answers(self, response: str) -> Tuple[Optional[str], Dict[str, float]]:
+        """The prompt and its answers from an answers_prompt reply, (None, {}) when it didn't decode"""
+
+        try:
+            parsed = json.loads(self.clean_json_response(response))
+            prompt = parsed['prompt'].strip()
+            if not prompt:
+                raise ValueError("Empty prompt")
+
+            answers = {}
+            for answer in parsed.get('answers') or []:
+                if isinstance(answer, dict) and isinstance(answer.get('word'), str):
+                    score = float(answer.get('score'))
+                    low, high = SCORE_RANGES["compatibility"]
+                    if low <= score <= high:
+                        answers[answer['word'].strip()] = score
+
+            return prompt, answers
+
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as e:
+            self.call_stats.record("answers", 'parse_failures')
+            logger.warning("Error while parsing prompt answers, generating the prompt alone: %s. Response: %r", e, response)
+            return None, {}
+
+
+    def index_answers(self, prompt: str, answers: Dict[str, float]) -> List[Tuple[str, float]]:
+        """Remember a prompt's expected answers for scoring, ranked best first"""
+
+        index = AnswerIndex(answers)
+        if self.answer_index is not None and len(index):
+            self.answer_index.put(prompt, index)
+
+        # Other processes sharing the cache file find the exact answers there too
+        if self.cache is not None:
+            for word, score in answers.items():
+                self.cache.set("compatibility", word, score, prompt, self.model_name)
+
+        return index.ranked()
+
+
+    def theme_prompt(self, theme: str) -> str:
+        """Instructions for generating one game prompt on a theme"""
 
         prompt = f"""
         Create a SINGLE, clear prompt for a word association game following the theme "{theme}". 
@@ -368,12 +1359,7 @@ class Word_Assesment:
         Return only the prompt text without any additional explanation.
         """
 
-        response = self.llm.invoke(prompt).content.strip()
-        finalResponse = response.split('</think>')[-1].strip()
-
-        print("[✔] Prompt Generated")
-
-        return finalResponse
+        return prompt
 
 
     def get_player_input(self, player_num: int) -> str:
@@ -397,40 +1383,294 @@ class Word_Assesment:
                 print("Please enter a valid number.")
 
 
-    def evaluate_words(self, llm, prompt: str, words: Dict[int, str]) -> Dict[str, Any]:
-        """Evaluate all words and determine the winner"""
-        print("Evaluating words...")
-        print(f"Prompt: {prompt}")
+    def evaluate_words(self, llm, prompt: str, words: Dict[int, str],
+                       precomputed: Optional[Dict[Any, Dict[str, Any]]] = None,
+                       deadline_seconds: Optional[float] = None,
+                       submitted: Optional[Dict[Any, float]] = None) -> Dict[str, Any]:
+        """Evaluate all words and determine the winner. Players in precomputed were already scored
+        (e.g. while the others were still typing) and only get ranked. Scores the LLM can't deliver
+        within deadline_seconds (default self.deadline_seconds) are estimated locally and marked degraded.
+        submitted holds each player's submission time when known, the earlier of two tied players wins"""
+        if self.is_large_lobby(words):
+            return self.evaluate_large_lobby(llm, prompt, words, precomputed, deadline_seconds, submitted=submitted)
+
+        logger.info("Evaluating %d words for prompt: %s", len(words), prompt)
+        logger.debug("Player words: %s", words)
+
+        deadline = self.deadline_for(deadline_seconds)
+
+        precomputed = precomputed or {}
+        remaining = {player_id: word for player_id, word in words.items() if player_id not in precomputed}
+
+        if not remaining:
+            playerScores = []
+        elif self.scoring_mode == "separately":
+            playerScores = self.calculate_total_score_separately(llm, remaining, prompt, deadline)
+        elif self.scoring_mode == "batch":
+            playerScores = self.calculate_total_score_batched(llm, remaining, prompt, deadline)
+        else:
+            playerScores = self.calculate_total_score_together(llm, remaining, prompt, deadline)
+
+        playerScores = [precomputed[player_id] for player_id in words if player_id in precomputed] + playerScores
+
+        return self.rank_players(llm, prompt, playerScores, submitted, deadline)
+
+
+    def deadline_for(self, deadline_seconds: Optional[float] = None) -> Optional[float]:
+        """time.monotonic() deadline for a budget in seconds, falling back to the instance default"""
+
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_seconds
+
+        return None if deadline_seconds is None else time.monotonic() + deadline_seconds
+
+
+    def score_player(self, llm, player_id: int, word: str, prompt: str) -> Dict[str, Any]:
+        """Score one player on their own, batch mode falls back to the combined rubric"""
+
+        if self.scoring_mode == "separately":
+            return self.score_player_separately(llm, player_id, word, prompt)
+
+        return self.score_player_together(llm, player_id, word, prompt)
+
+
+    async def aevaluate_words(self, llm, prompt: str, words: Dict[int, str],
+                              deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """evaluate_words for the async server. The default 'together' mode awaits the LLM directly;
+        the other modes run the threaded pipeline off the event loop"""
+
+        if self.scoring_mode != "together" or self.is_large_lobby(words):
+            return await asyncio.to_thread(self.evaluate_words, llm, prompt, words, None, deadline_seconds)
+
+        deadline = self.deadline_for(deadline_seconds)
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def scorePlayer(player_id, word):
+            async with semaphore:
+                return await self.ascore_player_together(llm, player_id, word, prompt)
 
+        if deadline is None:
+            playerScores = await asyncio.gather(*(scorePlayer(player_id, word) for player_id, word in words.items()))
+            return await asyncio.to_thread(self.rank_players, llm, prompt, list(playerScores))
+
+        tasks = [asyncio.ensure_future(scorePlayer(player_id, word)) for player_id, word in words.items()]
+        await asyncio.wait(tasks, timeout=self.remaining_seconds(deadline))
+
+        playerScores = []
+        for task, (player_id, word) in zip(tasks, words.items()):
+            if task.done() and task.exception() is None:
+                playerScores.append(task.result())
+            else:
+                # Not cancelled: a coalesced call may be shared with other games, and its score still gets cached
+                task.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+                playerScores.append(self.estimate_player_score(player_id, word, prompt))
+
+        # A tie-break may call the LLM, which would block the event loop
+        return await asyncio.to_thread(self.rank_players, llm, prompt, playerScores, None, deadline)
+
+
+    def evaluate_words_stream(self, llm, prompt: str, words: Dict[int, str],
+                              deadline_seconds: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield each player's score as soon as it is ready, then the ranked result as the last event"""
+        logger.info("Evaluating %d words (streaming) for prompt: %s", len(words), prompt)
+
+        if self.is_large_lobby(words):
+            # Scores are shared between players, so they are all known at once
+            evaluationResult = self.evaluate_large_lobby(llm, prompt, words, deadline_seconds=deadline_seconds)
+            for playerScore in evaluationResult['playerScores']:
+                yield {'event': 'score', 'playerScore': playerScore}
+            yield {'event': 'result', **evaluationResult}
+            return
+
+        deadline = self.deadline_for(deadline_seconds)
+        playerScores = []
+
+        if self.scoring_mode == "batch":
+            # One call scores everybody, so all scores arrive together
+            for playerScore in self.calculate_total_score_batched(llm, words, prompt, deadline):
+                playerScores.append(playerScore)
+                yield {'event': 'score', 'playerScore': playerScore}
+        else:
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(words))))
+            futures = {executor.submit(self.score_player, llm, player_id, word, prompt): (player_id, word)
+                       for player_id, word in words.items()}
+            executor.shutdown(wait=False)
+
+            pending = set(futures)
+            try:
+                for future in as_completed(futures, timeout=self.remaining_seconds(deadline)):
+                    pending.discard(future)
+                    if deadline is not None and future.exception() is not None:
+                        logger.warning("Scoring call failed, using the local estimate: %s", future.exception())
+                        playerScore = self.estimate_player_score(*futures[future], prompt)
+                    else:
+                        playerScore = future.result()
+                    playerScores.append(playerScore)
+                    yield {'event': 'score', 'playerScore': playerScore}
+            except FutureTimeoutError:
+                logger.warning("%d players missed the deadline, using local estimates", len(pending))
+
+            for future in pending:
+                future.cancel()
+                playerScore = self.estimate_player_score(*futures[future], prompt)
+                playerScores.append(playerScore)
+                yield {'event': 'score', 'playerScore': playerScore}
+
+        yield {'event': 'result', **self.rank_players(llm, prompt, playerScores, deadline=deadline)}
+
+
+    def is_large_lobby(self, words: Dict[int, str]) -> bool:
+        return self.large_lobby_players is not None and len(words) >= self.large_lobby_players
+
+
+    def evaluate_large_lobby(self, llm, prompt: str, words: Dict[int, str],
+                             precomputed: Optional[Dict[Any, Dict[str, Any]]] = None,
+                             deadline_seconds: Optional[float] = None,
+                             leaderboard_size: int = DEFAULT_LEADERBOARD_SIZE,
+                             submitted: Optional[Dict[Any, float]] = None) -> Dict[str, Any]:
+        """evaluate_words for a whole class. Players who typed the same word share its score, so every distinct
+        word is scored once, LARGE_LOBBY_BATCH_SIZE words per batched call. playerScores stay in submission
+        order and only the top leaderboard_size players are sorted, into 'leaderboard'"""
+        logger.info("Evaluating %d words (large lobby) for prompt: %s", len(words), prompt)
+
+        deadline = self.deadline_for(deadline_seconds)
+        precomputed = precomputed or {}
+
+        # Same normalization as the score cache, so 'Dog ' and 'dog' are one word
+        uniqueWords = list(dict.fromkeys(word.strip().lower() for player_id, word in words.items()
+                                         if player_id not in precomputed))
+        wordScores = self.score_unique_words(llm, uniqueWords, prompt, deadline)
+
+        playerScores = []
         for player_id, word in words.items():
-            print(f"Player {player_id}: {word}")
+            if player_id in precomputed:
+                playerScores.append(precomputed[player_id])
+            else:
+                playerScores.append({**wordScores[word.strip().lower()], 'id': player_id, 'word': word})
+
+        evaluationResult = self.rank_large_lobby(llm, prompt, playerScores, leaderboard_size, submitted, deadline)
+        evaluationResult['unique_words'] = len(uniqueWords)
+
+        return evaluationResult
+
+
+    def score_unique_words(self, llm, words: List[str], prompt: str,
+                           deadline: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Combined scores of distinct words, batched and run concurrently, keyed by word"""
+
+        batches = [dict(enumerate(words[start:start + LARGE_LOBBY_BATCH_SIZE], start=start))
+                   for start in range(0, len(words), LARGE_LOBBY_BATCH_SIZE)]
+        logger.debug("Scoring %d distinct words in %d batches", len(words), len(batches))
+
+        results, degraded = self.run_until(
+            [partial(self.calculate_total_score_batched, llm, batch, prompt) for batch in batches],
+            [partial(self.estimate_batch, batch, prompt) for batch in batches],
+            deadline)
+
+        wordScores = {}
+        for batchScores, batchDegraded in zip(results, degraded):
+            for wordScore in batchScores:
+                if batchDegraded:
+                    wordScore['degraded'] = ["combined"]
+                wordScores[wordScore['word']] = wordScore
 
-        print("\nScoring Players' Words")
-        # playerScores = self.calculate_total_score_separately(llm, words, prompt)
-        playerScores = self.calculate_total_score_together(llm, words, prompt)
+        return wordScores
+
+
+    def estimate_batch(self, words: Dict[int, str], prompt: str) -> List[Dict[str, Any]]:
+        """Local estimates in calculate_total_score_batched's shape"""
+
+        return [self.together_player_score(word_id, word, self.estimate_combined(word, word_id, prompt))
+                for word_id, word in words.items()]
+
+
+    def rank_large_lobby(self, llm, prompt: str, playerScores: List[Dict[str, Any]],
+                         leaderboard_size: int = DEFAULT_LEADERBOARD_SIZE,
+                         submitted: Optional[Dict[Any, float]] = None,
+                         deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Winners and the top leaderboard_size players by heap selection, without sorting everybody"""
+
+        leaderboard = heapq.nlargest(leaderboard_size, playerScores, key=lambda x: x['total'])
+
+        winners = []
+        tieBreak = None
+        if leaderboard:
+            topTotal = leaderboard[0]['total']
+            tied_players = [score for score in playerScores if score['total'] == topTotal]
+            if len(tied_players) > 1:
+                logger.info("Tie between %d players! Breaking tie...", len(tied_players))
+                winner_ids, tieBreak = self.decide_tie(llm, tied_players, prompt, submitted, deadline)
+                winners = [f"Player {id}" for id in winner_ids]
+                leaderboard.sort(key=lambda x: (x['total'], x['total'] == topTotal and x['id'] in winner_ids), reverse=True)
+            else:
+                winners = [f"Player {leaderboard[0]['id']}"]
+
+        return {
+            'playerScores': playerScores,
+            'leaderboard': leaderboard,
+            'winners': winners,
+            'tie_break': tieBreak,
+            'prompt': prompt,
+            'degraded': [score['id'] for score in playerScores if score.get('degraded')],
+            'spelling_suggestions': self.spelling_suggestions(playerScores)
+        }
+
+
+    def rank_players(self, llm, prompt: str, playerScores: List[Dict[str, Any]],
+                     submitted: Optional[Dict[Any, float]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Sort players by total score and pick the winner(s), a tie-break only waiting on the LLM until deadline"""
 
         # Sort players by total score (descending - higher score is better)
         playerScores.sort(key=lambda x: x['total'], reverse=True)
 
         # Check for ties
         winners = []
+        tieBreak = None
         if len(playerScores) > 1 and playerScores[0]['total'] == playerScores[1]['total']:
-            print("Tie detected! Breaking tie...")
+            logger.info("Tie detected! Breaking tie...")
 
-            # Implement tie-breaking logic here
-            tied_players = [score for score in playerScores if score['total'] == playerScores[0]['total']]
-            winner_ids = self.break_tie(tied_players)
+            topTotal = playerScores[0]['total']
+            tied_players = [score for score in playerScores if score['total'] == topTotal]
+            winner_ids, tieBreak = self.decide_tie(llm, tied_players, prompt, submitted, deadline)
             winners = [f"Player {id}" for id in winner_ids]
+
+            # Winners first among the players they tied with
+            playerScores.sort(key=lambda x: (x['total'], x['total'] == topTotal and x['id'] in winner_ids), reverse=True)
         else:
             winners = [f"Player {playerScores[0]['id']}"]
 
         return {
             'playerScores': playerScores,
             'winners': winners,
-            'prompt': prompt
+            # What decided a tie: a sub-score, submission_time or llm, None when nothing did
+            'tie_break': tieBreak,
+            'prompt': prompt,
+            # Players with at least one score estimated locally because the LLM missed the deadline
+            'degraded': [score['id'] for score in playerScores if score.get('degraded')],
+            # Dictionary words close to the words the dictionary doesn't know, by player
+            'spelling_suggestions': self.spelling_suggestions(playerScores)
         }
 
 
+    def spelling_suggestions(self, playerScores: List[Dict[str, Any]]) -> Dict[Any, List[str]]:
+        """Dictionary words one edit away from each player's word the dictionary doesn't know"""
+
+        if self.spell_checker is None:
+            return {}
+
+        suggestions = {}
+        byWord: Dict[str, List[str]] = {}
+        for score in playerScores:
+            word = score.get('word', '').strip().lower()
+            if word not in byWord:
+                byWord[word] = [] if not word or self.spell_checker.is_known(word) else self.spell_checker.suggest(word)
+            if byWord[word]:
+                suggestions[score['id']] = byWord[word]
+
+        return suggestions
+
+
     def display_result(self, evaluationResult: Dict[str, Any]):
         """Display the winner and scores in a readable format"""
 
@@ -0,0 +1,109 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from plurals import word_forms
+
+DEFAULT_MAX_PROMPTS = 1024
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase letters only, so 'Dolphins' and "dolphin's" are the same word"""
+
+    return re.sub(r"[^a-z]", "", word.lower())
+
+
+def prompt_key(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
+class AnswerIndex:
+    """Expected answers for one prompt and their 1-15 compatibility scores.
+
+    Each answer is also filed under the singulars it may be the plural of, and a word is looked up by its
+    own forms, so 'buses' finds an indexed 'bus' and 'dolphin' an indexed 'dolphins'.
+    """
+
+    def __init__(self, answers: Dict[str, float]):
+        self.answers: Dict[str, float] = {}
+        self.forms: Dict[str, float] = {}
+        for word, score in answers.items():
+            word = normalize_word(word)
+            if not word:
+                continue
+
+            self.answers[word] = max(score, self.answers.get(word, score))
+            for form in word_forms(word):
+                self.forms[form] = max(score, self.forms.get(form, score))
+
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+
+    def lookup(self, word: str) -> Optional[float]:
+        return next((self.forms[form] for form in word_forms(normalize_word(word)) if form in self.forms), None)
+
+
+    def ranked(self) -> List[Tuple[str, float]]:
+        """Answers from best to worst fit"""
+
+        return sorted(self.answers.items(), key=lambda answer: answer[1], reverse=True)
+
+
+class AnswerIndexStore:
+    """Answer indexes of recently generated prompts, least recently used dropped past max_prompts"""
+
+    def __init__(self, max_prompts: int = DEFAULT_MAX_PROMPTS):
+        self.max_prompts = max_prompts
+        self.indexes: "OrderedDict[str, AnswerIndex]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def put(self, prompt: str, index: AnswerIndex):
+        with self.lock:
+            self.indexes[prompt_key(prompt)] = index
+            self.indexes.move_to_end(prompt_key(prompt))
+
+            while len(self.indexes) > self.max_prompts:
+                self.indexes.popitem(last=False)
+
+
+    def get(self, prompt: str) -> Optional[AnswerIndex]:
+        with self.lock:
+            index = self.indexes.get(prompt_key(prompt))
+            if index is not None:
+                self.indexes.move_to_end(prompt_key(prompt))
+
+            return index
+
+
+    def compatibility(self, word: str, prompt: str) -> Optional[float]:
+        """Compatibility of word with prompt when the prompt's index knows it, else None"""
+
+        index = self.get(prompt)
+        score = index.lookup(word) if index is not None else None
+
+        with self.lock:
+            if score is not None:
+                self.hits += 1
+            elif index is not None:
+                self.misses += 1
+
+        return score
+
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'prompts': len(self.indexes),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
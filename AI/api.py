@@ -1,21 +1,184 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, g
 from flask_cors import CORS  # To handle Cross-Origin Resource Sharing
-from langchain.chat_models import init_chat_model
-from Word_Assesment import Word_Assesment
+from Word_Assesment import Word_Assesment, DEFAULT_MAX_CONCURRENCY, RUBRIC_PREFIXES, BATCH_PROMPT
+from score_cache import ScoreCache
+from spell_checker import SpellChecker
+from word_frequency import WordFrequencyIndex
+from spelling_complexity import SpellingComplexityScorer
+from prompt_pool import PromptPool, DEFAULT_CAPACITY, DEFAULT_LOW_WATER
+from game_sessions import GameSessionStore, DEFAULT_SESSION_WORKERS
+from single_flight import SingleFlight
+from llm_stats import LLMCallStats, prometheus_gauges
+from log_config import configure_logging
+from llm_pool import LLMPool, create_llm, llm_model_name
+from model_warmup import LazyLLM, ModelWarmup, parse_keep_alive, DEFAULT_KEEP_ALIVE, DEFAULT_KEEP_WARM_SECONDS
+from answer_index import AnswerIndexStore
+from embedding_compatibility import EmbeddingCompatibilityScorer, create_embedder, DEFAULT_TIMEOUT_SECONDS as DEFAULT_EMBEDDING_TIMEOUT_SECONDS
+from llm_scheduler import LLMScheduler, SchedulerFull, INTERACTIVE, BACKGROUND, DEFAULT_LLM_CONCURRENCY, DEFAULT_MAX_QUEUE
+import httpx
+import json
+import logging
 import os  # Import os for environment variables or similar needs
+import threading
+import time
 
 CHAT_MODEL = "qwen3:0.6b"  # Or load from an environment variable
+MAX_SCORING_CONCURRENCY = int(os.environ.get('MAX_SCORING_CONCURRENCY', DEFAULT_MAX_CONCURRENCY))
+ROUND_DEADLINE_SECONDS = float(os.environ.get('ROUND_DEADLINE_SECONDS', 60)) or None  # Then scores are estimated locally, 0 waits
+SCORING_MODE = os.environ.get('SCORING_MODE', 'together')  # together, separately or batch
+SCORE_CACHE_PATH = os.environ.get('SCORE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'score_cache.sqlite3'))
+PROMPT_POOL_CAPACITY = int(os.environ.get('PROMPT_POOL_CAPACITY', DEFAULT_CAPACITY))
+PROMPT_POOL_LOW_WATER = int(os.environ.get('PROMPT_POOL_LOW_WATER', DEFAULT_LOW_WATER))
+PROMPT_POOL_THEMES = os.environ.get('PROMPT_POOL_THEMES', ',nature').split(',')  # Themes to fill at startup, '' is no theme
+LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS', 60))
+LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', 32))
+OLLAMA_URLS = os.environ.get('OLLAMA_URLS', '')  # Comma separated 'url' or 'model@url', more than one makes an LLMPool
+SESSION_SCORING_WORKERS = int(os.environ.get('SESSION_SCORING_WORKERS', DEFAULT_SESSION_WORKERS))
+FAST_SCORING_MODE = os.environ.get('FAST_SCORING_MODE', '0') == '1'  # No reasoning, capped schema-constrained replies
+PROMPT_ANSWER_INDEX = os.environ.get('PROMPT_ANSWER_INDEX', '0') == '1'  # Generate expected answers with each prompt
+MAX_LOBBY_PLAYERS = int(os.environ.get('MAX_LOBBY_PLAYERS', 500))
+LARGE_LOBBY_PLAYERS = int(os.environ.get('LARGE_LOBBY_PLAYERS', 30)) or None  # Rounds this big dedupe and batch words, 0 never
+LLM_CONCURRENCY = int(os.environ.get('LLM_CONCURRENCY', DEFAULT_LLM_CONCURRENCY))  # Match OLLAMA_NUM_PARALLEL over all endpoints, 0 no limit
+LLM_QUEUE_SIZE = int(os.environ.get('LLM_QUEUE_SIZE', DEFAULT_MAX_QUEUE))  # LLM calls waiting before new games get 503
+COMPATIBILITY_EMBEDDINGS = os.environ.get('COMPATIBILITY_EMBEDDINGS', '')  # Ollama embedding model or 'hashing' scores compatibility without the LLM, '' off
+COMPATIBILITY_EMBEDDINGS_URL = os.environ.get('COMPATIBILITY_EMBEDDINGS_URL') or None  # Ollama serving the embedding model, default localhost
+COMPATIBILITY_EMBEDDINGS_TIMEOUT_SECONDS = float(os.environ.get('COMPATIBILITY_EMBEDDINGS_TIMEOUT_SECONDS', DEFAULT_EMBEDDING_TIMEOUT_SECONDS))
+LLM_WARMUP = os.environ.get('LLM_WARMUP', '1') == '1'  # Load the model at startup, 0 leaves it to the first request
+LLM_KEEP_ALIVE = parse_keep_alive(os.environ.get('LLM_KEEP_ALIVE', DEFAULT_KEEP_ALIVE))  # How long Ollama keeps the model loaded, e.g. 30m, -1 never unloads
+LLM_KEEP_WARM_SECONDS = float(os.environ.get('LLM_KEEP_WARM_SECONDS', DEFAULT_KEEP_WARM_SECONDS))
+PROMPT_POOL_PREFILL_WAIT_SECONDS = float(os.environ.get('PROMPT_POOL_PREFILL_WAIT_SECONDS', 120))  # Prefill anyway when warm-up hasn't succeeded by then
+
+# LOG_LEVEL and LOG_SAMPLE_RATE pick how much of the per-call logging is kept
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes, adjust as needed for production
 
-# Initialize LLM once
-try:
-    llm = init_chat_model(CHAT_MODEL, model_provider='ollama')
-    print(f"Successfully connected to LLM: {CHAT_MODEL}")
-except Exception as e:
-    print(f"Error connecting LLM on startup: {e}")
-    llm = None  # Handle case where LLM fails to initialize
+# Shared by every request and, through the SQLite file, by every worker process
+score_cache = ScoreCache(path=SCORE_CACHE_PATH)
+spell_checker = SpellChecker.load()
+frequency_index = WordFrequencyIndex.load()
+complexity_scorer = SpellingComplexityScorer()
+# Identical scoring calls in flight at the same time, from any game, share one LLM call
+single_flight = SingleFlight()
+# Latency, tokens and parse failures of every LLM call
+llm_stats = LLMCallStats()
+# Expected answers of generated prompts, compatibility for listed words needs no LLM call
+answer_index = AnswerIndexStore()
+# Word and prompt embeddings, compatibility is a cosine similarity instead of an LLM call
+compatibility_scorer = EmbeddingCompatibilityScorer(create_embedder(COMPATIBILITY_EMBEDDINGS, COMPATIBILITY_EMBEDDINGS_URL),
+                                                    timeout_seconds=COMPATIBILITY_EMBEDDINGS_TIMEOUT_SECONDS) \
+    if COMPATIBILITY_EMBEDDINGS else None
+# Every LLM call waits here for one of LLM_CONCURRENCY slots, players' scoring ahead of prompt pre-generation
+scheduler = LLMScheduler(LLM_CONCURRENCY, LLM_QUEUE_SIZE) if LLM_CONCURRENCY > 0 else None
+
+def create_chat_model():
+    # One client (or one per endpoint) for the whole process, keeping its connections to Ollama alive between calls
+    return create_llm(CHAT_MODEL, OLLAMA_URLS, client_kwargs={
+        'timeout': LLM_TIMEOUT_SECONDS,
+        'limits': httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                               keepalive_expiry=300),
+    }, keep_alive=LLM_KEEP_ALIVE)
+
+
+# Requests that count towards time to first request, probes and stats don't
+GAME_ROUTES = ('/start_game', '/submit_words', '/submit_word', '/evaluate', '/submit_words_stream')
+
+# Built on first use, so importing this module stays fast and needs no Ollama
+llm = LazyLLM(create_chat_model, llm_model_name(CHAT_MODEL, OLLAMA_URLS))
+# Rubric heads of the prompts this configuration sends, large lobbies always score in batches
+WARM_PREFIXES = RUBRIC_PREFIXES[SCORING_MODE] + ([BATCH_PROMPT] if LARGE_LOBBY_PLAYERS and SCORING_MODE != "batch" else [])
+# Loads the model into Ollama before /ready answers 200 and keeps it, and the rubrics' KV cache, warm
+warmup = ModelWarmup(llm, keep_alive=LLM_KEEP_ALIVE, keep_warm_seconds=LLM_KEEP_WARM_SECONDS, prefixes=WARM_PREFIXES,
+                     scheduler=scheduler)
+
+
+def llm_pool() -> LLMPool:
+    """The LLM pool once the client exists, else None"""
+
+    client = getattr(llm, 'instance', llm)
+    return client if isinstance(client, LLMPool) else None
+
+
+def create_word_assessment(priority: str = INTERACTIVE) -> Word_Assesment:
+    """Scorer for one request, sharing the process wide cache, local scorers and LLM scheduler"""
+
+    return Word_Assesment(llm, max_concurrency=MAX_SCORING_CONCURRENCY, scoring_mode=SCORING_MODE,
+                          cache=score_cache, model_name=getattr(llm, 'model', CHAT_MODEL), spell_checker=spell_checker,
+                          frequency_index=frequency_index, complexity_scorer=complexity_scorer,
+                          single_flight=single_flight, fast_mode=FAST_SCORING_MODE, call_stats=llm_stats,
+                          deadline_seconds=ROUND_DEADLINE_SECONDS, answer_index=answer_index,
+                          large_lobby_players=LARGE_LOBBY_PLAYERS, scheduler=scheduler, priority=priority,
+                          compatibility_scorer=compatibility_scorer)
+
+
+def generate_game_prompt(theme: str, priority: str = BACKGROUND) -> str:
+    """A new prompt, with its expected answers indexed for scoring when PROMPT_ANSWER_INDEX is on.
+    The prompt pool generates in the background lane, a player waiting on /start_game in the interactive one"""
+
+    if PROMPT_ANSWER_INDEX:
+        return create_word_assessment(priority).generate_prompt(llm, theme, with_answers=True)[0]
+
+    return create_word_assessment(priority).generate_prompt(llm, theme)
+
+
+def admit():
+    """Fail fast with SchedulerFull while the LLM queue is full, before the request starts any work"""
+
+    if scheduler is not None:
+        scheduler.check(INTERACTIVE)
+
+
+def queue_full(error: SchedulerFull):
+    return (jsonify({"error": "Too many games are being scored right now, please retry shortly.",
+                     "retry_after": error.retry_after}),
+            503, {'Retry-After': str(error.retry_after)})
+
+
+# Prompts are generated in the background so /start_game rarely waits on the LLM. The pool is
+# filled once the model is warm, so the first prompts don't race the model load
+prompt_pool = PromptPool(generate_game_prompt, capacity=PROMPT_POOL_CAPACITY, low_water=PROMPT_POOL_LOW_WATER)
+background_started = threading.Event()
+
+# Games in progress, so each word can be scored as soon as it is typed. Sessions live in this
+# process only, so multi-worker deployments need sticky routing on game_id
+game_sessions = GameSessionStore(create_word_assessment, max_workers=SESSION_SCORING_WORKERS)
+
+
+def prefill_prompt_pool():
+    """Prefill once the model is warm, or after PROMPT_POOL_PREFILL_WAIT_SECONDS while warm-up keeps failing"""
+
+    if LLM_WARMUP and not warmup.ready.wait(PROMPT_POOL_PREFILL_WAIT_SECONDS):
+        logger.warning("LLM not warm after %.0fs, prefilling the prompt pool anyway", PROMPT_POOL_PREFILL_WAIT_SECONDS)
+    prompt_pool.prefill(PROMPT_POOL_THEMES)
+
+
+def start_background():
+    """Warm up the model and prefill the prompt pool. The servers call this at startup, importing this
+    module (benchmarks, bulk_evaluate) sends no LLM calls"""
+
+    if background_started.is_set():
+        return
+    background_started.set()
+
+    if LLM_WARMUP:
+        warmup.start()
+        threading.Thread(target=prefill_prompt_pool, name="prompt-pool-prefill", daemon=True).start()
+    else:
+        prefill_prompt_pool()
+
+
+@app.before_request
+def track_request_start():
+    g.started = time.monotonic()
+
+
+@app.after_request
+def track_first_request(response):
+    if request.path in GAME_ROUTES and 'started' in g:
+        warmup.record_request(g.started, time.monotonic())
+    return response
 
 
 @app.route('/')
@@ -23,40 +186,112 @@ def home():
     return "Welcome to The Notebook API!"
 
 
+@app.route('/cache_stats')
+def cache_stats():
+    return jsonify(score_cache.stats())
+
+
+@app.route('/coalescing_stats')
+def coalescing_stats():
+    return jsonify(single_flight.stats())
+
+
+@app.route('/metrics')
+def metrics():
+    """LLM call latency, tokens, cache hits and parse failures plus cache, coalescing and pool counters for Prometheus"""
+
+    body = llm_stats.prometheus()
+    body += prometheus_gauges("score_cache", score_cache.stats())
+    body += prometheus_gauges("coalescing", single_flight.stats())
+    body += prometheus_gauges("answer_index", answer_index.stats())
+    if compatibility_scorer is not None:
+        body += prometheus_gauges("compatibility_embeddings", compatibility_scorer.stats())
+    body += prometheus_gauges("prompt_pool", prompt_pool.stats(), labels={'depth': 'theme'})
+    if llm_pool() is not None:
+        body += llm_pool().prometheus()
+    if scheduler is not None:
+        body += scheduler.prometheus()
+    body += warmup.prometheus()
+
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/llm_pool_stats')
+def llm_pool_stats():
+    if llm_pool() is None:
+        return jsonify({"error": "Not running an LLM pool, set OLLAMA_URLS to more than one endpoint."}), 404
+
+    return jsonify(llm_pool().stats())
+
+
+@app.route('/scheduler_stats')
+def scheduler_stats():
+    if scheduler is None:
+        return jsonify({"error": "No LLM scheduler, LLM_CONCURRENCY is 0."}), 404
+
+    return jsonify(scheduler.stats())
+
+
+@app.route('/ready')
+def ready():
+    """Readiness probe, 200 once the model is loaded and answering, 503 before that or while pings fail"""
+
+    if not LLM_WARMUP:
+        return jsonify({"ready": True, "warmup": "disabled"})
+
+    return jsonify(warmup.stats()), 200 if warmup.ready.is_set() else 503
+
+
+@app.route('/warmup_stats')
+def warmup_stats():
+    return jsonify(warmup.stats())
+
+
+@app.route('/llm_stats')
+def llm_call_stats():
+    return jsonify({"fast_mode": FAST_SCORING_MODE, "operations": llm_stats.stats()})
+
+
+@app.route('/prompt_pool_stats')
+def prompt_pool_stats():
+    return jsonify(prompt_pool.stats())
+
+
 @app.route('/start_game', methods=['POST'])
 def start_game():
-    if llm is None:
-        return jsonify({"error": "LLM not initialized. Please check backend logs."}), 500
-
     data = request.get_json()
     player_count = data.get('player_count')
     theme = data.get('theme', '')  # Allow theme to be optional
 
-    if not player_count or not (2 <= player_count <= 5):
-        return jsonify({"error": "Invalid player count. Must be between 2 and 5."}), 400
-
-    word_assessment = Word_Assesment(llm)
+    if not player_count or not (2 <= player_count <= MAX_LOBBY_PLAYERS):
+        return jsonify({"error": f"Invalid player count. Must be between 2 and {MAX_LOBBY_PLAYERS}."}), 400
 
     try:
-        # Generate prompt
-        prompt = word_assessment.generate_prompt(llm, theme)
+        admit()
+
+        # Take a pre-generated prompt, generating one inline only when none is ready
+        prompt = prompt_pool.pop(theme)
+        if prompt is None:
+            prompt = generate_game_prompt(theme, INTERACTIVE)
+            prompt_pool.served(prompt)
+        session = game_sessions.create(prompt)
 
         # Prepare response for the frontend
         return jsonify({
             "prompt": prompt,
+            "game_id": session.game_id,
             "player_count": player_count,
             "message": "Game started, prompt generated. Awaiting player words."
         })
+    except SchedulerFull as e:
+        return queue_full(e)
     except Exception as e:
-        print(f"Error generating prompt: {e}")
+        logger.exception("Error generating prompt")
         return jsonify({"error": f"Failed to generate game prompt: {str(e)}"}), 500
 
 
 @app.route('/submit_words', methods=['POST'])
 def submit_words():
-    if llm is None:
-        return jsonify({"error": "LLM not initialized. Please check backend logs."}), 500
-
     data = request.get_json()
     prompt = data.get('prompt')
     player_words = data.get('player_words')  # Expecting a dictionary like {1: "word1", 2: "word2"}
@@ -64,19 +299,103 @@ def submit_words():
     if not prompt or not player_words or not isinstance(player_words, dict):
         return jsonify({"error": "Invalid input. 'prompt' and 'player_words' (as a dictionary) are required."}), 400
 
-    word_assessment = Word_Assesment(llm)
+    word_assessment = create_word_assessment()
     try:
+        admit()
+
         # Evaluate words
         evaluation_result = word_assessment.evaluate_words(llm, prompt, player_words)
 
         # Return the evaluation result
         return jsonify(evaluation_result)
+    except SchedulerFull as e:
+        return queue_full(e)
     except Exception as e:
-        print(f"Error evaluating words: {e}")
+        logger.exception("Error evaluating words")
         return jsonify({"error": f"Failed to evaluate words: {str(e)}"}), 500
 
 
+@app.route('/submit_word', methods=['POST'])
+def submit_word():
+    """Score one player's word in the background as soon as it is typed"""
+
+    data = request.get_json()
+    session = game_sessions.get(data.get('game_id', ''))
+    player_id = data.get('player_id')
+    word = data.get('word')
+
+    if session is None:
+        return jsonify({"error": "Unknown or expired game_id."}), 404
+    if player_id is None or not word or not isinstance(word, str):
+        return jsonify({"error": "Invalid input. 'player_id' and 'word' are required."}), 400
+
+    session.submit(player_id, word)
+
+    return jsonify({"game_id": session.game_id, "player_id": player_id, "message": "Word received, scoring started."})
+
+
+@app.route('/evaluate', methods=['POST'])
+def evaluate():
+    """Finish a session game: wait for scoring still in flight and rank the players.
+    Optional 'player_words' are submitted first, so words never sent to /submit_word still count"""
+
+    data = request.get_json()
+    game_id = data.get('game_id', '')
+    player_words = data.get('player_words') or {}
+    session = game_sessions.get(game_id)
+
+    if session is None:
+        return jsonify({"error": "Unknown or expired game_id."}), 404
+    if not isinstance(player_words, dict):
+        return jsonify({"error": "Invalid input. 'player_words' must be a dictionary."}), 400
+
+    try:
+        evaluation_result = session.evaluate(player_words)
+        game_sessions.finish(game_id)
+
+        return jsonify(evaluation_result)
+    except Exception as e:
+        logger.exception("Error evaluating words")
+        return jsonify({"error": f"Failed to evaluate words: {str(e)}"}), 500
+
+
+@app.route('/submit_words_stream', methods=['POST'])
+def submit_words_stream():
+    """Same input as /submit_words, but answers with NDJSON: one 'score' line per player as soon as it is
+    scored, then a 'result' line with the ranked playerScores and winners"""
+
+    data = request.get_json()
+    prompt = data.get('prompt')
+    player_words = data.get('player_words')
+
+    if not prompt or not player_words or not isinstance(player_words, dict):
+        return jsonify({"error": "Invalid input. 'prompt' and 'player_words' (as a dictionary) are required."}), 400
+
+    try:
+        admit()
+    except SchedulerFull as e:
+        return queue_full(e)
+
+    word_assessment = create_word_assessment()
+
+    def generate():
+        try:
+            for event in word_assessment.evaluate_words_stream(llm, prompt, player_words):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.exception("Error evaluating words")
+            yield json.dumps({"event": "error", "error": f"Failed to evaluate words: {str(e)}"}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 if __name__ == '__main__':
+    debug = True  # debug=True for development
+    # The debug reloader runs this file in a watcher process and again in the serving child, only the child
+    # serves requests, so only it warms the model and fills the prompt pool
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background()
     # You might want to get the port from an environment variable in production
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)  # debug=True for development
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
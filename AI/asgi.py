@@ -0,0 +1,262 @@
+"""Async serving mode with the same routes as api.py
+
+Run with:  uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+The LLM client, caches, local scorers and prompt pool are the ones api.py sets up, so both
+servers share configuration. Handlers await the LLM instead of holding a thread for every game.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from api import (llm, prompt_pool, score_cache, single_flight, llm_stats, answer_index, game_sessions, warmup,
+                 llm_pool, create_word_assessment, FAST_SCORING_MODE, PROMPT_ANSWER_INDEX, LLM_WARMUP, GAME_ROUTES,
+                 MAX_LOBBY_PLAYERS, scheduler, admit, compatibility_scorer, start_background)
+from llm_stats import prometheus_gauges
+from llm_scheduler import SchedulerFull, INTERACTIVE
+
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get('REQUEST_TIMEOUT_SECONDS', 120))
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_background()
+    yield
+    warmup.close()
+
+
+app = FastAPI(title="The Notebook API", lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+
+@app.middleware("http")
+async def track_first_request(request: Request, call_next):
+    started = time.monotonic()
+    response = await call_next(request)
+    if request.url.path in GAME_ROUTES:
+        warmup.record_request(started, time.monotonic())
+
+    return response
+
+
+def queue_full(error: SchedulerFull) -> JSONResponse:
+    return JSONResponse({"error": "Too many games are being scored right now, please retry shortly.",
+                         "retry_after": error.retry_after},
+                        status_code=503, headers={'Retry-After': str(error.retry_after)})
+
+
+@app.get('/', response_class=PlainTextResponse)
+async def home():
+    return "Welcome to The Notebook API!"
+
+
+@app.get('/cache_stats')
+async def cache_stats():
+    return score_cache.stats()
+
+
+@app.get('/coalescing_stats')
+async def coalescing_stats():
+    return single_flight.stats()
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+async def metrics():
+    body = llm_stats.prometheus()
+    body += prometheus_gauges("score_cache", score_cache.stats())
+    body += prometheus_gauges("coalescing", single_flight.stats())
+    body += prometheus_gauges("answer_index", answer_index.stats())
+    if compatibility_scorer is not None:
+        body += prometheus_gauges("compatibility_embeddings", compatibility_scorer.stats())
+    body += prometheus_gauges("prompt_pool", prompt_pool.stats(), labels={'depth': 'theme'})
+    if llm_pool() is not None:
+        body += llm_pool().prometheus()
+    if scheduler is not None:
+        body += scheduler.prometheus()
+    body += warmup.prometheus()
+
+    return PlainTextResponse(body, media_type='text/plain; version=0.0.4')
+
+
+@app.get('/llm_pool_stats')
+async def llm_pool_stats():
+    if llm_pool() is None:
+        return JSONResponse({"error": "Not running an LLM pool, set OLLAMA_URLS to more than one endpoint."},
+                            status_code=404)
+
+    return llm_pool().stats()
+
+
+@app.get('/scheduler_stats')
+async def scheduler_stats():
+    if scheduler is None:
+        return JSONResponse({"error": "No LLM scheduler, LLM_CONCURRENCY is 0."}, status_code=404)
+
+    return scheduler.stats()
+
+
+@app.get('/ready')
+async def ready():
+    if not LLM_WARMUP:
+        return {"ready": True, "warmup": "disabled"}
+
+    return JSONResponse(warmup.stats(), status_code=200 if warmup.ready.is_set() else 503)
+
+
+@app.get('/warmup_stats')
+async def warmup_stats():
+    return warmup.stats()
+
+
+@app.get('/llm_stats')
+async def llm_call_stats():
+    return {"fast_mode": FAST_SCORING_MODE, "operations": llm_stats.stats()}
+
+
+@app.get('/prompt_pool_stats')
+async def prompt_pool_stats():
+    return prompt_pool.stats()
+
+
+@app.post('/start_game')
+async def start_game(request: Request):
+    data = await request.json()
+    player_count = data.get('player_count')
+    theme = data.get('theme', '')  # Allow theme to be optional
+
+    if not player_count or not (2 <= player_count <= MAX_LOBBY_PLAYERS):
+        return JSONResponse({"error": f"Invalid player count. Must be between 2 and {MAX_LOBBY_PLAYERS}."},
+                            status_code=400)
+
+    try:
+        admit()
+
+        # Take a pre-generated prompt, generating one inline only when none is ready
+        prompt = prompt_pool.pop(theme)
+        if prompt is None:
+            word_assessment = create_word_assessment(INTERACTIVE)
+            prompt = await asyncio.wait_for(word_assessment.agenerate_prompt(llm, theme, PROMPT_ANSWER_INDEX),
+                                            REQUEST_TIMEOUT_SECONDS)
+            if PROMPT_ANSWER_INDEX:
+                prompt = prompt[0]
+            prompt_pool.served(prompt)
+        session = game_sessions.create(prompt)
+
+        return {
+            "prompt": prompt,
+            "game_id": session.game_id,
+            "player_count": player_count,
+            "message": "Game started, prompt generated. Awaiting player words."
+        }
+    except SchedulerFull as e:
+        return queue_full(e)
+    except asyncio.TimeoutError:
+        return JSONResponse({"error": "Timed out generating game prompt."}, status_code=504)
+    except Exception as e:
+        logger.exception("Error generating prompt")
+        return JSONResponse({"error": f"Failed to generate game prompt: {str(e)}"}, status_code=500)
+
+
+@app.post('/submit_words')
+async def submit_words(request: Request):
+    data = await request.json()
+    prompt = data.get('prompt')
+    player_words = data.get('player_words')  # Expecting a dictionary like {1: "word1", 2: "word2"}
+
+    if not prompt or not player_words or not isinstance(player_words, dict):
+        return JSONResponse({"error": "Invalid input. 'prompt' and 'player_words' (as a dictionary) are required."},
+                            status_code=400)
+
+    try:
+        admit()
+
+        return await asyncio.wait_for(create_word_assessment().aevaluate_words(llm, prompt, player_words),
+                                      REQUEST_TIMEOUT_SECONDS)
+    except SchedulerFull as e:
+        return queue_full(e)
+    except asyncio.TimeoutError:
+        return JSONResponse({"error": "Timed out evaluating words."}, status_code=504)
+    except Exception as e:
+        logger.exception("Error evaluating words")
+        return JSONResponse({"error": f"Failed to evaluate words: {str(e)}"}, status_code=500)
+
+
+@app.post('/submit_word')
+async def submit_word(request: Request):
+    data = await request.json()
+    session = game_sessions.get(data.get('game_id', ''))
+    player_id = data.get('player_id')
+    word = data.get('word')
+
+    if session is None:
+        return JSONResponse({"error": "Unknown or expired game_id."}, status_code=404)
+    if player_id is None or not word or not isinstance(word, str):
+        return JSONResponse({"error": "Invalid input. 'player_id' and 'word' are required."}, status_code=400)
+
+    session.submit(player_id, word)
+
+    return {"game_id": session.game_id, "player_id": player_id, "message": "Word received, scoring started."}
+
+
+@app.post('/evaluate')
+async def evaluate(request: Request):
+    data = await request.json()
+    game_id = data.get('game_id', '')
+    player_words = data.get('player_words') or {}
+    session = game_sessions.get(game_id)
+
+    if session is None:
+        return JSONResponse({"error": "Unknown or expired game_id."}, status_code=404)
+    if not isinstance(player_words, dict):
+        return JSONResponse({"error": "Invalid input. 'player_words' must be a dictionary."}, status_code=400)
+
+    try:
+        # Scoring runs on the session's thread pool, wait for it off the event loop
+        evaluation_result = await asyncio.wait_for(asyncio.to_thread(session.evaluate, player_words),
+                                                   REQUEST_TIMEOUT_SECONDS)
+        game_sessions.finish(game_id)
+
+        return evaluation_result
+    except asyncio.TimeoutError:
+        return JSONResponse({"error": "Timed out evaluating words."}, status_code=504)
+    except Exception as e:
+        logger.exception("Error evaluating words")
+        return JSONResponse({"error": f"Failed to evaluate words: {str(e)}"}, status_code=500)
+
+
+@app.post('/submit_words_stream')
+async def submit_words_stream(request: Request):
+    data = await request.json()
+    prompt = data.get('prompt')
+    player_words = data.get('player_words')
+
+    if not prompt or not player_words or not isinstance(player_words, dict):
+        return JSONResponse({"error": "Invalid input. 'prompt' and 'player_words' (as a dictionary) are required."},
+                            status_code=400)
+
+    try:
+        admit()
+    except SchedulerFull as e:
+        return queue_full(e)
+
+    word_assessment = create_word_assessment()
+
+    # A plain generator, Starlette iterates it on its threadpool
+    def generate():
+        try:
+            for event in word_assessment.evaluate_words_stream(llm, prompt, player_words):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.exception("Error evaluating words")
+            yield json.dumps({"event": "error", "error": f"Failed to evaluate words: {str(e)}"}) + "\n"
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson', headers={'Cache-Control': 'no-cache'})
@@ -0,0 +1,223 @@
+"""Benchmark round latency and throughput against the fake chat model, no Ollama needed
+
+    python benchmark.py --players 2 5 --games 1 10 --rounds 20 --latency 0.05 --think-tokens 200
+    python benchmark.py --target flask --mode batch --fast
+    python benchmark.py --players 30 100 500 --games 1 --large-lobby 30 --vocabulary 150
+    python benchmark.py --prompt-tokens-per-second 2000 --mode separately   # prompt eval time per call
+
+Each run appends one JSON line to --output (benchmark_results.jsonl) with the settings and, per
+player count and concurrent-game count, p50/p95/p99 round latency and rounds per second.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable
+
+from fake_llm import FakeChatModel
+from load_test import percentile
+from Word_Assesment import Word_Assesment, SCORING_MODES, DEFAULT_MAX_CONCURRENCY
+from llm_stats import LLMCallStats
+from llm_scheduler import DEFAULT_LLM_CONCURRENCY, DEFAULT_MAX_QUEUE
+from spell_checker import SpellChecker
+from word_frequency import WordFrequencyIndex
+from spelling_complexity import SpellingComplexityScorer
+from embedding_compatibility import EmbeddingCompatibilityScorer, create_embedder
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results.jsonl')
+BENCHMARK_PROMPT = "Things you would find at the beach"
+
+
+def random_words(vocabulary: List[str], players: int, rng: random.Random) -> Dict[str, str]:
+    return {str(player): rng.choice(vocabulary) for player in range(1, players + 1)}
+
+
+def direct_round(llm: FakeChatModel, args, vocabulary: List[str], local: Dict[str, Any],
+                 stats: LLMCallStats) -> Callable[[int, random.Random], None]:
+    """One round straight through Word_Assesment.evaluate_words"""
+
+    def play(players: int, rng: random.Random):
+        word_assessment = Word_Assesment(llm, max_concurrency=args.concurrency, scoring_mode=args.mode,
+                                         model_name=llm.model, fast_mode=args.fast, call_stats=stats,
+                                         large_lobby_players=args.large_lobby or None, **local)
+        word_assessment.evaluate_words(llm, BENCHMARK_PROMPT, random_words(vocabulary, players, rng))
+
+    return play
+
+
+def flask_round(llm: FakeChatModel, args, vocabulary: List[str]) -> Callable[[int, random.Random], None]:
+    """One round through the Flask app: /start_game then /submit_words, like load_test.py does over HTTP"""
+
+    # Keep api.py off Ollama and the real cache file while it imports, then hand it the fake model
+    os.environ['LLM_WARMUP'] = '0'
+    os.environ['SCORE_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(prefix="notebook-bench-"), 'score_cache.sqlite3')
+    os.environ['SCORING_MODE'] = args.mode
+    os.environ['MAX_SCORING_CONCURRENCY'] = str(args.concurrency)
+    os.environ['FAST_SCORING_MODE'] = '1' if args.fast else '0'
+    os.environ['LARGE_LOBBY_PLAYERS'] = str(args.large_lobby)
+    os.environ['LLM_CONCURRENCY'] = str(args.llm_concurrency)
+    os.environ['LLM_QUEUE_SIZE'] = str(args.llm_queue_size)
+    os.environ['COMPATIBILITY_EMBEDDINGS'] = args.embeddings
+
+    import api
+
+    api.llm = llm
+
+    def play(players: int, rng: random.Random):
+        client = api.app.test_client()
+
+        response = client.post('/start_game', json={"player_count": min(max(players, 2), api.MAX_LOBBY_PLAYERS),
+                                                    "theme": "beach"})
+        if response.status_code != 200:
+            raise RuntimeError(f"/start_game returned {response.status_code}")
+
+        response = client.post('/submit_words', json={"prompt": response.get_json()["prompt"],
+                                                      "player_words": random_words(vocabulary, players, rng)})
+        if response.status_code != 200:
+            raise RuntimeError(f"/submit_words returned {response.status_code}")
+
+    return play
+
+
+def measure(play: Callable[[int, random.Random], None], players: int, games: int, rounds: int,
+            seed: int) -> Dict[str, Any]:
+    """Run rounds with games of them in flight at once and summarize the round latencies"""
+
+    def timed(round_number: int) -> float:
+        rng = random.Random(f"{seed}:{players}:{games}:{round_number}")
+        started = time.perf_counter()
+        play(players, rng)
+        return time.perf_counter() - started
+
+    latencies: List[float] = []
+    errors = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=games) as executor:
+        for future in [executor.submit(timed, round_number) for round_number in range(rounds)]:
+            try:
+                latencies.append(future.result())
+            except Exception as e:
+                errors += 1
+                print(f"Round failed: {e}")
+    elapsed = time.perf_counter() - started
+
+    return {
+        'players': players,
+        'concurrent_games': games,
+        'rounds': rounds,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 4),
+        'rounds_per_second': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        'p50_seconds': round(percentile(latencies, 0.50), 4),
+        'p95_seconds': round(percentile(latencies, 0.95), 4),
+        'p99_seconds': round(percentile(latencies, 0.99), 4),
+        'mean_seconds': round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(args) -> Dict[str, Any]:
+    llm = FakeChatModel(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                        malformed_rate=args.malformed_rate, think_tokens=args.think_tokens, seed=args.seed,
+                        prompt_tokens_per_second=args.prompt_tokens_per_second, cache_slots=args.cache_slots)
+
+    spellChecker = SpellChecker.load()
+    vocabulary = sorted(spellChecker.words)
+    if args.vocabulary:
+        # A class answering one prompt repeats itself, a small vocabulary makes players pick the same words
+        vocabulary = random.Random(args.seed).sample(vocabulary, min(args.vocabulary, len(vocabulary)))
+
+    if args.target == "flask":
+        play = flask_round(llm, args, vocabulary)
+        stats = None
+    else:
+        local = {}
+        if args.local_scorers:
+            local = {'spell_checker': spellChecker, 'frequency_index': WordFrequencyIndex.load(),
+                     'complexity_scorer': SpellingComplexityScorer()}
+        if args.embeddings:
+            local['compatibility_scorer'] = EmbeddingCompatibilityScorer(create_embedder(args.embeddings))
+        stats = LLMCallStats()
+        play = direct_round(llm, args, vocabulary, local, stats)
+
+    results = [measure(play, players, games, args.rounds, args.seed) for players in args.players for games in args.games]
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'target': args.target,
+        'scoring_mode': args.mode,
+        'fast_mode': args.fast,
+        'max_concurrency': args.concurrency,
+        'local_scorers': args.local_scorers,
+        'embeddings': args.embeddings,
+        'large_lobby_players': args.large_lobby,
+        'vocabulary': args.vocabulary,
+        'fake_llm': {
+            'latency': args.latency,
+            'tokens_per_second': args.tokens_per_second,
+            'malformed_rate': args.malformed_rate,
+            'think_tokens': args.think_tokens,
+            'seed': args.seed,
+            'prompt_tokens_per_second': args.prompt_tokens_per_second,
+            'cache_slots': args.cache_slots,
+        },
+        'llm_calls': llm.calls,
+        'llm_stats': stats.stats() if stats is not None else None,
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark evaluate_words and the Flask endpoints against a fake LLM")
+    parser.add_argument('--target', choices=("direct", "flask"), default="direct")
+    parser.add_argument('--mode', choices=SCORING_MODES, default="together")
+    parser.add_argument('--fast', action='store_true', help="score in fast mode")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help="scoring calls in flight per round")
+    parser.add_argument('--local-scorers', action='store_true', help="use the spell checker and local commonality/complexity")
+    parser.add_argument('--embeddings', default='', help="score compatibility by embedding similarity, 'hashing' needs no Ollama")
+    parser.add_argument('--players', type=int, nargs='+', default=[2, 5], help="e.g. 30 100 500 with --large-lobby")
+    parser.add_argument('--large-lobby', type=int, default=0, help="rounds with this many players use large-lobby mode, 0 never")
+    parser.add_argument('--vocabulary', type=int, default=0, help="words players pick from, 0 the whole dictionary")
+    parser.add_argument('--games', type=int, nargs='+', default=[1, 10], help="concurrent games")
+    parser.add_argument('--rounds', type=int, default=20, help="rounds per player/game count")
+    parser.add_argument('--latency', type=float, default=0.05, help="fake LLM seconds per call before generating")
+    parser.add_argument('--tokens-per-second', type=float, default=200.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="fraction of replies that aren't valid JSON")
+    parser.add_argument('--think-tokens', type=int, default=0, help="length of the fake <think> block")
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=0.0,
+                        help="fake LLM prompt reading speed, prefixes still in one of its --cache-slots are free")
+    parser.add_argument('--cache-slots', type=int, default=4, help="prompts the fake LLM keeps in its KV cache")
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="flask target: LLM calls in flight over all games, 0 no scheduler")
+    parser.add_argument('--llm-queue-size', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="flask target: LLM calls waiting before rounds get 503")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    report = run(args)
+
+    with open(args.output, 'a', encoding='utf-8') as outputFile:
+        outputFile.write(json.dumps(report) + "\n")
+
+    print(json.dumps(report['results'], indent=2))
+    if report['llm_stats']:
+        for operation, stats in report['llm_stats'].items():
+            if stats['calls']:
+                print(f"{operation}: {stats['calls']} calls, prompt eval {stats['mean_prompt_eval_seconds'] * 1000:.1f} ms "
+                      f"and {stats['mean_prompt_tokens']:.0f} tokens per call, {stats['mean_seconds'] * 1000:.1f} ms per call, "
+                      f"{stats['mean_queue_seconds'] * 1000:.1f} ms queued")
+    print(f"Appended to {args.output}")
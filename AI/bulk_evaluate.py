@@ -0,0 +1,188 @@
+"""Score archived rounds from a JSONL file without the server
+
+    python bulk_evaluate.py rounds.jsonl scored.jsonl --workers 8
+    python bulk_evaluate.py rounds.jsonl scored.jsonl --resume     # carry on after a crash
+
+LLM calls run in the bulk lane of an LLM scheduler, at most --llm-concurrency at once however many
+workers and rounds are in flight, so a re-scoring job can be sized to leave Ollama room for the server.
+
+Each input line is a round like the /submit_words body: {"prompt": ..., "player_words": {...}}, with an
+optional "id" that is copied through. Each output line is {"row", "id", "result"} or {"row", "id", "error"},
+written in input order, so the output doubles as the checkpoint: --resume skips as many rows as it holds.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Callable, Dict, Any, Iterator, IO
+
+from Word_Assesment import Word_Assesment, SCORING_MODES, DEFAULT_MAX_CONCURRENCY
+from score_cache import ScoreCache
+from spell_checker import SpellChecker
+from word_frequency import WordFrequencyIndex
+from spelling_complexity import SpellingComplexityScorer
+from single_flight import SingleFlight
+from log_config import configure_logging
+from llm_scheduler import LLMScheduler, BULK, DEFAULT_LLM_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+PROGRESS_EVERY_ROWS = 100
+
+
+def read_rows(path: str) -> Iterator[str]:
+    """Non-blank lines of the input, read lazily"""
+
+    with open(path, encoding='utf-8') as inputFile:
+        for line in inputFile:
+            if line.strip():
+                yield line
+
+
+def checkpoint(path: str) -> int:
+    """Rows already written to the output. A line cut off by a crash is dropped so it gets scored again"""
+
+    if not os.path.exists(path):
+        return 0
+
+    rows = 0
+    complete = 0
+    with open(path, 'rb') as outputFile:
+        for line in outputFile:
+            if not line.endswith(b"\n"):
+                break
+            rows += 1
+            complete += len(line)
+
+    with open(path, 'r+b') as outputFile:
+        outputFile.truncate(complete)
+
+    return rows
+
+
+def score_row(word_assessment: Word_Assesment, line: str) -> Dict[str, Any]:
+    try:
+        data = json.loads(line)
+        prompt = data['prompt']
+        playerWords = data['player_words']
+        if not prompt or not isinstance(playerWords, dict) or not playerWords:
+            raise ValueError("'prompt' and 'player_words' (as a non-empty dictionary) are required")
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        return {'id': None, 'error': f"Invalid round: {e}"}
+
+    try:
+        return {'id': data.get('id'), 'result': word_assessment.evaluate_words(word_assessment.llm, prompt, playerWords)}
+    except Exception as e:
+        logger.exception("Error evaluating round")
+        return {'id': data.get('id'), 'error': f"Failed to evaluate words: {e}"}
+
+
+def bulk_evaluate(rows: Iterator[str], score: Callable[[str], Dict[str, Any]], output: IO[str],
+                  workers: int = DEFAULT_WORKERS, window: int = None, first_row: int = 0) -> Dict[str, Any]:
+    """Score rows on a worker pool and write them in order.
+
+    At most window rows are submitted but not yet written, so a slow round holds back only that many
+    finished ones and memory stays bounded however large the input is.
+    """
+
+    window = window or workers * 4
+    pending: Dict[int, Future] = {}
+    nextToWrite = first_row
+    written = errors = 0
+    started = time.perf_counter()
+
+    def flush():
+        nonlocal nextToWrite, written, errors
+        while nextToWrite in pending and pending[nextToWrite].done():
+            scored = pending.pop(nextToWrite).result()
+            output.write(json.dumps({'row': nextToWrite, **scored}) + "\n")
+            output.flush()
+
+            errors += 'error' in scored
+            written += 1
+            nextToWrite += 1
+
+            if written % PROGRESS_EVERY_ROWS == 0:
+                elapsed = time.perf_counter() - started
+                logger.info("%d rows scored, %.2f rows/s", written, written / elapsed if elapsed else 0.0)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-evaluate") as executor:
+        for row, line in enumerate(rows, start=first_row):
+            while len(pending) >= window:
+                wait(list(pending.values()), return_when=FIRST_COMPLETED)
+                flush()
+
+            pending[row] = executor.submit(score, line)
+            flush()
+
+        while pending:
+            wait(list(pending.values()))
+            flush()
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        'rows': written,
+        'errors': errors,
+        'skipped': first_row,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(written / elapsed, 3) if elapsed else 0.0,
+    }
+
+
+def create_word_assessment(args) -> Word_Assesment:
+    if args.fake:
+        from fake_llm import FakeChatModel
+        llm = FakeChatModel()
+    else:
+        from llm_pool import create_llm
+        llm = create_llm(args.model, args.ollama_urls)
+
+    # Nothing interactive runs here, so no slot is kept back for it
+    scheduler = LLMScheduler(args.llm_concurrency, reserved_interactive=0) if args.llm_concurrency > 0 else None
+
+    return Word_Assesment(llm, max_concurrency=args.concurrency, scoring_mode=args.mode,
+                          cache=ScoreCache(path=args.cache) if args.cache else None,
+                          spell_checker=SpellChecker.load(), frequency_index=WordFrequencyIndex.load(),
+                          complexity_scorer=SpellingComplexityScorer(), single_flight=SingleFlight(),
+                          fast_mode=args.fast, scheduler=scheduler, priority=BULK)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score rounds from a JSONL file into another JSONL file")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--resume', action='store_true', help="skip the rows already in the output and append")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="rounds scored at once")
+    parser.add_argument('--window', type=int, default=None, help="rounds in flight or waiting to be written, default 4x workers")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help="LLM calls at once per round")
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="LLM calls at once over all rounds, 0 no limit")
+    parser.add_argument('--mode', choices=SCORING_MODES, default="together")
+    parser.add_argument('--fast', action='store_true', help="score in fast mode")
+    parser.add_argument('--cache', default=None, help="score cache file, shared with the server if it's the same path")
+    parser.add_argument('--model', default="qwen3:0.6b")
+    parser.add_argument('--ollama-urls', default=os.environ.get('OLLAMA_URLS', ''))
+    parser.add_argument('--fake', action='store_true', help="score with the fake chat model, for dry runs")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    firstRow = checkpoint(args.output) if args.resume else 0
+    if firstRow:
+        logger.info("Resuming after %d rows already in %s", firstRow, args.output)
+
+    word_assessment = create_word_assessment(args)
+
+    with open(args.output, 'a' if args.resume else 'w', encoding='utf-8') as outputFile:
+        summary = bulk_evaluate(islice(read_rows(args.input), firstRow, None),
+                                lambda line: score_row(word_assessment, line),
+                                outputFile, workers=args.workers, window=args.window, first_row=firstRow)
+
+    print(json.dumps(summary, indent=2))
+    sys.exit(1 if summary['errors'] else 0)
@@ -0,0 +1,322 @@
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from answer_index import prompt_key
+
+logger = logging.getLogger(__name__)
+
+HASHING_EMBEDDER = "hashing"  # COMPATIBILITY_EMBEDDINGS value for the offline stand-in
+DEFAULT_DIMENSIONS = 256
+DEFAULT_MAX_WORDS = 100_000
+DEFAULT_MAX_PROMPTS = 256
+INITIAL_CAPACITY = 1024
+DEFAULT_TIMEOUT_SECONDS = 5.0  # Longest a remote embedding call may take before the LLM scores compatibility instead
+EMBED_WORKERS = 4
+
+# Prompt boilerplate like "Name something you find at the beach", left out so only the topic words count
+STOP_WORDS = frozenset("a an and are at be can for from in is it name of on or some something that the things "
+                       "thing this to what where which who with you your find found".split())
+
+# Cosine similarity that maps to a compatibility of 1 and of 15, recalibrate with `python embedding_compatibility.py`
+HASHING_SIMILARITY_RANGE = (0.0, 0.5)
+MODEL_SIMILARITY_RANGE = (0.35, 0.75)
+
+
+class HashingEmbedder:
+    """Deterministic stand-in for an embedding model: character trigrams hashed into a fixed size vector.
+
+    Only spelling overlap counts, so a word scores high when it or a close form appears among the prompt's
+    topic words (stop words are left out). It needs no model and no network, which is what tests, benchmarks
+    and offline runs want.
+    """
+
+    similarity_range = HASHING_SIMILARITY_RANGE
+    # Runs in process, so calls need no timeout and no LLM scheduler slot
+    local = True
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+        self.model = f"{HASHING_EMBEDDER}-{dimensions}"
+
+
+    def features(self, text: str) -> List[str]:
+        """Every word whole plus its trigrams, with word boundaries marked so prefixes and suffixes count"""
+
+        features = []
+        for word in re.findall(r"[a-z]+", text.lower()):
+            if word in STOP_WORDS:
+                continue
+            padded = f"<{word}>"
+            features.append(padded)
+            features.extend(padded[start:start + 3] for start in range(len(padded) - 2))
+        return features
+
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self.features(text):
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+
+    def embed_documents(self, texts: List[str]) -> List[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed(text)
+
+
+def create_embedder(model: str, base_url: Optional[str] = None):
+    """The hashing stand-in for 'hashing', otherwise an Ollama embedding model such as nomic-embed-text"""
+
+    if model == HASHING_EMBEDDER:
+        return HashingEmbedder()
+
+    # Imported here so the stand-in needs no langchain
+    from langchain_ollama import OllamaEmbeddings
+
+    embedder = OllamaEmbeddings(model=model, base_url=base_url) if base_url else OllamaEmbeddings(model=model)
+    embedder.similarity_range = MODEL_SIMILARITY_RANGE
+    return embedder
+
+
+class EmbeddingCompatibilityScorer:
+    """Prompt compatibility on the rubric's 1-15 scale from the cosine similarity of word and prompt embeddings.
+
+    Each word is embedded once and kept as a unit-length row of one contiguous float32 matrix, each prompt
+    once per game. Scoring a round is a single matrix-vector product over the round's rows. Similarity is
+    mapped linearly from similarity_range onto 1-15, fit() refits that line to recorded LLM scores.
+    """
+
+    def __init__(self, embedder, similarity_range: Optional[Tuple[float, float]] = None,
+                 max_words: int = DEFAULT_MAX_WORDS, max_prompts: int = DEFAULT_MAX_PROMPTS,
+                 timeout_seconds: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+        self.embedder = embedder
+        self.local = getattr(embedder, 'local', False)
+        # Remote calls run on their own threads so a hung embedding server costs at most timeout_seconds
+        self.timeout_seconds = None if self.local else timeout_seconds
+        self.executor = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed") \
+            if self.timeout_seconds is not None else None
+        self.model = getattr(embedder, 'model', type(embedder).__name__)
+        floor, ceiling = similarity_range or getattr(embedder, 'similarity_range', MODEL_SIMILARITY_RANGE)
+        self.scale = 14.0 / (ceiling - floor)
+        self.bias = 1.0 - floor * self.scale
+        self.max_words = max_words
+        self.max_prompts = max_prompts
+        self.lock = threading.Lock()
+
+        self.slots: Dict[str, int] = {}
+        self.vectors: Optional[np.ndarray] = None
+        self.prompts: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.word_hits = 0
+        self.words_embedded = 0
+        self.prompts_embedded = 0
+        self.embed_seconds = 0.0
+        self.failures = 0
+
+
+    def call_embedder(self, method: Callable[[Any], Any], texts: Any) -> Any:
+        """One embedder call, raising TimeoutError past timeout_seconds and counting every failure.
+        A call that timed out still finishes in the background"""
+
+        try:
+            if self.executor is None:
+                return method(texts)
+            return self.executor.submit(method, texts).result(timeout=self.timeout_seconds)
+        except Exception:
+            with self.lock:
+                self.failures += 1
+            raise
+
+
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        """Rows scaled to unit length, so a dot product is the cosine similarity. Zero rows stay zero"""
+
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        started = time.perf_counter()
+        vectors = np.asarray(self.call_embedder(self.embedder.embed_documents, texts), dtype=np.float32)
+        with self.lock:
+            self.embed_seconds += time.perf_counter() - started
+
+        return self.normalize(vectors)
+
+
+    def store(self, words: List[str], vectors: np.ndarray):
+        """Append rows to the matrix, doubling it when full. Past max_words new words aren't kept"""
+
+        with self.lock:
+            if self.vectors is None:
+                self.vectors = np.zeros((INITIAL_CAPACITY, vectors.shape[1]), dtype=np.float32)
+
+            for word, vector in zip(words, vectors):
+                if word in self.slots or len(self.slots) >= self.max_words:
+                    continue
+
+                if len(self.slots) == len(self.vectors):
+                    grown = np.zeros((min(len(self.vectors) * 2, self.max_words), self.vectors.shape[1]), dtype=np.float32)
+                    grown[:len(self.vectors)] = self.vectors
+                    self.vectors = grown
+
+                self.slots[word] = len(self.slots)
+                self.vectors[self.slots[word]] = vector
+
+
+    def word_vectors(self, words: Sequence[str]) -> np.ndarray:
+        """(words x dimensions) unit rows for a batch, embedding the words not seen before in one call"""
+
+        keys = [word.strip().lower() for word in words]
+
+        with self.lock:
+            missing = list(dict.fromkeys(key for key in keys if key not in self.slots))
+            self.word_hits += len(keys) - len(missing)
+
+        fresh = {}
+        if missing:
+            vectors = self.embed(missing)
+            self.store(missing, vectors)
+            fresh = dict(zip(missing, vectors))
+            with self.lock:
+                self.words_embedded += len(missing)
+
+        with self.lock:
+            rows = np.array([self.slots.get(key, -1) for key in keys])
+            vectors = self.vectors[np.maximum(rows, 0)]
+
+        # Words past max_words have no row, they use the vectors embedded just now
+        for index in np.flatnonzero(rows < 0):
+            vectors[index] = fresh[keys[index]]
+
+        return vectors
+
+
+    def prompt_vector(self, prompt: str) -> np.ndarray:
+        key = prompt_key(prompt)
+
+        with self.lock:
+            vector = self.prompts.get(key)
+            if vector is not None:
+                self.prompts.move_to_end(key)
+                return vector
+
+        started = time.perf_counter()
+        vector = self.normalize(np.asarray(self.call_embedder(self.embedder.embed_query, prompt), dtype=np.float32))
+
+        with self.lock:
+            self.embed_seconds += time.perf_counter() - started
+            self.prompts_embedded += 1
+            self.prompts[key] = vector
+            while len(self.prompts) > self.max_prompts:
+                self.prompts.popitem(last=False)
+
+        return vector
+
+
+    def similarities(self, words: Sequence[str], prompt: str) -> np.ndarray:
+        """Cosine similarity of every word to the prompt"""
+
+        if not words:
+            return np.zeros(0, dtype=np.float32)
+
+        return self.word_vectors(words) @ self.prompt_vector(prompt)
+
+
+    def score_words(self, words: Sequence[str], prompt: str) -> List[float]:
+        """Compatibility from 1-15 for every word, in order"""
+
+        if not words:
+            return []
+
+        return np.clip(np.rint(self.similarities(words, prompt) * self.scale + self.bias), 1, 15).tolist()
+
+
+    def fit(self, words: Sequence[str], prompts: Sequence[str], targets: Sequence[float]):
+        """Least squares fit of the similarity to score line against recorded LLM scores"""
+
+        similarities = np.concatenate([self.similarities([word], prompt) for word, prompt in zip(words, prompts)])
+        design = np.column_stack([similarities, np.ones(len(words))])
+        (self.scale, self.bias), *_ = np.linalg.lstsq(design, np.asarray(targets, dtype=np.float64), rcond=None)
+
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.word_hits + self.words_embedded
+
+            return {
+                'model': self.model,
+                'words': len(self.slots),
+                'matrix_bytes': self.vectors.nbytes if self.vectors is not None else 0,
+                'prompts': len(self.prompts),
+                'words_embedded': self.words_embedded,
+                'prompts_embedded': self.prompts_embedded,
+                'word_hit_rate': self.word_hits / lookups if lookups else 0.0,
+                'embed_seconds': self.embed_seconds,
+                'failures': self.failures,
+            }
+
+
+def load_recorded_scores(path: str) -> Tuple[List[str], List[str], List[float]]:
+    """Recorded compatibility scores from a score cache SQLite file or a JSONL file of {"word", "prompt", "score"}"""
+
+    if path.endswith(('.sqlite3', '.db')):
+        connection = sqlite3.connect(path)
+        rows = connection.execute("SELECT word, prompt, score FROM scores WHERE criterion = 'compatibility'").fetchall()
+        connection.close()
+    else:
+        with open(path, encoding='utf-8') as recordsFile:
+            records = [json.loads(line) for line in recordsFile if line.strip()]
+        rows = [(record['word'], record['prompt'], record['score']) for record in records]
+
+    return [row[0] for row in rows], [row[1] for row in rows], [float(row[2]) for row in rows]
+
+
+def calibrate(path: str, model: str = HASHING_EMBEDDER, fit: bool = False) -> Dict[str, Any]:
+    """Compare embedding compatibility against recorded LLM scores, optionally refitting the score line"""
+
+    # Agreement is measured the same way as for the local complexity scorer
+    from spelling_complexity import agreement
+
+    words, prompts, recorded = load_recorded_scores(path)
+    scorer = EmbeddingCompatibilityScorer(create_embedder(model))
+
+    def predicted() -> List[float]:
+        return [scorer.score_words([word], prompt)[0] for word, prompt in zip(words, prompts)]
+
+    report = {'default': agreement(predicted(), recorded)}
+
+    if fit and words:
+        scorer.fit(words, prompts, recorded)
+        report['fitted'] = agreement(predicted(), recorded)
+        report['scale'] = round(float(scorer.scale), 3)
+        report['bias'] = round(float(scorer.bias), 3)
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Calibrate embedding prompt compatibility against recorded LLM scores")
+    parser.add_argument('records', help="score cache .sqlite3 file or JSONL with {\"word\", \"prompt\", \"score\"} per line")
+    parser.add_argument('--model', default=HASHING_EMBEDDER, help="Ollama embedding model, or 'hashing' for the offline stand-in")
+    parser.add_argument('--fit', action='store_true', help="also refit the similarity to score line by least squares")
+    args = parser.parse_args()
+
+    print(json.dumps(calibrate(args.records, args.model, fit=args.fit), indent=2))
@@ -0,0 +1,175 @@
+"""A stand-in for the Ollama chat model so the scoring pipeline can be measured without one
+
+Replies are derived from the prompt, so the same prompt always gets the same score, and look
+like qwen3's: an optional <think> block and then the answer the prompt asked for.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Any, List, Optional
+
+from langchain_core.messages import AIMessage
+
+# Score range of each rubric, picked by the first phrase found in its prompt
+RUBRIC_RANGES = (
+    ("TOTAL_SCORE", (3, 32)),
+    ("from 1-10", (1, 10)),
+    ("from 1-7", (1, 7)),
+    ("from 1-15", (1, 15)),
+)
+
+# Expected answers handed out with generated prompts
+ANSWER_WORDS = ["sand", "shell", "wave", "crab", "towel", "sun", "umbrella", "seagull", "bucket", "shovel", "boat",
+                "fish", "surfboard", "sandcastle", "starfish", "dolphin", "ocean", "pier", "lifeguard", "sunscreen"]
+
+
+class FakeChatModel:
+    """Deterministic chat model with configurable latency, token rate, malformed replies and reasoning length.
+
+    Call time is latency plus generated tokens over tokens_per_second. per_call may return overrides of
+    any of these settings for a given prompt, e.g. to make batch prompts slower than the rest.
+
+    With prompt_tokens_per_second set, reading the prompt takes time too, except for the longest prefix it
+    shares with one of the last cache_slots prompts, like Ollama reusing a KV cache slot. Words stand in
+    for tokens. The time and the tokens actually read are reported the way Ollama does.
+    """
+
+    def __init__(self, latency: float = 0.05, tokens_per_second: float = 200.0, malformed_rate: float = 0.0,
+                 think_tokens: int = 0, seed: int = 0, model: str = "fake-chat",
+                 per_call: Optional[Callable[[str], Dict[str, Any]]] = None,
+                 prompt_tokens_per_second: float = 0.0, cache_slots: int = 4):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.malformed_rate = malformed_rate
+        self.think_tokens = think_tokens
+        self.seed = seed
+        self.model = model
+        self.per_call = per_call
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+
+        self.lock = threading.Lock()
+        self.attempts: Dict[int, int] = {}
+        self.calls = 0
+        self.slots: List[List[str]] = [[] for _ in range(max(1, cache_slots))]
+
+
+    def evaluate_prompt(self, promptTokens: List[str]) -> int:
+        """Tokens of the prompt not found in a cache slot. Like Ollama, a slot holding only a prefix of the
+        prompt is extended, otherwise the least recently used slot gets the prompt"""
+
+        with self.lock:
+            shared = [len(os.path.commonprefix([slot, promptTokens])) for slot in self.slots]
+            best = max(range(len(self.slots)), key=lambda index: shared[index])
+            slot = best if self.slots[best] and shared[best] == len(self.slots[best]) else len(self.slots) - 1
+            self.slots.pop(slot)
+            self.slots.insert(0, promptTokens)
+
+            return len(promptTokens) - shared[best]
+
+
+    def settings(self, prompt: str) -> Dict[str, Any]:
+        settings = {
+            'latency': self.latency,
+            'tokens_per_second': self.tokens_per_second,
+            'malformed_rate': self.malformed_rate,
+            'think_tokens': self.think_tokens,
+        }
+        if self.per_call is not None:
+            settings.update(self.per_call(prompt) or {})
+
+        return settings
+
+
+    def reply(self, prompt: str, **kwargs) -> tuple:
+        """The message and how long generating it would take"""
+
+        settings = self.settings(prompt)
+        promptHash = zlib.crc32(prompt.encode('utf-8'))
+
+        # Seeded by prompt and how often it was asked, so retries can get a different reply
+        with self.lock:
+            attempt = self.attempts.get(promptHash, 0)
+            self.attempts[promptHash] = attempt + 1
+            self.calls += 1
+        rng = random.Random(f"{self.seed}:{promptHash}:{attempt}")
+
+        answer = self.answer(prompt, rng)
+        if rng.random() < settings['malformed_rate']:
+            answer = "Sure! Here is the score: " + answer[:len(answer) // 2]
+
+        thinkTokens = 0 if kwargs.get('reasoning') is False else settings['think_tokens']
+        tokens = (["<think>"] + ["hmm"] * thinkTokens + ["</think>"] if thinkTokens else []) + answer.split(" ")
+
+        # num_predict cuts the reply off, like Ollama does
+        maxTokens = (kwargs.get('options') or {}).get('num_predict')
+        if maxTokens is not None:
+            tokens = tokens[:maxTokens]
+
+        promptTokens = self.evaluate_prompt(prompt.split())
+        promptEvalSeconds = promptTokens / self.prompt_tokens_per_second if self.prompt_tokens_per_second else 0.0
+
+        message = AIMessage(content=" ".join(tokens), usage_metadata={
+            'input_tokens': promptTokens,
+            'output_tokens': len(tokens),
+            'total_tokens': promptTokens + len(tokens),
+        }, response_metadata={
+            'prompt_eval_count': promptTokens,
+            'prompt_eval_duration': int(promptEvalSeconds * 1e9),
+        })
+
+        return message, settings['latency'] + promptEvalSeconds + len(tokens) / settings['tokens_per_second']
+
+
+    def answer(self, prompt: str, rng: random.Random) -> str:
+        """What the prompt asked for: true/false, a JSON score, a JSON array of scores or of pairwise winners, a
+        game prompt with its expected answers or just a game prompt"""
+
+        if "true or false" in prompt:
+            return "true" if rng.random() < 0.9 else "false"
+
+        if '"answers"' in prompt:
+            answers = rng.sample(ANSWER_WORDS, 15)
+            return json.dumps({
+                'prompt': f"Something you would find at the beach number {rng.randint(1, 10000)}.",
+                'answers': [{'word': word, 'score': 15 - rank // 2} for rank, word in enumerate(answers)],
+            })
+
+        if '"winner"' in prompt:
+            pairs = re.findall(r'^(\d+)\. A: ', prompt, re.MULTILINE)
+            return "[" + ", ".join(f'{{"pair": {pair}, "winner": "{rng.choice("AB")}"}}' for pair in pairs) + "]"
+
+        if "JSON array" in prompt:
+            ids = re.findall(r'^\s*- id ([^:]+):', prompt, re.MULTILINE)
+            return "[" + ", ".join(f'{{"id": {self.json_id(player_id)}, "score": {rng.randint(3, 32)}}}'
+                                   for player_id in ids) + "]"
+
+        playerId = re.search(r'\{"id": ([^,]+), "score": (?:score|TOTAL_SCORE)\}', prompt)
+        if playerId is not None:
+            low, high = next((scoreRange for phrase, scoreRange in RUBRIC_RANGES if phrase in prompt), (1, 10))
+            return f'{{"id": {playerId.group(1)}, "score": {rng.randint(low, high)}}}'
+
+        return f"Think of something you would find on adventure number {rng.randint(1, 10000)}."
+
+
+    @staticmethod
+    def json_id(player_id: str) -> str:
+        return player_id if player_id.isdigit() else f'"{player_id}"'
+
+
+    def invoke(self, prompt: str, **kwargs) -> AIMessage:
+        message, seconds = self.reply(prompt, **kwargs)
+        time.sleep(seconds)
+
+        return message
+
+
+    async def ainvoke(self, prompt: str, **kwargs) -> AIMessage:
+        message, seconds = self.reply(prompt, **kwargs)
+        await asyncio.sleep(seconds)
+
+        return message
@@ -0,0 +1,165 @@
+"""A stand-in Ollama server answering /api/chat with fake_llm.FakeChatModel
+
+Start a few and point the API at them to try the LLM pool without GPUs:
+    python fake_ollama.py --port 11501 &  python fake_ollama.py --port 11502 --latency 0.5 &
+    OLLAMA_URLS=http://localhost:11501,http://localhost:11502 python api.py
+
+--fail-rate makes a share of chat calls answer 500, to watch a backend leave and rejoin the pool.
+--load-seconds makes a call to an unloaded model wait that long first, like Ollama loading it, and the
+model stays loaded for the call's keep_alive (default 5m), to see the cold start and warm-up.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+
+from fake_llm import FakeChatModel
+
+DEFAULT_KEEP_ALIVE_SECONDS = 300.0
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, llm: FakeChatModel, fail_rate: float = 0.0, host: str = "127.0.0.1",
+                 load_seconds: float = 0.0):
+        super().__init__((host, port), FakeOllamaHandler)
+        self.llm = llm
+        self.fail_rate = fail_rate
+        self.healthy = True
+
+        self.load_seconds = load_seconds
+        self.loaded_until = 0.0
+        self.loads = 0
+        self.load_lock = threading.Lock()
+
+
+    def load_model(self, keep_alive):
+        """Wait out the model load when it isn't loaded, then keep it loaded for keep_alive"""
+
+        with self.load_lock:
+            if time.monotonic() >= self.loaded_until:
+                self.loads += 1
+                time.sleep(self.load_seconds)
+
+            seconds = keep_alive_seconds(keep_alive)
+            self.loaded_until = float('inf') if seconds < 0 else time.monotonic() + seconds
+
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve on a daemon thread"""
+
+        threading.Thread(target=self.serve_forever, name=f"fake-ollama-{self.server_address[1]}", daemon=True).start()
+        return self
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+
+    def send_json(self, status: int, body: dict, contentType: str = 'application/json'):
+        data = (json.dumps(body) + "\n").encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+    def do_GET(self):
+        if not self.server.healthy:
+            self.send_json(503, {"error": "unavailable"})
+        elif self.path == "/api/tags":
+            self.send_json(200, {"models": [{"name": self.server.llm.model, "model": self.server.llm.model}]})
+        else:
+            self.send_json(200, {"status": "Ollama is running"})
+
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        if self.path != "/api/chat":
+            self.send_json(404, {"error": "not found"})
+            return
+        if not self.server.healthy or random.random() < self.server.fail_rate:
+            self.send_json(500, {"error": "fake failure"})
+            return
+
+        self.server.load_model(body.get('keep_alive'))
+
+        prompt = "\n".join(message.get('content', '') for message in body.get('messages', []))
+        kwargs = {'options': body.get('options') or {}}
+        if body.get('think') is False:
+            kwargs['reasoning'] = False
+
+        message = self.server.llm.invoke(prompt, **kwargs)
+
+        # A single final chunk is a valid reply to both streaming and non-streaming requests
+        self.send_json(200, {
+            "model": body.get('model', self.server.llm.model),
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": message.content},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": 0,
+            "prompt_eval_count": message.usage_metadata['input_tokens'],
+            "prompt_eval_duration": message.response_metadata['prompt_eval_duration'],
+            "eval_count": message.usage_metadata['output_tokens'],
+        }, contentType='application/x-ndjson')
+
+
+def keep_alive_seconds(keep_alive) -> float:
+    """Ollama's keep_alive as seconds: a number of seconds or a duration like '30m', negative is forever"""
+
+    if keep_alive is None or keep_alive == "":
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    if isinstance(keep_alive, (int, float)):
+        return float(keep_alive)
+
+    match = re.fullmatch(r"(-?[\d.]+)(ms|s|m|h)?", keep_alive.strip())
+    if match is None:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+
+    return float(match.group(1)) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}[match.group(2)]
+
+
+def serve(port: int = 0, llm: Optional[FakeChatModel] = None, fail_rate: float = 0.0,
+          load_seconds: float = 0.0) -> FakeOllamaServer:
+    """Start a stand-in server in the background, port 0 picks a free one"""
+
+    return FakeOllamaServer(port, llm or FakeChatModel(), fail_rate=fail_rate, load_seconds=load_seconds).start()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stand-in Ollama server backed by the fake chat model")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--tokens-per-second', type=float, default=200.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--think-tokens', type=int, default=0)
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=0.0, help="prompt reading speed, 0 is free")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of chat calls that answer 500")
+    parser.add_argument('--load-seconds', type=float, default=0.0, help="model load time on a cold call")
+    parser.add_argument('--model', default="qwen3:0.6b")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(args.port, FakeChatModel(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                                                       malformed_rate=args.malformed_rate,
+                                                       think_tokens=args.think_tokens, model=args.model,
+                                                       prompt_tokens_per_second=args.prompt_tokens_per_second),
+                              fail_rate=args.fail_rate, load_seconds=args.load_seconds)
+    print(f"Fake Ollama serving {args.model} on {server.url}")
+    server.serve_forever()
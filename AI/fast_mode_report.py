@@ -0,0 +1,45 @@
+"""Score the same words with fast mode off and on and compare the LLM call stats
+
+    python fast_mode_report.py --model qwen3:0.6b --prompt "Things you find at the beach"
+"""
+import argparse
+import json
+from typing import Dict, Any, List
+
+from langchain.chat_models import init_chat_model
+
+from Word_Assesment import Word_Assesment
+from llm_stats import LLMCallStats
+
+WORDS = ["Dog", "Sun", "Pizza", "Galaxy", "Volcano", "Friendship", "Rainbow", "Castle", "Adventure", "Mystery"]
+
+
+def score_all(llm, model: str, prompt: str, words: List[str], fast_mode: bool) -> Dict[str, Any]:
+    """Every criterion for every word straight from the LLM, no cache or local scorers"""
+
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(llm, model_name=model, fast_mode=fast_mode, call_stats=stats)
+
+    for player_id, word in enumerate(words, start=1):
+        word_assessment.score_word_commonality(llm, word, player_id)
+        word_assessment.score_spelling_complexity(llm, word, player_id)
+        word_assessment.score_prompt_compatibility(llm, word, player_id, prompt)
+        word_assessment.score_combined_rating(llm, word, player_id, prompt)
+        word_assessment.check_spelling(llm, word)
+
+    return stats.stats()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare LLM latency, tokens and parse failures with fast mode off and on")
+    parser.add_argument('--model', default="qwen3:0.6b")
+    parser.add_argument('--prompt', default="Things you find at the beach")
+    parser.add_argument('--words', nargs='*', default=WORDS)
+    args = parser.parse_args()
+
+    llm = init_chat_model(args.model, model_provider='ollama')
+
+    print(json.dumps({
+        'before': score_all(llm, args.model, args.prompt, args.words, fast_mode=False),
+        'after': score_all(llm, args.model, args.prompt, args.words, fast_mode=True),
+    }, indent=2))
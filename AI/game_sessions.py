@@ -0,0 +1,133 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from Word_Assesment import Word_Assesment
+
+DEFAULT_SESSION_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_SESSION_WORKERS = 16
+
+
+class GameSession:
+    """One game's prompt and the in-flight scoring of every word submitted so far"""
+
+    def __init__(self, game_id: str, prompt: str, word_assessment: Word_Assesment, executor: ThreadPoolExecutor):
+        self.game_id = game_id
+        self.prompt = prompt
+        self.word_assessment = word_assessment
+        self.executor = executor
+        self.created_at = time.time()
+
+        self.players: Dict[str, Tuple[str, Future]] = {}
+        # When each player's current word came in, the earlier of two tied players wins
+        self.submitted: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+
+    def submit(self, player_id: Any, word: str):
+        """Start scoring a player's word right away, replacing any earlier word from that player"""
+
+        player_id = str(player_id)
+
+        with self.lock:
+            previous = self.players.get(player_id)
+            if previous is not None:
+                if previous[0] == word:
+                    return
+                previous[1].cancel()
+
+            future = self.executor.submit(self.word_assessment.score_player, self.word_assessment.llm,
+                                          player_id, word, self.prompt)
+            self.players[player_id] = (word, future)
+            self.submitted[player_id] = time.monotonic()
+
+
+    def evaluate(self, player_words: Optional[Dict[Any, str]] = None,
+                 deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for whatever is still being scored and rank the round with evaluate_words. Players still
+        being scored after deadline_seconds (default the scorer's own) get locally estimated scores"""
+
+        # Words only sent with the final call are scored now like any other
+        for player_id, word in (player_words or {}).items():
+            self.submit(player_id, word)
+
+        with self.lock:
+            players = dict(self.players)
+            submitted = dict(self.submitted)
+
+        words = {player_id: word for player_id, (word, _) in players.items()}
+        deadline = self.word_assessment.deadline_for(deadline_seconds)
+        wait([future for _, future in players.values()], timeout=self.word_assessment.remaining_seconds(deadline))
+
+        precomputed = {}
+        for player_id, (word, future) in players.items():
+            if future.done() and not future.cancelled() and (deadline is None or future.exception() is None):
+                precomputed[player_id] = future.result()
+            else:
+                precomputed[player_id] = self.word_assessment.estimate_player_score(player_id, word, self.prompt)
+
+        return self.word_assessment.evaluate_words(self.word_assessment.llm, self.prompt, words, precomputed=precomputed,
+                                                   submitted=submitted)
+
+
+    def cancel(self):
+        with self.lock:
+            for _, future in self.players.values():
+                future.cancel()
+
+
+class GameSessionStore:
+    """In-process sessions, one per game, sharing a bounded pool of scoring threads"""
+
+    def __init__(self, create_word_assessment: Callable[[], Word_Assesment], max_workers: int = DEFAULT_SESSION_WORKERS,
+                 ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.create_word_assessment = create_word_assessment
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="game-session")
+        self.sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self.lock = threading.Lock()
+
+
+    def create(self, prompt: str) -> GameSession:
+        session = GameSession(uuid.uuid4().hex, prompt, self.create_word_assessment(), self.executor)
+
+        with self.lock:
+            self.expire()
+            self.sessions[session.game_id] = session
+
+            # Abandoned games shouldn't pile up, drop the oldest past max_sessions
+            while len(self.sessions) > self.max_sessions:
+                _, oldest = self.sessions.popitem(last=False)
+                oldest.cancel()
+
+        return session
+
+
+    def get(self, game_id: str) -> Optional[GameSession]:
+        with self.lock:
+            self.expire()
+            return self.sessions.get(game_id)
+
+
+    def finish(self, game_id: str):
+        with self.lock:
+            self.sessions.pop(game_id, None)
+
+
+    def expire(self):
+        """Drop sessions older than the TTL. Caller holds the lock"""
+
+        cutoff = time.time() - self.ttl_seconds
+        while self.sessions:
+            game_id, oldest = next(iter(self.sessions.items()))
+            if oldest.created_at >= cutoff:
+                break
+
+            del self.sessions[game_id]
+            oldest.cancel()
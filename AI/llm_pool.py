@@ -0,0 +1,278 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
+
+import httpx
+
+from llm_stats import METRIC_PREFIX
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+DEFAULT_HEALTH_CHECK_SECONDS = 10.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+
+
+class LLMBackend:
+    """One chat model endpoint in an LLMPool and the load it is carrying"""
+
+    def __init__(self, name: str, llm, health_check: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.llm = llm
+        self.model = getattr(llm, 'model', None) or type(llm).__name__
+        self.health_check = health_check or self.ping
+
+        self.healthy = True
+        self.outstanding = 0
+        self.calls = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+
+    def ping(self) -> bool:
+        """Fallback health check for backends without an HTTP endpoint, a one token completion"""
+
+        self.llm.invoke("ping", options={'num_predict': 1})
+        return True
+
+
+class LLMPool:
+    """Spreads chat model calls over several backends, sending each call to the one with the fewest in flight.
+
+    A backend that raises is taken out of rotation and the call is retried on another one. A background
+    thread health-checks the backends that are out and puts them back once they answer. Takes the place
+    of a single chat model anywhere one is used: invoke, ainvoke and model work the same way.
+    """
+
+    def __init__(self, backends: List[LLMBackend], health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS):
+        if not backends:
+            raise ValueError("LLMPool needs at least one backend")
+
+        self.backends = backends
+        self.health_check_seconds = health_check_seconds
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+        # Cache keys use the model name, so a pool of one model keeps that model's cached scores
+        self.model = "+".join(sorted({backend.model for backend in backends}))
+
+        self.stopped = threading.Event()
+        self.checker = threading.Thread(target=self.check_forever, name="llm-pool-health", daemon=True)
+        self.checker.start()
+
+
+    @classmethod
+    def from_endpoints(cls, model: str, endpoints: List[str], client_kwargs: Optional[Dict[str, Any]] = None,
+                       health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS,
+                       keep_alive: Optional[Union[int, str]] = None) -> "LLMPool":
+        """Pool of Ollama endpoints, each 'url' or 'model@url' to run a different model there"""
+
+        from langchain.chat_models import init_chat_model
+
+        backends = []
+        for endpoint in endpoints:
+            endpointModel, url = parse_endpoint(endpoint, model)
+            llm = init_chat_model(endpointModel, model_provider='ollama', base_url=url, client_kwargs=client_kwargs or {},
+                                  keep_alive=keep_alive)
+            backends.append(LLMBackend(f"{endpointModel}@{url}", llm, health_check=ollama_health_check(url)))
+
+        return cls(backends, health_check_seconds=health_check_seconds)
+
+
+    def acquire(self, exclude: List[LLMBackend]) -> Optional[LLMBackend]:
+        """Least-outstanding backend not tried yet for this call, preferring healthy ones"""
+
+        with self.lock:
+            candidates = [backend for backend in self.backends if backend not in exclude]
+            healthy = [backend for backend in candidates if backend.healthy]
+            if not candidates:
+                return None
+
+            # With every backend out, still try one rather than failing without asking
+            backend = min(healthy or candidates, key=lambda backend: (backend.outstanding, backend.calls))
+            backend.outstanding += 1
+
+            return backend
+
+
+    def release(self, backend: LLMBackend, seconds: float, error: Optional[BaseException] = None):
+        with self.lock:
+            backend.outstanding -= 1
+            backend.calls += 1
+            backend.busy_seconds += seconds
+
+            if error is not None:
+                backend.failures += 1
+                backend.last_error = f"{type(error).__name__}: {error}"
+                if backend.healthy:
+                    backend.healthy = False
+                    logger.warning("Taking LLM backend %s out of rotation: %s", backend.name, backend.last_error)
+
+
+    def invoke(self, prompt: Any, **kwargs) -> Any:
+        tried: List[LLMBackend] = []
+
+        while True:
+            backend = self.acquire(tried)
+            if backend is None:
+                raise tried_error(tried)
+            tried.append(backend)
+
+            started = time.perf_counter()
+            try:
+                response = backend.llm.invoke(prompt, **kwargs)
+            except Exception as e:
+                self.release(backend, time.perf_counter() - started, e)
+                continue
+            except BaseException:
+                # Cancelled or interrupted, not the backend's fault
+                self.release(backend, time.perf_counter() - started)
+                raise
+
+            self.release(backend, time.perf_counter() - started)
+            return response
+
+
+    async def ainvoke(self, prompt: Any, **kwargs) -> Any:
+        tried: List[LLMBackend] = []
+
+        while True:
+            backend = self.acquire(tried)
+            if backend is None:
+                raise tried_error(tried)
+            tried.append(backend)
+
+            started = time.perf_counter()
+            try:
+                response = await backend.llm.ainvoke(prompt, **kwargs)
+            except Exception as e:
+                self.release(backend, time.perf_counter() - started, e)
+                continue
+            except BaseException:
+                # Cancelled or interrupted, not the backend's fault
+                self.release(backend, time.perf_counter() - started)
+                raise
+
+            self.release(backend, time.perf_counter() - started)
+            return response
+
+
+    def check(self):
+        """Health-check every backend out of rotation and bring back the ones that answer"""
+
+        with self.lock:
+            down = [backend for backend in self.backends if not backend.healthy]
+
+        for backend in down:
+            try:
+                healthy = backend.health_check()
+            except Exception as e:
+                healthy = False
+                backend.last_error = f"{type(e).__name__}: {e}"
+
+            if healthy:
+                with self.lock:
+                    backend.healthy = True
+                logger.info("LLM backend %s is back in rotation", backend.name)
+
+
+    def check_forever(self):
+        while not self.stopped.wait(self.health_check_seconds):
+            self.check()
+
+
+    def close(self):
+        self.stopped.set()
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-backend load. utilization is the average number of calls in flight since the pool started"""
+
+        with self.lock:
+            uptime = time.monotonic() - self.started
+            totalCalls = sum(backend.calls for backend in self.backends)
+
+            return {
+                'backends': [{
+                    'name': backend.name,
+                    'model': backend.model,
+                    'healthy': backend.healthy,
+                    'outstanding': backend.outstanding,
+                    'calls': backend.calls,
+                    'failures': backend.failures,
+                    'busy_seconds': backend.busy_seconds,
+                    'utilization': backend.busy_seconds / uptime if uptime else 0.0,
+                    'share': backend.calls / totalCalls if totalCalls else 0.0,
+                    'last_error': backend.last_error,
+                } for backend in self.backends],
+                'healthy': sum(backend.healthy for backend in self.backends),
+            }
+
+
+    def prometheus(self) -> str:
+        """Per-backend gauges and counters, labelled by backend"""
+
+        lines = []
+        backends = self.stats()['backends']
+        for field, kind in (('healthy', 'gauge'), ('outstanding', 'gauge'), ('utilization', 'gauge'),
+                            ('calls', 'counter'), ('failures', 'counter'), ('busy_seconds', 'counter')):
+            name = f"{METRIC_PREFIX}_llm_backend_{field}" + ("_total" if kind == 'counter' else "")
+            lines.append(f"# TYPE {name} {kind}")
+            for backend in backends:
+                lines.append(f'{name}{{backend="{backend["name"]}"}} {float(backend[field])}')
+
+        return "\n".join(lines) + "\n"
+
+
+def parse_endpoint(endpoint: str, model: str) -> Tuple[str, str]:
+    """'model@url' or just 'url', which runs the pool's default model"""
+
+    if '@' in endpoint:
+        endpointModel, url = endpoint.split('@', 1)
+        return endpointModel.strip() or model, url.strip()
+
+    return model, endpoint.strip()
+
+
+def ollama_health_check(url: str) -> Callable[[], bool]:
+    """An Ollama endpoint is up when it lists its models"""
+
+    def check() -> bool:
+        response = httpx.get(url.rstrip('/') + "/api/tags", timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+        return response.status_code == 200
+
+    return check
+
+
+def tried_error(tried: List[LLMBackend]) -> RuntimeError:
+    errors = "; ".join(f"{backend.name}: {backend.last_error}" for backend in tried)
+    return RuntimeError(f"Every LLM backend failed ({errors})" if tried else "No LLM backends")
+
+
+def split_endpoints(endpoints: str) -> List[str]:
+    return [endpoint for endpoint in endpoints.split(',') if endpoint.strip()]
+
+
+def llm_model_name(model: str, endpoints: str = "") -> str:
+    """The model name create_llm's client will report, worked out without building it"""
+
+    return "+".join(sorted({parse_endpoint(endpoint, model)[0] for endpoint in split_endpoints(endpoints)})) or model
+
+
+def create_llm(model: str, endpoints: str = "", client_kwargs: Optional[Dict[str, Any]] = None,
+               keep_alive: Optional[Union[int, str]] = None):
+    """One Ollama client, or an LLMPool when endpoints lists more than one comma separated endpoint.
+    keep_alive is how long Ollama keeps the model loaded after each call, None leaves Ollama's default"""
+
+    # Importing langchain takes about a second, so it waits until a client is actually built
+    from langchain.chat_models import init_chat_model
+
+    endpoints = split_endpoints(endpoints)
+    if len(endpoints) > 1:
+        return LLMPool.from_endpoints(model, endpoints, client_kwargs=client_kwargs, keep_alive=keep_alive)
+
+    model, url = parse_endpoint(endpoints[0], model) if endpoints else (model, DEFAULT_OLLAMA_URL)
+    return init_chat_model(model, model_provider='ollama', base_url=url, client_kwargs=client_kwargs or {},
+                           keep_alive=keep_alive)
@@ -0,0 +1,245 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, List, Optional
+
+from llm_stats import METRIC_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Lanes from most to least urgent. A waiting call always starts before any call of a later lane
+INTERACTIVE = "interactive"  # Scoring a round players are waiting on
+BACKGROUND = "background"    # Filling the prompt pool
+BULK = "bulk"                # Offline re-scoring
+LANES = (INTERACTIVE, BACKGROUND, BULK)
+
+DEFAULT_LLM_CONCURRENCY = 4  # Ollama's OLLAMA_NUM_PARALLEL default on most machines
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_RESERVED_INTERACTIVE = 1
+SERVICE_TIME_SMOOTHING = 0.2  # Weight of the newest call in the moving average behind Retry-After
+
+
+class SchedulerFull(Exception):
+    """The LLM queue is full. retry_after is a hint in seconds for when it will have room"""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"LLM queue is full, retry in {retry_after}s")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Waiter:
+    """A call queued for a slot, woken by the thread that hands it one"""
+
+    def __init__(self, lane: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.lane = lane
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+
+    def wake(self):
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+
+
+class LLMScheduler:
+    """Admission control for LLM calls: at most max_concurrency run at once and at most max_queue wait.
+
+    Waiting calls are served by lane, then first come first served. reserved_interactive slots are kept
+    for interactive calls, so background and bulk work never takes every slot from players. Admission
+    happens per request: once max_queue calls are waiting, check() raises SchedulerFull with a
+    Retry-After hint instead of piling more rounds onto Ollama, while calls of rounds already let in
+    still queue. Time spent waiting is counted per lane, apart from the model's own time.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_LLM_CONCURRENCY, max_queue: int = DEFAULT_MAX_QUEUE,
+                 reserved_interactive: int = DEFAULT_RESERVED_INTERACTIVE):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.reserved_interactive = min(reserved_interactive, self.max_concurrency - 1)
+        self.lock = threading.Lock()
+
+        self.running = 0
+        self.queue: List[tuple] = []
+        self.order = itertools.count()
+        self.service_seconds: Optional[float] = None
+
+        self.lanes: Dict[str, Dict[str, float]] = {
+            lane: {'admitted': 0, 'rejected': 0, 'queued': 0, 'queue_seconds': 0.0, 'max_queue_seconds': 0.0}
+            for lane in LANES
+        }
+
+
+    def limit(self, lane: str) -> int:
+        """Slots calls of this lane may fill"""
+
+        return self.max_concurrency if lane == INTERACTIVE else self.max_concurrency - self.reserved_interactive
+
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained, from how long calls have been taking. Caller holds the lock"""
+
+        serviceSeconds = self.service_seconds or 1.0
+        return max(1, math.ceil(len(self.queue) / self.max_concurrency * serviceSeconds))
+
+
+    def check(self, lane: str = INTERACTIVE):
+        """Raise SchedulerFull when the queue has no room, counting the request as rejected"""
+
+        with self.lock:
+            if len(self.queue) >= self.max_queue:
+                self.lanes[lane]['rejected'] += 1
+                raise SchedulerFull(lane, self.retry_after())
+
+
+    def enter(self, lane: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[Waiter]:
+        """Take a slot now and return None, or queue and return the Waiter to wait on"""
+
+        if lane not in self.lanes:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {LANES}")
+
+        with self.lock:
+            # Queued calls of the same or a more urgent lane go first, a less urgent queue doesn't hold this one up
+            ahead = any(rank <= LANES.index(lane) for rank, _, _ in self.queue)
+            if not ahead and self.running < self.limit(lane):
+                self.running += 1
+                self.lanes[lane]['admitted'] += 1
+                return None
+
+            # Calls of an admitted request always queue, refusing them would waste the round's finished calls
+            waiter = Waiter(lane, loop)
+            heapq.heappush(self.queue, (LANES.index(lane), next(self.order), waiter))
+            self.lanes[lane]['queued'] += 1
+
+            return waiter
+
+
+    def leave(self, lane: str, waited: float, serviceSeconds: Optional[float] = None):
+        """Give the slot back and hand it to the most urgent waiter that may have it"""
+
+        with self.lock:
+            self.running -= 1
+
+            counters = self.lanes[lane]
+            counters['queue_seconds'] += waited
+            counters['max_queue_seconds'] = max(counters['max_queue_seconds'], waited)
+            if serviceSeconds is not None:
+                self.service_seconds = serviceSeconds if self.service_seconds is None else (
+                    SERVICE_TIME_SMOOTHING * serviceSeconds + (1 - SERVICE_TIME_SMOOTHING) * self.service_seconds)
+
+            self.dispatch()
+
+
+    def dispatch(self):
+        """Start queued calls while slots are free. Caller holds the lock"""
+
+        while self.queue:
+            _, _, waiter = self.queue[0]
+            if self.running >= self.limit(waiter.lane):
+                return
+
+            heapq.heappop(self.queue)
+            self.running += 1
+            self.lanes[waiter.lane]['admitted'] += 1
+            waiter.wake()
+
+
+    def abandon(self, waiter: Waiter):
+        """A waiter gave up (cancelled or timed out), drop it from the queue or return the slot it was handed"""
+
+        with self.lock:
+            if not waiter.granted:
+                self.queue = [entry for entry in self.queue if entry[2] is not waiter]
+                heapq.heapify(self.queue)
+                return
+
+        self.leave(waiter.lane, 0.0)
+
+
+    @contextmanager
+    def slot(self, lane: str = INTERACTIVE):
+        """Hold a slot for one LLM call, yields the seconds spent waiting for it"""
+
+        started = time.perf_counter()
+        waiter = self.enter(lane)
+        if waiter is not None:
+            waiter.event.wait()
+        waited = time.perf_counter() - started
+
+        serviceStarted = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.leave(lane, waited, time.perf_counter() - serviceStarted)
+
+
+    @asynccontextmanager
+    async def aslot(self, lane: str = INTERACTIVE):
+        """slot() for coroutines, waiting without holding a thread"""
+
+        started = time.perf_counter()
+        waiter = self.enter(lane, asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await waiter.future
+            except BaseException:
+                self.abandon(waiter)
+                raise
+        waited = time.perf_counter() - started
+
+        serviceStarted = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.leave(lane, waited, time.perf_counter() - serviceStarted)
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Slots in use, queue depth and per-lane admissions, rejections and queue wait"""
+
+        with self.lock:
+            waiting = {lane: 0 for lane in LANES}
+            for _, _, waiter in self.queue:
+                waiting[waiter.lane] += 1
+
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'running': self.running,
+                'waiting': len(self.queue),
+                'service_seconds': self.service_seconds or 0.0,
+                'lanes': {lane: {
+                    **counters,
+                    'waiting': waiting[lane],
+                    'mean_queue_seconds': counters['queue_seconds'] / counters['admitted'] if counters['admitted'] else 0.0,
+                } for lane, counters in self.lanes.items()},
+            }
+
+
+    def prometheus(self) -> str:
+        """Gauges for slots and queue depth, per-lane counters labelled by lane"""
+
+        stats = self.stats()
+        lines = []
+        for field in ('max_concurrency', 'running', 'waiting'):
+            lines.append(f"# TYPE {METRIC_PREFIX}_llm_scheduler_{field} gauge")
+            lines.append(f"{METRIC_PREFIX}_llm_scheduler_{field} {float(stats[field])}")
+
+        for field, kind in (('waiting', 'gauge'), ('admitted', 'counter'), ('rejected', 'counter'),
+                            ('queue_seconds', 'counter'), ('max_queue_seconds', 'gauge')):
+            name = f"{METRIC_PREFIX}_llm_lane_{field}" + ("_total" if kind == 'counter' else "")
+            lines.append(f"# TYPE {name} {kind}")
+            for lane, counters in stats['lanes'].items():
+                lines.append(f'{name}{{lane="{lane}"}} {float(counters[field])}')
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,152 @@
+import bisect
+import threading
+from typing import Dict, Any, List, Optional
+
+# Upper bounds in seconds of the LLM latency histogram buckets, +Inf is added when rendering
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "notebook"
+
+
+class LLMCallStats:
+    """Per-operation counters for LLM calls: latency, tokens generated and JSON parse outcomes"""
+
+    FIELDS = ('calls', 'seconds', 'queue_seconds', 'prompt_eval_seconds', 'prompt_tokens', 'completion_tokens',
+              'cache_hits', 'parse_failures', 'retries', 'fallbacks')
+
+    # Counter name and help text for /metrics, latency is rendered as a histogram instead
+    COUNTERS = {
+        'queue_seconds': "Time LLM calls waited for a scheduler slot, not part of the latency histogram",
+        'prompt_eval_seconds': "Time the LLM spent reading prompts, not counting prefixes reused from its KV cache",
+        'prompt_tokens': "Prompt tokens the LLM evaluated",
+        'completion_tokens': "Tokens generated by the LLM",
+        'cache_hits': "Scores served from the score cache instead of the LLM",
+        'parse_failures': "LLM replies that did not decode to a usable score",
+        'retries': "LLM calls repeated after a bad reply",
+        'fallbacks': "Scores estimated locally after every attempt failed",
+    }
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self.operations: Dict[str, Dict[str, float]] = {}
+        self.histograms: Dict[str, List[int]] = {}
+
+
+    def operation(self, name: str) -> Dict[str, float]:
+        """Counters for one operation. Caller holds the lock"""
+
+        counters = self.operations.get(name)
+        if counters is None:
+            counters = dict.fromkeys(self.FIELDS, 0)
+            self.operations[name] = counters
+            self.histograms[name] = [0] * len(self.buckets)
+
+        return counters
+
+
+    def record_call(self, name: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+                    prompt_eval_seconds: float = 0.0, queue_seconds: float = 0.0):
+        """One finished call. seconds is the model's time, queue_seconds the wait for a slot before it"""
+
+        with self.lock:
+            counters = self.operation(name)
+            counters['calls'] += 1
+            counters['seconds'] += seconds
+            counters['queue_seconds'] += queue_seconds
+            counters['prompt_eval_seconds'] += prompt_eval_seconds
+            counters['prompt_tokens'] += prompt_tokens
+            counters['completion_tokens'] += completion_tokens
+
+            # Non-cumulative here, cumulated when rendered. Slower than the last bucket only counts towards +Inf
+            bucket = bisect.bisect_left(self.buckets, seconds)
+            if bucket < len(self.buckets):
+                self.histograms[name][bucket] += 1
+
+
+    def record(self, name: str, field: str, amount: int = 1):
+        """Bump cache_hits, parse_failures, retries or fallbacks"""
+
+        with self.lock:
+            self.operation(name)[field] += amount
+
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            report = {}
+            for name, counters in self.operations.items():
+                calls = counters['calls']
+                report[name] = {
+                    **counters,
+                    'mean_seconds': counters['seconds'] / calls if calls else 0.0,
+                    'mean_queue_seconds': counters['queue_seconds'] / calls if calls else 0.0,
+                    'mean_prompt_eval_seconds': counters['prompt_eval_seconds'] / calls if calls else 0.0,
+                    'mean_prompt_tokens': counters['prompt_tokens'] / calls if calls else 0.0,
+                    'mean_completion_tokens': counters['completion_tokens'] / calls if calls else 0.0,
+                    'parse_failure_rate': counters['parse_failures'] / calls if calls else 0.0,
+                }
+
+            return report
+
+
+    def prometheus(self) -> str:
+        """The counters in Prometheus text exposition format, labelled by operation"""
+
+        name = f"{METRIC_PREFIX}_llm_call_seconds"
+        lines = [f"# HELP {name} Latency of LLM calls", f"# TYPE {name} histogram"]
+
+        with self.lock:
+            operations = {operation: dict(counters) for operation, counters in self.operations.items()}
+            histograms = {operation: list(counts) for operation, counts in self.histograms.items()}
+
+        for operation, counters in operations.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, histograms[operation]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{operation="{operation}",le="+Inf"}} {counters["calls"]}')
+            lines.append(f'{name}_sum{{operation="{operation}"}} {counters["seconds"]}')
+            lines.append(f'{name}_count{{operation="{operation}"}} {counters["calls"]}')
+
+        for field, description in self.COUNTERS.items():
+            counter = f"{METRIC_PREFIX}_llm_{field}_total"
+            lines.append(f"# HELP {counter} {description}")
+            lines.append(f"# TYPE {counter} counter")
+            for operation, counters in operations.items():
+                lines.append(f'{counter}{{operation="{operation}"}} {counters[field]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def label_value(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_gauges(component: str, stats: Dict[str, Any], labels: Optional[Dict[str, str]] = None) -> str:
+    """Numeric values of a component's stats() dict as Prometheus gauges. A dict of numbers becomes one gauge
+    labelled by its keys, the label named in labels (e.g. {'depth': 'theme'}) or 'key'"""
+
+    lines = []
+    for key, value in stats.items():
+        name = f"{METRIC_PREFIX}_{component}_{key}"
+
+        if isinstance(value, dict):
+            label = (labels or {}).get(key, 'key')
+            samples = [f'{name}{{{label}="{label_value(labelValue)}"}} {number}'
+                       for labelValue, number in value.items() if is_number(number)]
+            if samples:
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(samples)
+            continue
+
+        if not is_number(value):
+            continue
+
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,88 @@
+"""Fire concurrent games at a running server and report throughput
+
+Compare the two serving modes against the same Ollama:
+    python api.py                              then  python load_test.py --url http://localhost:5000
+    uvicorn asgi:app --port 5001               then  python load_test.py --url http://localhost:5001
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, Any, List
+
+import httpx
+
+WORDS = ["Dog", "Sun", "Pizza", "Galaxy", "Volcano", "Friendship", "Rainbow", "Castle", "Adventure", "Mystery"]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def play_round(client: httpx.AsyncClient, players: int, theme: str) -> float:
+    """One game: /start_game then /submit_words, returns how long it took"""
+
+    started = time.perf_counter()
+
+    response = await client.post("/start_game", json={"player_count": players, "theme": theme})
+    response.raise_for_status()
+    prompt = response.json()["prompt"]
+
+    playerWords = {str(player): random.choice(WORDS) for player in range(1, players + 1)}
+    response = await client.post("/submit_words", json={"prompt": prompt, "player_words": playerWords})
+    response.raise_for_status()
+
+    return time.perf_counter() - started
+
+
+async def run(url: str, games: int, concurrency: int, players: int, theme: str, timeout: float) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+
+        async def game():
+            nonlocal errors
+            async with semaphore:
+                try:
+                    latencies.append(await play_round(client, players, theme))
+                except (httpx.HTTPError, KeyError, ValueError) as e:
+                    errors += 1
+                    print(f"Game failed: {e}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(game() for _ in range(games)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'url': url,
+        'games': games,
+        'concurrency': concurrency,
+        'players': players,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'games_per_second': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        'p50_seconds': round(percentile(latencies, 0.50), 3),
+        'p95_seconds': round(percentile(latencies, 0.95), 3),
+        'max_seconds': round(max(latencies, default=0.0), 3),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test /start_game + /submit_words")
+    parser.add_argument('--url', default="http://localhost:5000")
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=25, help="games in flight at once")
+    parser.add_argument('--players', type=int, default=5)
+    parser.add_argument('--theme', default="nature")
+    parser.add_argument('--timeout', type=float, default=300.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.url, args.games, args.concurrency, args.players, args.theme, args.timeout)), indent=2))
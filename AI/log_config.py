@@ -0,0 +1,35 @@
+import logging
+import os
+import random
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class SampledFilter(logging.Filter):
+    """Passes every warning and error but only a fraction of debug and info records"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+
+        return random.random() < self.rate
+
+
+def configure_logging(level: Optional[str] = None, sample_rate: Optional[float] = None):
+    """Log to stderr at LOG_LEVEL, keeping LOG_SAMPLE_RATE of the records below warning"""
+
+    level = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    if sample_rate is None:
+        sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.addFilter(SampledFilter(sample_rate))
+
+    logging.basicConfig(level=level, handlers=[handler], force=True)
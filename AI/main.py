@@ -1,8 +1,14 @@
-from langchain.chat_models import init_chat_model
+import os
 
 from Word_Assesment import Word_Assesment
+from spell_checker import SpellChecker
+from word_frequency import WordFrequencyIndex
+from spelling_complexity import SpellingComplexityScorer
+from log_config import configure_logging
+from llm_pool import create_llm
 
 CHAT_MODEL = "qwen3:0.6b"
+OLLAMA_URLS = os.environ.get('OLLAMA_URLS', '')  # Same as api.py, more than one endpoint makes an LLMPool
 
 class Main:
     def __init__(self):
@@ -15,13 +21,16 @@ class Main:
         print("Welcome to The Notebook")
 
         try:
-            llm = init_chat_model(CHAT_MODEL, model_provider='ollama')
+            llm = create_llm(CHAT_MODEL, OLLAMA_URLS)
         except Exception as e:
             print(f"Error connecting LLM: {e}")
             print(f"Rerun Ollama - {CHAT_MODEL}")
 
             return
 
+        spellChecker = SpellChecker.load()
+        frequencyIndex = WordFrequencyIndex.load()
+
         while True:
             print("\nOptions:")
             print("1. Start a new game\n"
@@ -34,7 +43,8 @@ class Main:
                 break
             elif choice == "1":
                 try:
-                    Word_Assesment(llm).start_new_game(llm, theme = "")
+                    Word_Assesment(llm, spell_checker=spellChecker, frequency_index=frequencyIndex,
+                                   complexity_scorer=SpellingComplexityScorer()).start_new_game(llm, theme = "")
                 except Exception as e:
                     print(f"Error when starting game: {e}")
             else:
@@ -42,4 +52,5 @@ class Main:
 
 
 if __name__ == "__main__":
+    configure_logging()
     Main().play_game()
@@ -0,0 +1,275 @@
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
+
+from llm_stats import METRIC_PREFIX
+from llm_scheduler import LLMScheduler, BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP_ALIVE = "30m"  # How long Ollama keeps the model loaded after each call
+DEFAULT_KEEP_WARM_SECONDS = 240.0
+DEFAULT_RETRY_SECONDS = 5.0
+WARMUP_PROMPT = "Reply with OK."
+
+# Started when this module is first imported, which is as close to process start as the API gets
+PROCESS_STARTED = time.monotonic()
+
+
+def parse_keep_alive(value: str) -> Union[int, str]:
+    """Ollama takes keep_alive as seconds or a duration string, and a bare number only as a number"""
+
+    return int(value) if value.strip().lstrip('-').isdigit() else value.strip()
+
+
+class LazyLLM:
+    """Stands in for the chat model and builds it on first use, so importing the API builds no client.
+
+    model is known up front, so scorers get their cache keys without forcing the client into being.
+    """
+
+    def __init__(self, factory: Callable[[], Any], model: str):
+        self.factory = factory
+        self.model = model
+        self.instance = None
+        self.lock = threading.Lock()
+
+
+    def client(self) -> Any:
+        if self.instance is None:
+            with self.lock:
+                if self.instance is None:
+                    started = time.perf_counter()
+                    self.instance = self.factory()
+                    logger.info("Created LLM client %s in %.2fs", self.model, time.perf_counter() - started)
+
+        return self.instance
+
+
+    def invoke(self, prompt: Any, **kwargs) -> Any:
+        return self.client().invoke(prompt, **kwargs)
+
+
+    async def ainvoke(self, prompt: Any, **kwargs) -> Any:
+        return await self.client().ainvoke(prompt, **kwargs)
+
+
+def warm_targets(llm) -> List[Tuple[str, Any]]:
+    """Every model that needs loading: each backend of an LLMPool, else the one client"""
+
+    client = llm.client() if isinstance(llm, LazyLLM) else llm
+    backends = getattr(client, 'backends', None)
+    if backends:
+        return [(backend.name, backend.llm) for backend in backends]
+
+    return [(getattr(client, 'model', None) or type(client).__name__, client)]
+
+
+class ModelWarmup:
+    """Loads the model into Ollama before the worker reports ready, then keeps it loaded.
+
+    Each backend gets two one-token calls with keep_alive: the first pays the model load (cold), the
+    second shows the loaded latency (warm). The worker is ready once a backend answered, a pool with
+    some backends down still serves from the rest. After that a ping every keep_warm_seconds renews
+    keep_alive, so Ollama never unloads the model while the worker is up, and pings failing on every
+    backend mark the worker not ready until one answers again.
+
+    With prefixes (the fixed rubric heads of the scoring prompts) the pings send those instead of a bare
+    prompt, so their KV cache is filled before the first round and stays filled between rounds.
+    With a scheduler every ping takes a background slot, so pings never hold up players' rounds.
+    """
+
+    def __init__(self, llm, keep_alive: Union[int, str] = DEFAULT_KEEP_ALIVE,
+                 keep_warm_seconds: float = DEFAULT_KEEP_WARM_SECONDS, retry_seconds: float = DEFAULT_RETRY_SECONDS,
+                 prefixes: Optional[List[str]] = None, scheduler: Optional[LLMScheduler] = None):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.prefixes = list(prefixes or [])
+        self.keep_alive = keep_alive
+        self.keep_warm_seconds = keep_warm_seconds
+        self.retry_seconds = retry_seconds
+        self.lock = threading.Lock()
+
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+        self.cold_seconds: Dict[str, float] = {}
+        self.warm_seconds: Dict[str, float] = {}
+        self.ready_after_seconds: Optional[float] = None
+        self.attempts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.last_ping_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self.first_request_after_seconds: Optional[float] = None
+        self.first_request_seconds: Optional[float] = None
+        self.first_request_ready: Optional[bool] = None
+
+
+    def ping(self, llm, prompt: str = WARMUP_PROMPT) -> float:
+        """Seconds for a one token reply, which also renews how long Ollama keeps the model loaded"""
+
+        with self.scheduler.slot(BACKGROUND) if self.scheduler is not None else nullcontext():
+            started = time.perf_counter()
+            llm.invoke(prompt, reasoning=False, keep_alive=self.keep_alive, options={'num_predict': 1})
+            return time.perf_counter() - started
+
+
+    def ping_prefixes(self, llm) -> float:
+        """Ping with every prefix, or the bare warm-up prompt without any, returning the slowest"""
+
+        return max(self.ping(llm, prompt) for prompt in self.prefixes or [WARMUP_PROMPT])
+
+
+    def warm_up(self) -> bool:
+        """Load every backend's model and time a cold and a warm call, True once one of them answered"""
+
+        with self.lock:
+            self.attempts += 1
+
+        try:
+            targets = warm_targets(self.llm)
+        except Exception as e:
+            return self.failed("LLM warm-up failed", e)
+
+        warmed = 0
+        for name, llm in targets:
+            try:
+                cold = self.ping(llm)
+                warm = self.ping(llm)
+                self.ping_prefixes(llm)
+            except Exception as e:
+                self.failed(f"Warming {name} failed", e)
+                continue
+
+            with self.lock:
+                self.cold_seconds[name] = cold
+                self.warm_seconds[name] = warm
+            logger.info("Warmed %s: cold call %.2fs, warm call %.2fs", name, cold, warm)
+            warmed += 1
+
+        if not warmed:
+            logger.warning("No LLM backend warmed up, retrying in %.0fs", self.retry_seconds)
+            return False
+
+        with self.lock:
+            self.ready_after_seconds = time.monotonic() - PROCESS_STARTED
+        self.ready.set()
+        logger.info("LLM ready %.2fs after start", self.ready_after_seconds)
+
+        return True
+
+
+    def keep_warm(self):
+        """Ping every backend once, keeping the model loaded and readiness current"""
+
+        latencies = []
+        for name, llm in warm_targets(self.llm):
+            try:
+                latencies.append(self.ping_prefixes(llm))
+            except Exception as e:
+                self.failed(f"Keep-warm ping to {name} failed", e)
+
+        with self.lock:
+            self.pings += 1
+            if latencies:
+                self.last_ping_seconds = max(latencies)
+            else:
+                self.ping_failures += 1
+
+        if latencies and not self.ready.is_set():
+            logger.info("Keep-warm ping answered, reporting ready again")
+            self.ready.set()
+        elif not latencies and self.ready.is_set():
+            logger.warning("Keep-warm pings failed on every backend, reporting not ready")
+            self.ready.clear()
+
+
+    def failed(self, message: str, error: Exception) -> bool:
+        with self.lock:
+            self.last_error = f"{type(error).__name__}: {error}"
+        logger.warning("%s: %s", message, self.last_error)
+
+        return False
+
+
+    def run(self, on_ready: Optional[Callable[[], None]] = None):
+        while not self.warm_up():
+            if self.stopped.wait(self.retry_seconds):
+                return
+
+        if on_ready is not None:
+            on_ready()
+
+        while not self.stopped.wait(self.keep_warm_seconds):
+            self.keep_warm()
+
+
+    def start(self, on_ready: Optional[Callable[[], None]] = None) -> "ModelWarmup":
+        """Warm up and keep warm on a daemon thread, on_ready runs once the first warm-up succeeds"""
+
+        self.thread = threading.Thread(target=self.run, args=(on_ready,), name="llm-warmup", daemon=True)
+        self.thread.start()
+        return self
+
+
+    def close(self):
+        self.stopped.set()
+
+
+    def record_request(self, started: float, finished: float):
+        """Time to the first request and how long it took, started and finished from time.monotonic"""
+
+        with self.lock:
+            if self.first_request_after_seconds is None:
+                self.first_request_after_seconds = started - PROCESS_STARTED
+                self.first_request_seconds = finished - started
+                self.first_request_ready = self.ready.is_set()
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Readiness, cold and warm call latency per backend and time to the first request"""
+
+        with self.lock:
+            return {
+                'ready': self.ready.is_set(),
+                'ready_after_seconds': self.ready_after_seconds,
+                'keep_alive': self.keep_alive,
+                'cold_seconds': dict(self.cold_seconds),
+                'warm_seconds': dict(self.warm_seconds),
+                'warmup_attempts': self.attempts,
+                'pings': self.pings,
+                'ping_failures': self.ping_failures,
+                'last_ping_seconds': self.last_ping_seconds,
+                'last_error': self.last_error,
+                'first_request_after_seconds': self.first_request_after_seconds,
+                'first_request_seconds': self.first_request_seconds,
+                'first_request_ready': self.first_request_ready,
+            }
+
+
+    def prometheus(self) -> str:
+        """Readiness and warm-up timings, cold and warm call latency labelled by backend"""
+
+        stats = self.stats()
+        lines = [f"# TYPE {METRIC_PREFIX}_llm_ready gauge", f"{METRIC_PREFIX}_llm_ready {float(stats['ready'])}"]
+
+        for field in ('ready_after_seconds', 'first_request_after_seconds', 'first_request_seconds', 'last_ping_seconds'):
+            if stats[field] is not None:
+                lines.append(f"# TYPE {METRIC_PREFIX}_llm_{field} gauge")
+                lines.append(f"{METRIC_PREFIX}_llm_{field} {float(stats[field])}")
+
+        for field in ('pings', 'ping_failures'):
+            lines.append(f"# TYPE {METRIC_PREFIX}_llm_keep_warm_{field}_total counter")
+            lines.append(f"{METRIC_PREFIX}_llm_keep_warm_{field}_total {float(stats[field])}")
+
+        for field in ('cold_seconds', 'warm_seconds'):
+            lines.append(f"# TYPE {METRIC_PREFIX}_llm_warmup_{field} gauge")
+            for backend, seconds in stats[field].items():
+                lines.append(f'{METRIC_PREFIX}_llm_warmup_{field}{{backend="{backend}"}} {float(seconds)}')
+
+        return "\n".join(lines) + "\n"
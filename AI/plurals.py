@@ -0,0 +1,29 @@
+from typing import List
+
+VOWELS = 'aeiou'
+# Singulars ending in these take -es in the plural (boxes, churches, heroes), the others a bare -s
+ES_ENDINGS = ('s', 'x', 'z', 'ch', 'sh', 'o')
+
+
+def singulars(word: str) -> List[str]:
+    """Singulars a lowercase word is the regular plural of, by English spelling rules, so 'buss' isn't
+    taken for bus. Without a dictionary it can't tell which one is meant: 'buses' gives bus and buse"""
+
+    singulars = []
+    if word.endswith('ies') and len(word) > 4 and word[-4] not in VOWELS:
+        singulars.append(word[:-3] + 'y')
+    if word.endswith('es') and len(word) > 3 and word[:-2].endswith(ES_ENDINGS):
+        singulars.append(word[:-2])
+
+    stem = word[:-1]
+    if word.endswith('s') and len(stem) > 1 and not stem.endswith(ES_ENDINGS[:-1]) \
+            and not (stem.endswith('y') and stem[-2] not in VOWELS):
+        singulars.append(stem)
+
+    return singulars
+
+
+def word_forms(word: str) -> List[str]:
+    """The lowercase word followed by the singulars it may be the plural of, the keys to look it up by"""
+
+    return [word] + singulars(word)
@@ -0,0 +1,187 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 5      # Ready prompts kept per theme
+DEFAULT_LOW_WATER = 2     # Refill once a theme drops below this many
+DEFAULT_RECENT = 50       # Recently served prompts that won't be handed out again
+DEFAULT_MAX_THEMES = 32   # Themes come from clients, so keep the number of queues bounded
+MAX_DUPLICATE_RETRIES = 3
+
+
+class PromptPool:
+    """Keeps a bounded queue of ready-made prompts per theme, refilled by a background thread"""
+
+    def __init__(self, generate: Callable[[str], str], capacity: int = DEFAULT_CAPACITY,
+                 low_water: int = DEFAULT_LOW_WATER, recent: int = DEFAULT_RECENT,
+                 max_themes: int = DEFAULT_MAX_THEMES):
+        self.generate = generate
+        self.capacity = capacity
+        self.low_water = low_water
+        self.max_themes = max_themes
+
+        self.queues: "OrderedDict[str, Deque[str]]" = OrderedDict()
+        self.recent: Deque[str] = deque(maxlen=recent)
+        self.pending: "OrderedDict[str, None]" = OrderedDict()
+        self.condition = threading.Condition()
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.failures = 0
+
+        self.worker = threading.Thread(target=self.refill_forever, name="prompt-pool", daemon=True)
+        self.worker.start()
+
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        return re.sub(r'\W+', ' ', prompt).strip().lower()
+
+
+    def queue_for(self, theme: str) -> Deque[str]:
+        """Queue for a theme, dropping the least recently used theme past max_themes. Caller holds the lock"""
+
+        queue = self.queues.get(theme)
+        if queue is None:
+            queue = deque(maxlen=self.capacity)
+            self.queues[theme] = queue
+
+            while len(self.queues) > self.max_themes:
+                self.queues.popitem(last=False)
+
+        self.queues.move_to_end(theme)
+        return queue
+
+
+    def schedule(self, theme: str):
+        """Ask the background thread to top up a theme. Caller holds the lock"""
+
+        if theme not in self.pending:
+            self.pending[theme] = None
+            self.condition.notify()
+
+
+    def prefill(self, themes: Iterable[str]):
+        """Start filling queues for themes expected to be played"""
+
+        with self.condition:
+            for theme in themes:
+                self.queue_for(theme)
+                self.schedule(theme)
+
+
+    def get(self, theme: str) -> str:
+        """Pop a ready prompt, only generating inline when the theme's queue is empty"""
+
+        prompt = self.pop(theme)
+        if prompt is None:
+            prompt = self.generate(theme)
+            self.served(prompt)
+
+        return prompt
+
+
+    def pop(self, theme: str) -> Optional[str]:
+        """A ready prompt for the theme or None, never calls the LLM"""
+
+        with self.condition:
+            queue = self.queue_for(theme)
+
+            prompt = queue.popleft() if queue else None
+            if prompt is not None:
+                self.hits += 1
+                self.recent.append(self.normalize(prompt))
+            else:
+                self.misses += 1
+
+            if len(queue) < self.low_water:
+                self.schedule(theme)
+
+        return prompt
+
+
+    def served(self, prompt: str):
+        """Record a prompt that was generated inline after pop() came back empty"""
+
+        with self.condition:
+            self.generated += 1
+            self.recent.append(self.normalize(prompt))
+
+
+    def is_duplicate(self, theme: str, prompt: str) -> bool:
+        """Caller holds the lock"""
+
+        normalized = self.normalize(prompt)
+        queued = self.queues.get(theme, ())
+
+        return normalized in self.recent or any(self.normalize(other) == normalized for other in queued)
+
+
+    def refill(self, theme: str):
+        duplicatesInARow = 0
+
+        while True:
+            with self.condition:
+                queue = self.queues.get(theme)
+                # The theme was evicted or is already full
+                if queue is None or len(queue) >= self.capacity:
+                    return
+
+            try:
+                prompt = self.generate(theme)
+            except Exception as e:
+                logger.warning("Error pre-generating prompt for theme %r: %s", theme, e)
+                with self.condition:
+                    self.failures += 1
+                time.sleep(1.0)
+                return
+
+            with self.condition:
+                self.generated += 1
+
+                if self.is_duplicate(theme, prompt):
+                    self.duplicates += 1
+                    duplicatesInARow += 1
+                    if duplicatesInARow >= MAX_DUPLICATE_RETRIES:
+                        return
+                    continue
+
+                duplicatesInARow = 0
+                queue = self.queues.get(theme)
+                if queue is not None and len(queue) < self.capacity:
+                    queue.append(prompt)
+
+
+    def refill_forever(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                theme, _ = self.pending.popitem(last=False)
+
+            self.refill(theme)
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per theme and how often /start_game was served from the pool"""
+
+        with self.condition:
+            requests = self.hits + self.misses
+
+            return {
+                'depth': {theme: len(queue) for theme, queue in self.queues.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'generated': self.generated,
+                'duplicates': self.duplicates,
+                'failures': self.failures,
+                'pending_refills': len(self.pending),
+            }
@@ -0,0 +1,196 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # A week, scores only change when the model does
+
+# Criteria whose score depends on the game prompt as well as the word
+PROMPT_DEPENDENT_CRITERIA = ("compatibility", "combined")
+
+
+class ScoreCache:
+    """Two tier cache of LLM scores: an in-memory LRU in front of an optional SQLite file"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.memory: "OrderedDict[Tuple[str, str, str, str], Tuple[float, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+            connection = self.connection()
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    criterion TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (criterion, word, prompt, model)
+                )
+            """)
+            connection.commit()
+
+
+    def connection(self) -> sqlite3.Connection:
+        """One SQLite connection per thread, WAL mode so several API workers can share the file"""
+
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+
+        return connection
+
+
+    @staticmethod
+    def make_key(criterion: str, word: str, prompt: Optional[str], model: str) -> Tuple[str, str, str, str]:
+        """Normalize the parts of a cache key so 'Dog ' and 'dog' share an entry"""
+
+        normalizedWord = word.strip().lower()
+
+        normalizedPrompt = ""
+        if criterion in PROMPT_DEPENDENT_CRITERIA and prompt:
+            normalizedPrompt = re.sub(r'\s+', ' ', prompt).strip().lower()
+
+        return criterion, normalizedWord, normalizedPrompt, model or ""
+
+
+    def get(self, criterion: str, word: str, prompt: Optional[str] = None, model: str = "") -> Optional[float]:
+        """Return the cached score or None, checking memory first and then disk"""
+
+        key = self.make_key(criterion, word, prompt, model)
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                score, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self.memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return score
+
+                del self.memory[key]
+
+        if self.path:
+            row = self.select(key)
+            if row is not None and now - row[1] <= self.ttl_seconds:
+                with self.lock:
+                    self.disk_hits += 1
+                    self.remember(key, row[0], row[1])
+                return row[0]
+
+        with self.lock:
+            self.misses += 1
+
+        return None
+
+
+    def peek(self, criterion: str, word: str, prompt: Optional[str] = None, model: str = "") -> Optional[float]:
+        """get() for lookups that aren't a scoring call (tie-breaks, estimates): no hit or miss is counted
+        and the LRU order is left alone"""
+
+        key = self.make_key(criterion, word, prompt, model)
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+        if entry is not None and now - entry[1] <= self.ttl_seconds:
+            return entry[0]
+
+        if self.path:
+            row = self.select(key)
+            if row is not None and now - row[1] <= self.ttl_seconds:
+                return row[0]
+
+        return None
+
+
+    def select(self, key: Tuple[str, str, str, str]) -> Optional[Tuple[float, float]]:
+        return self.connection().execute(
+            "SELECT score, created_at FROM scores WHERE criterion = ? AND word = ? AND prompt = ? AND model = ?",
+            key
+        ).fetchone()
+
+
+    def set(self, criterion: str, word: str, score: float, prompt: Optional[str] = None, model: str = ""):
+        """Store a score in both tiers"""
+
+        key = self.make_key(criterion, word, prompt, model)
+        now = time.time()
+
+        with self.lock:
+            self.writes += 1
+            self.remember(key, float(score), now)
+
+        if self.path:
+            connection = self.connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO scores (criterion, word, prompt, model, score, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, float(score), now)
+            )
+            connection.commit()
+
+
+    def remember(self, key: Tuple[str, str, str, str], score: float, created_at: float):
+        """Put an entry in the LRU tier, evicting the oldest ones past max_entries. Caller holds the lock"""
+
+        self.memory[key] = (score, created_at)
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+
+    def clear_expired(self) -> int:
+        """Drop expired rows from disk, returns how many were removed"""
+
+        if not self.path:
+            return 0
+
+        connection = self.connection()
+        removed = connection.execute("DELETE FROM scores WHERE created_at < ?", (time.time() - self.ttl_seconds,)).rowcount
+        connection.commit()
+
+        return removed
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters so the savings can be seen from the API"""
+
+        with self.lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'memory_entries': len(self.memory),
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+
+class SingleFlight:
+    """Lets concurrent calls with the same key share one in-flight invocation.
+
+    Works for threads and asyncio at once: the in-flight call is a concurrent Future, which threads
+    wait on directly and coroutines await through asyncio.wrap_future, whichever event loop they run on.
+    A coroutine's call runs as its own task and every caller awaits it shielded, so a caller that is
+    cancelled (a request timing out) gives up alone instead of cancelling the call for the others.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inflight: Dict[Hashable, Future] = {}
+        self.tasks: Set[asyncio.Task] = set()  # The event loop only keeps weak references to running tasks
+
+        self.executed = 0
+        self.coalesced = 0
+
+
+    def claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """The in-flight future for key and whether this caller has to run the call"""
+
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+
+            future = Future()
+            self.inflight[key] = future
+            self.executed += 1
+
+            return future, True
+
+
+    def settle(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        with self.lock:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        future, leader = self.claim(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            raise
+
+        self.settle(key, future, result=result)
+        return result
+
+
+    async def lead(self, key: Hashable, future: Future, call: Callable[[], Awaitable[Any]]):
+        """Run the call and settle the shared future, raising nothing since no one awaits this task"""
+
+        try:
+            result = await call()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            return
+
+        self.settle(key, future, result=result)
+
+
+    async def ado(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        future, leader = self.claim(key)
+        if leader:
+            task = asyncio.ensure_future(self.lead(key, future, call))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+
+    def stats(self) -> Dict[str, Any]:
+        """How many LLM calls were actually made and how many were saved by sharing one"""
+
+        with self.lock:
+            total = self.executed + self.coalesced
+
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self.inflight),
+                'saved_rate': self.coalesced / total if total else 0.0,
+            }
@@ -0,0 +1,108 @@
+import logging
+import os
+import sys
+import time
+from bisect import bisect_left
+from typing import List, Optional, Iterable, Set
+
+from plurals import word_forms
+
+logger = logging.getLogger(__name__)
+
+# Bundled lists of words elementary students use, one per line ('#' lines are skipped)
+DEFAULT_WORDLISTS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'words.txt'),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'word_commonality.txt'),
+]
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class SpellChecker:
+    """Offline spelling checks against a sorted word list, answering membership with bisect"""
+
+    def __init__(self, words: Iterable[str]):
+        started = time.perf_counter()
+
+        self.words: List[str] = sorted({word.strip().lower() for word in words if word.strip()})
+
+        self.load_seconds = time.perf_counter() - started
+        self.memory_bytes = sys.getsizeof(self.words) + sum(sys.getsizeof(word) for word in self.words)
+
+
+    @classmethod
+    def load(cls, paths: Optional[List[str]] = None) -> "SpellChecker":
+        """Build a checker from word list files, skipping any that don't exist"""
+
+        started = time.perf_counter()
+
+        if paths is None:
+            paths = list(DEFAULT_WORDLISTS)
+            # Extra word lists, e.g. /usr/share/dict/words, separated by os.pathsep
+            paths.extend(path for path in os.environ.get('SPELLING_WORDLIST', '').split(os.pathsep) if path)
+
+        words = []
+        for path in paths:
+            if not os.path.exists(path):
+                logger.warning("Word list not found, skipping: %s", path)
+                continue
+
+            with open(path, encoding='utf-8') as wordFile:
+                words.extend(line for line in wordFile if not line.startswith('#'))
+
+        checker = cls(words)
+        checker.load_seconds = time.perf_counter() - started
+
+        logger.info("Loaded %d words in %.1fms (%.0f KiB)", len(checker.words), checker.load_seconds * 1000,
+                    checker.memory_bytes / 1024)
+
+        return checker
+
+
+    def contains(self, word: str) -> bool:
+        """Exact membership test on an already lowercased word"""
+
+        index = bisect_left(self.words, word)
+        return index < len(self.words) and self.words[index] == word
+
+
+    def is_known(self, word: str) -> bool:
+        """True when the word, or its singular for regular plurals, is in the dictionary"""
+
+        word = word.strip().lower()
+        if not word:
+            return False
+
+        # Plurals like dogs/boxes/berries aren't listed separately
+        return any(self.contains(form) for form in word_forms(word))
+
+
+    @staticmethod
+    def edits(word: str) -> Set[str]:
+        """Every string one delete, transpose, replace or insert away from word"""
+
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        deletes = [left + right[1:] for left, right in splits if right]
+        transposes = [left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1]
+        replaces = [left + letter + right[1:] for left, right in splits if right for letter in ALPHABET]
+        inserts = [left + letter + right for left, right in splits for letter in ALPHABET]
+
+        return set(deletes + transposes + replaces + inserts)
+
+
+    def suggest(self, word: str, max_distance: int = 1, limit: int = 5) -> List[str]:
+        """Dictionary words within max_distance edits (1 or 2), closest first"""
+
+        word = word.strip().lower()
+        if self.contains(word):
+            return [word]
+
+        firstEdits = self.edits(word)
+        suggestions = sorted(candidate for candidate in firstEdits if self.contains(candidate))
+
+        if max_distance >= 2 and len(suggestions) < limit:
+            secondEdits = {candidate for edit in firstEdits for candidate in self.edits(edit)}
+            suggestions.extend(sorted(candidate for candidate in secondEdits - firstEdits
+                                      if candidate != word and self.contains(candidate)))
+
+        return suggestions[:limit]
@@ -0,0 +1,195 @@
+import argparse
+import json
+import re
+import sqlite3
+from typing import Dict, Any, List, Tuple, Sequence
+
+import numpy as np
+
+# Letter patterns the complexity rubric asks about, matched on whole batches of words at once
+SILENT_START = ("kn", "wr", "gn", "ps", "pn", "rh", "wh")
+SILENT_ANYWHERE = ("gh", "mb", "bt", "lk", "lm", "stle", "sci", "sce", "mn")
+UNUSUAL = ("ph", "ough", "augh", "eigh", "eau", "que", "qu", "cc", "x", "z", "aire", "ei", "ie", "ch")
+TRICKY_ENDINGS = ("tion", "sion", "ous", "ance", "ence", "able", "ible", "ary", "ery", "cy", "ure")
+
+FEATURE_NAMES = ("length", "doubles", "silent", "unusual", "vowel_pairs", "endings", "y_vowel")
+
+# Hand tuned against the rubric examples, recalibrate with `python spelling_complexity.py`
+DEFAULT_WEIGHTS = np.array([0.3, 0.9, 1.2, 0.8, 0.5, 0.9, 1.0])
+DEFAULT_BIAS = -0.2
+
+VOWELS = np.frombuffer(b"aeiou", dtype=np.uint8)
+
+
+class SpellingComplexityScorer:
+    """Scores spelling complexity on the rubric's 1-7 scale from orthographic features of the word"""
+
+    def __init__(self, weights: Sequence[float] = DEFAULT_WEIGHTS, bias: float = DEFAULT_BIAS):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+
+
+    @staticmethod
+    def encode(words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Lowercase letters only, packed into a zero padded (words x letters) uint8 matrix"""
+
+        cleaned = [re.sub(r'[^a-z]', '', word.lower()).encode('ascii') for word in words]
+        lengths = np.array([len(word) for word in cleaned], dtype=np.int64)
+
+        width = max(int(lengths.max(initial=0)), 1)
+        letters = np.zeros((len(cleaned), width), dtype=np.uint8)
+        for row, word in enumerate(cleaned):
+            letters[row, :len(word)] = np.frombuffer(word, dtype=np.uint8)
+
+        return letters, lengths
+
+
+    @staticmethod
+    def match(letters: np.ndarray, pattern: str) -> np.ndarray:
+        """Boolean (words x positions) matrix of where pattern starts"""
+
+        size = len(pattern)
+        positions = letters.shape[1] - size + 1
+        if positions <= 0:
+            return np.zeros((letters.shape[0], 0), dtype=bool)
+
+        found = np.ones((letters.shape[0], positions), dtype=bool)
+        for offset, letter in enumerate(pattern.encode('ascii')):
+            found &= letters[:, offset:offset + positions] == letter
+
+        return found
+
+
+    def count(self, letters: np.ndarray, patterns: Sequence[str]) -> np.ndarray:
+        total = np.zeros(letters.shape[0], dtype=np.int64)
+        for pattern in patterns:
+            total += self.match(letters, pattern).sum(axis=1)
+        return total
+
+
+    def starts_with(self, letters: np.ndarray, patterns: Sequence[str]) -> np.ndarray:
+        total = np.zeros(letters.shape[0], dtype=np.int64)
+        for pattern in patterns:
+            found = self.match(letters, pattern)
+            if found.shape[1]:
+                total += found[:, 0]
+        return total
+
+
+    def ends_with(self, letters: np.ndarray, lengths: np.ndarray, patterns: Sequence[str]) -> np.ndarray:
+        rows = np.arange(letters.shape[0])
+        total = np.zeros(letters.shape[0], dtype=np.int64)
+        for pattern in patterns:
+            found = self.match(letters, pattern)
+            starts = lengths - len(pattern)
+            valid = (starts >= 0) & (starts < found.shape[1])
+            total[valid] += found[rows[valid], starts[valid]]
+        return total
+
+
+    def features(self, words: Sequence[str]) -> np.ndarray:
+        """(words x FEATURE_NAMES) feature matrix for a whole batch"""
+
+        letters, lengths = self.encode(words)
+
+        filled = letters != 0
+        isVowel = np.isin(letters, VOWELS)
+
+        doubles = ((letters[:, 1:] == letters[:, :-1]) & filled[:, 1:]).sum(axis=1)
+        vowelPairs = (isVowel[:, 1:] & isVowel[:, :-1]).sum(axis=1)
+
+        # 'y' used as a vowel between two consonants, like rhythm or myth
+        isConsonant = filled & ~isVowel & (letters != ord('y'))
+        yVowel = ((letters[:, 1:-1] == ord('y')) & isConsonant[:, :-2] & isConsonant[:, 2:]).sum(axis=1) \
+            if letters.shape[1] > 2 else np.zeros(len(words), dtype=np.int64)
+
+        silent = self.starts_with(letters, SILENT_START) + self.count(letters, SILENT_ANYWHERE)
+        unusual = self.count(letters, UNUSUAL)
+        endings = self.ends_with(letters, lengths, TRICKY_ENDINGS)
+
+        return np.column_stack([lengths, doubles, silent, unusual, vowelPairs, endings, yVowel]).astype(np.float64)
+
+
+    def raw_scores(self, words: Sequence[str]) -> np.ndarray:
+        return self.features(words) @ self.weights + self.bias
+
+
+    def score_words(self, words: Sequence[str]) -> List[int]:
+        """Spelling complexity from 1-7 for every word, in order"""
+
+        if not words:
+            return []
+
+        return np.clip(np.rint(self.raw_scores(words)), 1, 7).astype(int).tolist()
+
+
+    def fit(self, words: Sequence[str], targets: Sequence[float]):
+        """Least squares fit of weights and bias to recorded LLM scores"""
+
+        features = self.features(words)
+        design = np.column_stack([features, np.ones(len(words))])
+        solution, *_ = np.linalg.lstsq(design, np.asarray(targets, dtype=np.float64), rcond=None)
+
+        self.weights = solution[:-1]
+        self.bias = float(solution[-1])
+
+
+def agreement(predicted: Sequence[float], recorded: Sequence[float]) -> Dict[str, Any]:
+    """How close local scores are to recorded LLM scores"""
+
+    predicted = np.asarray(predicted, dtype=np.float64)
+    recorded = np.asarray(recorded, dtype=np.float64)
+    difference = np.abs(predicted - recorded)
+
+    correlation = 0.0
+    if len(recorded) > 1 and predicted.std() > 0 and recorded.std() > 0:
+        correlation = float(np.corrcoef(predicted, recorded)[0, 1])
+
+    return {
+        'count': int(len(recorded)),
+        'mean_absolute_error': float(difference.mean()) if len(recorded) else 0.0,
+        'exact': float((difference == 0).mean()) if len(recorded) else 0.0,
+        'within_one': float((difference <= 1).mean()) if len(recorded) else 0.0,
+        'correlation': correlation,
+    }
+
+
+def load_recorded_scores(path: str) -> Tuple[List[str], List[float]]:
+    """Recorded complexity scores from a score cache SQLite file or a JSONL file of {"word", "score"}"""
+
+    if path.endswith(('.sqlite3', '.db')):
+        connection = sqlite3.connect(path)
+        rows = connection.execute("SELECT word, score FROM scores WHERE criterion = 'complexity'").fetchall()
+        connection.close()
+    else:
+        with open(path, encoding='utf-8') as recordsFile:
+            records = [json.loads(line) for line in recordsFile if line.strip()]
+        rows = [(record['word'], record['score']) for record in records]
+
+    return [row[0] for row in rows], [float(row[1]) for row in rows]
+
+
+def calibrate(path: str, fit: bool = False) -> Dict[str, Any]:
+    """Compare the local scorer against recorded LLM scores, optionally refitting its weights"""
+
+    words, recorded = load_recorded_scores(path)
+    scorer = SpellingComplexityScorer()
+
+    report = {'default': agreement(scorer.score_words(words), recorded)}
+
+    if fit and words:
+        scorer.fit(words, recorded)
+        report['fitted'] = agreement(scorer.score_words(words), recorded)
+        report['weights'] = dict(zip(FEATURE_NAMES, scorer.weights.round(3).tolist()))
+        report['bias'] = round(scorer.bias, 3)
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Calibrate the local spelling complexity scorer against recorded LLM scores")
+    parser.add_argument('records', help="score cache .sqlite3 file or JSONL with {\"word\", \"score\"} per line")
+    parser.add_argument('--fit', action='store_true', help="also refit the feature weights by least squares")
+    args = parser.parse_args()
+
+    print(json.dumps(calibrate(args.records, fit=args.fit), indent=2))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The AI modules are flat files imported by name, as when running from AI/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,105 @@
+import pytest
+
+from Word_Assesment import Word_Assesment
+from answer_index import AnswerIndex, AnswerIndexStore, normalize_word
+from fake_llm import FakeChatModel
+from llm_stats import LLMCallStats
+
+PROMPT = "Things at the beach"
+
+
+@pytest.fixture
+def index():
+    return AnswerIndex({"Bus": 9.0, "hero": 8.0, "Dolphins": 14.0, "berry": 5.0, "horse": 4.0, "shell": 12.0,
+                        "shells": 13.0})
+
+
+@pytest.mark.parametrize("word, score", [("bus", 9.0), ("buses", 9.0), ("heroes", 8.0), ("dolphin", 14.0),
+                                         ("Dolphin's", 14.0), ("berries", 5.0), ("horses", 4.0), ("shell", 13.0)])
+def test_plurals_and_singulars_meet(index, word, score):
+    assert index.lookup(word) == score
+
+
+@pytest.mark.parametrize("word", ["buss", "berrys", "boat", ""])
+def test_other_words_miss(index, word):
+    assert index.lookup(word) is None
+
+
+def test_ranked_keeps_answers_as_given(index):
+    assert index.ranked()[0] == ("dolphins", 14.0)
+    assert len(index) == 7
+    assert normalize_word(" Sand-Castle ") == "sandcastle"
+
+
+def test_store_counts_hits_and_misses():
+    store = AnswerIndexStore()
+    store.put(PROMPT, AnswerIndex({"sand": 15.0}))
+
+    assert store.compatibility("Sands", "things  at the BEACH") == 15.0
+    assert store.compatibility("rocket", PROMPT) is None
+    # A prompt without an index is neither, its words go to the other scorers
+    assert store.compatibility("sand", "Things in space") is None
+
+    assert store.stats() == {'prompts': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_store_drops_least_recently_used():
+    store = AnswerIndexStore(max_prompts=2)
+    for prompt in ("first", "second"):
+        store.put(prompt, AnswerIndex({"sand": 10.0}))
+    store.get("first")
+    store.put("third", AnswerIndex({"sand": 10.0}))
+
+    assert store.get("second") is None
+    assert store.get("first") is not None
+    assert store.stats()['prompts'] == 2
+
+
+def test_generated_answers_are_indexed():
+    store = AnswerIndexStore()
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0), answer_index=store)
+
+    prompt, ranked = word_assessment.generate_prompt(word_assessment.llm, "beach", with_answers=True)
+
+    assert store.get(prompt) is not None
+    assert store.compatibility(ranked[0][0] + "s", prompt) == ranked[0][1]
+
+
+@pytest.mark.parametrize("reply", ["not json", '{"answers": []}', '{"prompt": "  ", "answers": []}', '["prompt"]'])
+def test_unparseable_answers_reply(reply):
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0), call_stats=stats)
+
+    assert word_assessment.parse_prompt_answers(reply) == (None, {})
+    assert stats.stats()['answers']['parse_failures'] == 1
+
+
+def test_answers_out_of_range_are_dropped():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+
+    prompt, answers = word_assessment.parse_prompt_answers(
+        '{"prompt": "Things at the beach", "answers": [{"word": "sand", "score": 14}, {"word": "moon", "score": 40},'
+        ' {"word": 7, "score": 9}, "crab"]}')
+
+    assert prompt == "Things at the beach"
+    assert answers == {"sand": 14.0}
+
+
+def test_prompt_falls_back_when_answers_reply_fails():
+    store = AnswerIndexStore()
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0, malformed_rate=1.0), answer_index=store)
+
+    prompt, ranked = word_assessment.generate_prompt(word_assessment.llm, "beach", with_answers=True)
+
+    assert prompt
+    assert ranked == []
+    assert store.stats()['prompts'] == 0
+
+
+def test_estimate_matches_plural_in_prompt():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+
+    inPrompt = word_assessment.estimate_compatibility("bus", 1, "Things you see on buses")['score']
+    notInPrompt = word_assessment.estimate_compatibility("buss", 1, "Things you see on buses")['score']
+
+    assert inPrompt > notInPrompt
@@ -0,0 +1,52 @@
+import importlib
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    os.environ['SCORE_CACHE_PATH'] = str(tmp_path_factory.mktemp("cache") / "score_cache.sqlite3")
+    return importlib.import_module("api")
+
+
+def test_import_starts_no_warmup(api):
+    assert "llm-warmup" not in [thread.name for thread in threading.enumerate()]
+    assert not api.background_started.is_set()
+
+
+def test_prefill_waits_for_warmup(api, monkeypatch):
+    prefilled = []
+    monkeypatch.setattr(api.prompt_pool, "prefill", prefilled.append)
+    monkeypatch.setattr(api.warmup, "ready", threading.Event())
+    api.warmup.ready.set()
+
+    api.prefill_prompt_pool()
+
+    assert prefilled == [api.PROMPT_POOL_THEMES]
+
+
+def test_prefill_after_failed_warmup(api, monkeypatch):
+    prefilled = []
+    monkeypatch.setattr(api.prompt_pool, "prefill", prefilled.append)
+    monkeypatch.setattr(api.warmup, "ready", threading.Event())
+    monkeypatch.setattr(api, "LLM_WARMUP", True)
+    monkeypatch.setattr(api, "PROMPT_POOL_PREFILL_WAIT_SECONDS", 0.05)
+
+    api.prefill_prompt_pool()
+
+    assert prefilled == [api.PROMPT_POOL_THEMES]
+
+
+def test_prefill_without_warmup(api, monkeypatch):
+    prefilled = []
+    monkeypatch.setattr(api.prompt_pool, "prefill", prefilled.append)
+    monkeypatch.setattr(api, "LLM_WARMUP", False)
+    monkeypatch.setattr(api, "background_started", threading.Event())
+
+    api.start_background()
+    api.start_background()
+
+    assert prefilled == [api.PROMPT_POOL_THEMES]
+    assert "llm-warmup" not in [thread.name for thread in threading.enumerate()]
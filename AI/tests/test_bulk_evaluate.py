@@ -0,0 +1,122 @@
+import io
+import json
+import threading
+import time
+
+from bulk_evaluate import bulk_evaluate, checkpoint, score_row
+from Word_Assesment import Word_Assesment
+from fake_llm import FakeChatModel
+
+
+def fake_score(line):
+    """Scores a row after the delay it asks for, so later rows can finish first"""
+
+    data = json.loads(line)
+    time.sleep(data.get('delay', 0))
+    if data.get('fail'):
+        return {'id': data['id'], 'error': "Failed to evaluate words: boom"}
+    return {'id': data['id'], 'result': data['id'] * 10}
+
+
+def rows(*rowData):
+    return [json.dumps(data) + "\n" for data in rowData]
+
+
+def written(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_rows_written_in_input_order_when_finished_out_of_order():
+    output = io.StringIO()
+    finished = []
+    lock = threading.Lock()
+
+    def score(line):
+        result = fake_score(line)
+        with lock:
+            finished.append(result['id'])
+        return result
+
+    summary = bulk_evaluate(iter(rows({'id': 0, 'delay': 0.2}, {'id': 1, 'delay': 0.1}, {'id': 2}, {'id': 3})),
+                            score, output, workers=4)
+
+    assert finished[-1] == 0
+    assert [row['row'] for row in written(output)] == [0, 1, 2, 3]
+    assert [row['result'] for row in written(output)] == [0, 10, 20, 30]
+    assert summary['rows'] == 4
+    assert summary['errors'] == 0
+
+
+def test_window_bounds_rows_in_flight():
+    output = io.StringIO()
+    inFlight = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def score(line):
+        with lock:
+            inFlight.append(line)
+            peak[0] = max(peak[0], len(inFlight))
+        time.sleep(0.01)
+        with lock:
+            inFlight.remove(line)
+        return fake_score(line)
+
+    bulk_evaluate(iter(rows(*({'id': index} for index in range(20)))), score, output, workers=4, window=2)
+
+    assert peak[0] <= 2
+    assert len(written(output)) == 20
+
+
+def test_errors_are_written_and_counted():
+    output = io.StringIO()
+
+    summary = bulk_evaluate(iter(rows({'id': 0}, {'id': 1, 'fail': True})), fake_score, output, workers=2)
+
+    assert summary['errors'] == 1
+    assert "error" in written(output)[1]
+
+
+def test_checkpoint_drops_half_written_line(tmp_path):
+    path = tmp_path / "scored.jsonl"
+    path.write_bytes(b'{"row": 0, "result": 0}\n{"row": 1, "result": 10}\n{"row": 2, "res')
+
+    assert checkpoint(str(path)) == 2
+    assert path.read_bytes() == b'{"row": 0, "result": 0}\n{"row": 1, "result": 10}\n'
+
+
+def test_checkpoint_without_output(tmp_path):
+    assert checkpoint(str(tmp_path / "missing.jsonl")) == 0
+
+
+def test_resume_skips_rows_already_written(tmp_path):
+    path = tmp_path / "scored.jsonl"
+    path.write_text('{"row": 0, "id": 0, "result": 0}\n{"row": 1, "id": 1, "result": 10}\n{"row": 2, "id"',
+                    encoding='utf-8')
+    inputRows = rows(*({'id': index} for index in range(5)))
+    scored = []
+
+    def score(line):
+        scored.append(json.loads(line)['id'])
+        return fake_score(line)
+
+    firstRow = checkpoint(str(path))
+    output = io.StringIO(path.read_text(encoding='utf-8'))
+    output.seek(0, io.SEEK_END)
+    summary = bulk_evaluate(iter(inputRows[firstRow:]), score, output, workers=2, first_row=firstRow)
+
+    assert sorted(scored) == [2, 3, 4]
+    assert summary['skipped'] == 2
+    assert [row['row'] for row in written(output)] == [0, 1, 2, 3, 4]
+    assert [row['id'] for row in written(output)] == [0, 1, 2, 3, 4]
+
+
+def test_score_row_rejects_invalid_rounds():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+
+    assert score_row(word_assessment, "not json")['error'].startswith("Invalid round")
+    assert score_row(word_assessment, '{"prompt": "Beach", "player_words": {}}')['error'].startswith("Invalid round")
+
+    scored = score_row(word_assessment, '{"id": "r1", "prompt": "Beach", "player_words": {"1": "sand"}}')
+    assert scored['id'] == "r1"
+    assert scored['result']['winners'] == ["Player 1"]
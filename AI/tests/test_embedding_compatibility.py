@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from Word_Assesment import Word_Assesment
+from embedding_compatibility import EmbeddingCompatibilityScorer, HashingEmbedder
+from fake_llm import FakeChatModel
+from llm_stats import LLMCallStats
+
+PROMPT = "Things at the beach"
+WORDS = {'1': "beach", '2': "rocket"}
+
+
+class FailingEmbedder:
+    """An Ollama embedding model that can't be reached"""
+
+    model = "unreachable"
+
+    def embed_documents(self, texts):
+        raise ConnectionError("connection refused")
+
+    def embed_query(self, text):
+        raise ConnectionError("connection refused")
+
+
+class HangingEmbedder:
+    model = "hanging"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def embed_documents(self, texts):
+        self.release.wait(5)
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        self.release.wait(5)
+        return [1.0, 0.0]
+
+
+def test_hashing_scores_prompt_words_high():
+    scorer = EmbeddingCompatibilityScorer(HashingEmbedder())
+
+    beach, rocket = scorer.score_words(["Beaches", "rocket"], PROMPT)
+
+    assert beach == 15.0
+    assert rocket == 1.0
+    assert scorer.stats()['words'] == 2
+
+
+@pytest.mark.parametrize("scoring_mode", ["together", "separately", "batch"])
+def test_failing_embedder_falls_back(scoring_mode):
+    llm = FakeChatModel(latency=0.0)
+    scorer = EmbeddingCompatibilityScorer(FailingEmbedder())
+    word_assessment = Word_Assesment(llm, scoring_mode=scoring_mode, compatibility_scorer=scorer,
+                                     call_stats=LLMCallStats(), deadline_seconds=5.0)
+
+    result = word_assessment.evaluate_words(llm, PROMPT, dict(WORDS))
+
+    assert len(result['playerScores']) == 2
+    assert not result['degraded']
+    assert scorer.stats()['failures'] > 0
+
+
+def test_failing_embedder_keeps_estimates_working():
+    llm = FakeChatModel(latency=0.0)
+    word_assessment = Word_Assesment(llm, compatibility_scorer=EmbeddingCompatibilityScorer(FailingEmbedder()))
+
+    assert word_assessment.known_compatibility("beach", PROMPT) is None
+    assert word_assessment.estimate_compatibility("beach", 1, PROMPT)['score'] > 0
+
+
+def test_separately_mode_asks_llm_when_embedder_fails():
+    llm = FakeChatModel(latency=0.0)
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(llm, scoring_mode="separately", call_stats=stats,
+                                     compatibility_scorer=EmbeddingCompatibilityScorer(FailingEmbedder()))
+
+    word_assessment.evaluate_words(llm, PROMPT, dict(WORDS))
+
+    assert stats.stats()['compatibility']['calls'] == 2
+
+
+def test_hanging_embedder_times_out():
+    embedder = HangingEmbedder()
+    llm = FakeChatModel(latency=0.0)
+    word_assessment = Word_Assesment(llm, compatibility_scorer=EmbeddingCompatibilityScorer(embedder, timeout_seconds=0.2))
+
+    started = time.monotonic()
+    try:
+        assert word_assessment.known_compatibilities(["beach", "rocket"], PROMPT) == [None, None]
+    finally:
+        embedder.release.set()
+
+    assert time.monotonic() - started < 1.0
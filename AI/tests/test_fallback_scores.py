@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from Word_Assesment import Word_Assesment, DEFAULT_SCORE
+from fake_llm import FakeChatModel
+from llm_stats import LLMCallStats
+
+PROMPT = "Things at the beach"
+WORDS = {1: "sand", 2: "lighthouse"}
+
+
+class OutOfRangeModel:
+    """Replies with a well-formed score no rubric allows"""
+
+    model = "out-of-range"
+
+    def invoke(self, prompt, **kwargs):
+        return SimpleNamespace(content='{"id": 1, "score": 99}', usage_metadata={}, response_metadata={})
+
+    async def ainvoke(self, prompt, **kwargs):
+        return self.invoke(prompt, **kwargs)
+
+
+def garbled(mode, **kwargs):
+    return Word_Assesment(FakeChatModel(latency=0.0, malformed_rate=1.0), scoring_mode=mode, call_stats=LLMCallStats(),
+                          **kwargs)
+
+
+@pytest.mark.parametrize("mode", ["together", "batch"])
+def test_unusable_combined_reply_is_estimated(mode):
+    word_assessment = garbled(mode)
+
+    result = word_assessment.evaluate_words(word_assessment.llm, PROMPT, WORDS)
+
+    assert sorted(result['degraded']) == [1, 2]
+    for playerScore in result['playerScores']:
+        assert playerScore['degraded'] == ["combined"]
+        assert playerScore['total'] == word_assessment.estimate_combined(playerScore['word'], 1, PROMPT)['score']
+    assert word_assessment.call_stats.stats()['combined']['fallbacks'] == 2
+
+
+def test_unusable_criterion_replies_are_estimated():
+    word_assessment = garbled("separately")
+
+    result = word_assessment.evaluate_words(word_assessment.llm, PROMPT, {1: "lighthouse"})
+
+    playerScore = result['playerScores'][0]
+    assert playerScore['degraded'] == ["commonality", "complexity", "compatibility"]
+    assert playerScore['commonality'] == word_assessment.estimate_commonality("lighthouse", 1)['score']
+    assert playerScore['compatability'] == word_assessment.estimate_compatibility("lighthouse", 1, PROMPT)['score']
+
+
+def test_async_unusable_reply_is_estimated():
+    word_assessment = garbled("together")
+
+    result = asyncio.run(word_assessment.aevaluate_words(word_assessment.llm, PROMPT, WORDS))
+
+    assert sorted(result['degraded']) == [1, 2]
+
+
+def test_out_of_range_score_in_fast_mode_is_estimated():
+    word_assessment = Word_Assesment(OutOfRangeModel(), fast_mode=True)
+
+    score = word_assessment.score_word_commonality(word_assessment.llm, "lighthouse", 1)
+
+    assert score['degraded'] is True
+    assert score['score'] != DEFAULT_SCORE
+    assert 1 <= score['score'] <= 10
+
+
+def test_usable_replies_are_not_degraded():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0), scoring_mode="separately")
+
+    result = word_assessment.evaluate_words(word_assessment.llm, PROMPT, WORDS)
+
+    assert result['degraded'] == []
@@ -0,0 +1,86 @@
+import time
+
+from Word_Assesment import Word_Assesment
+from fake_llm import FakeChatModel
+
+PROMPT = "Things at the beach"
+WORDS = ["sand", "Shell", "wave ", "crab", "towel"]
+
+
+def lobby(players):
+    return {str(player_id): WORDS[player_id % len(WORDS)] for player_id in range(players)}
+
+
+def test_same_word_scored_once_and_shared():
+    llm = FakeChatModel(latency=0.0)
+    word_assessment = Word_Assesment(llm, large_lobby_players=3)
+    batches = []
+    scoreBatch = word_assessment.calculate_total_score_batched
+
+    def record(llm, batch, prompt):
+        batches.append(sorted(batch.values()))
+        return scoreBatch(llm, batch, prompt)
+
+    word_assessment.calculate_total_score_batched = record
+    result = word_assessment.evaluate_words(llm, PROMPT, {'1': "Dog ", '2': "dog", '3': "cat"})
+
+    assert batches == [["cat", "dog"]]
+    assert result['unique_words'] == 2
+    first, second, third = result['playerScores']
+    assert first['total'] == second['total']
+    assert (first['word'], second['word']) == ("Dog ", "dog")
+
+
+def test_unique_words_and_leaderboard_size():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+
+    result = word_assessment.evaluate_large_lobby(word_assessment.llm, PROMPT, lobby(60), leaderboard_size=4)
+
+    assert result['unique_words'] == len(WORDS)
+    assert len(result['playerScores']) == 60
+    assert len(result['leaderboard']) == 4
+    totals = [score['total'] for score in result['leaderboard']]
+    assert totals == sorted(totals, reverse=True)
+    assert totals[0] == max(score['total'] for score in result['playerScores'])
+
+
+def test_player_scores_stay_in_submission_order():
+    words = lobby(30)
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+
+    result = word_assessment.evaluate_large_lobby(word_assessment.llm, PROMPT, words)
+
+    assert [score['id'] for score in result['playerScores']] == list(words)
+    assert [score['word'] for score in result['playerScores']] == list(words.values())
+
+
+def test_tied_winner_first_in_leaderboard():
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0))
+    playerScores = [
+        {'id': 1, 'word': "sun", 'total': 5.0, 'compatability': 1.0, 'complexity': 1.0, 'commonality': 1.0},
+        {'id': 2, 'word': "wave", 'total': 20.0, 'compatability': 5.0, 'complexity': 5.0, 'commonality': 5.0},
+        {'id': 3, 'word': "sand", 'total': 20.0, 'compatability': 8.0, 'complexity': 4.0, 'commonality': 4.0},
+        {'id': 4, 'word': "crab", 'total': 12.0, 'compatability': 4.0, 'complexity': 4.0, 'commonality': 2.0},
+    ]
+
+    result = word_assessment.rank_large_lobby(word_assessment.llm, PROMPT, playerScores, leaderboard_size=3)
+
+    assert result['winners'] == ["Player 3"]
+    assert result['tie_break'] == "compatibility"
+    assert [score['id'] for score in result['leaderboard']] == [3, 2, 4]
+    # Only the leaderboard is sorted
+    assert [score['id'] for score in result['playerScores']] == [1, 2, 3, 4]
+
+
+def test_missed_deadline_degrades_every_player():
+    words = lobby(40)
+    llm = FakeChatModel(latency=2.0)
+    word_assessment = Word_Assesment(llm)
+
+    started = time.monotonic()
+    result = word_assessment.evaluate_large_lobby(llm, PROMPT, words, deadline_seconds=0.2)
+
+    assert time.monotonic() - started < 1.0
+    assert sorted(result['degraded']) == sorted(words)
+    assert all(score['degraded'] == ["combined"] for score in result['playerScores'])
+    assert result['leaderboard']
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+
+import pytest
+
+from fake_llm import FakeChatModel
+from fake_ollama import serve
+from llm_pool import LLMBackend, LLMPool, ollama_health_check
+
+
+class StubLLM:
+    """An endpoint that answers with its name, fails while down and can be held mid-call"""
+
+    def __init__(self, name):
+        self.model = "stub"
+        self.name = name
+        self.down = False
+        self.calls = 0
+        self.hold = None
+        self.entered = threading.Event()
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError(f"{self.name} refused the connection")
+        if self.hold is not None:
+            self.entered.set()
+            self.hold.wait(5)
+        return self.name
+
+    async def ainvoke(self, prompt, **kwargs):
+        return self.invoke(prompt, **kwargs)
+
+    def healthy(self):
+        return not self.down
+
+
+def stub_pool(*names):
+    stubs = [StubLLM(name) for name in names]
+    pool = LLMPool([LLMBackend(stub.name, stub, health_check=stub.healthy) for stub in stubs],
+                   health_check_seconds=3600)
+    return pool, stubs
+
+
+def test_least_outstanding_backend_gets_the_call():
+    pool, (first, second, third) = stub_pool("first", "second", "third")
+    release = threading.Event()
+    first.hold = second.hold = release
+
+    threads = [threading.Thread(target=pool.invoke, args=("prompt",)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    first.entered.wait(5)
+    second.entered.wait(5)
+
+    # The two held calls went to two different endpoints, the next one goes to the idle third
+    assert pool.invoke("prompt") == "third"
+    assert [backend['outstanding'] for backend in pool.stats()['backends']] == [1, 1, 0]
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert [backend['outstanding'] for backend in pool.stats()['backends']] == [0, 0, 0]
+    pool.close()
+
+
+def test_calls_spread_evenly_when_idle():
+    pool, stubs = stub_pool("first", "second")
+
+    for _ in range(4):
+        pool.invoke("prompt")
+
+    assert [stub.calls for stub in stubs] == [2, 2]
+    assert [backend['share'] for backend in pool.stats()['backends']] == [0.5, 0.5]
+    pool.close()
+
+
+def test_failing_backend_is_ejected_and_call_retried():
+    pool, (first, second) = stub_pool("first", "second")
+    first.down = True
+
+    assert pool.invoke("prompt") == "second"
+    assert asyncio.run(pool.ainvoke("prompt")) == "second"
+
+    stats = pool.stats()
+    assert stats['healthy'] == 1
+    assert stats['backends'][0]['healthy'] is False
+    assert "refused" in stats['backends'][0]['last_error']
+    # Out of rotation, so the ejected endpoint isn't asked again
+    assert first.calls == 1
+    pool.close()
+
+
+def test_every_backend_failing_raises():
+    pool, stubs = stub_pool("first", "second")
+    for stub in stubs:
+        stub.down = True
+
+    with pytest.raises(RuntimeError, match="Every LLM backend failed"):
+        pool.invoke("prompt")
+    pool.close()
+
+
+def test_health_check_brings_backend_back():
+    pool, (first, second) = stub_pool("first", "second")
+    first.down = True
+    pool.invoke("prompt")
+
+    pool.check()
+    assert pool.stats()['healthy'] == 1
+
+    first.down = False
+    pool.check()
+
+    assert pool.stats()['healthy'] == 2
+    assert {pool.invoke("prompt") for _ in range(2)} == {"first", "second"}
+    pool.close()
+
+
+def test_ollama_endpoints_leave_and_rejoin():
+    servers = [serve(llm=FakeChatModel(latency=0.0)) for _ in range(2)]
+    pool = LLMPool.from_endpoints("qwen3:0.6b", [server.url for server in servers], health_check_seconds=3600)
+    try:
+        servers[0].healthy = False
+        for _ in range(3):
+            assert pool.invoke("Reply with OK.").content
+
+        assert [backend['healthy'] for backend in pool.stats()['backends']] == [False, True]
+        assert ollama_health_check(servers[0].url)() is False
+
+        servers[0].healthy = True
+        pool.check()
+
+        assert pool.stats()['healthy'] == 2
+        assert ollama_health_check(servers[0].url)() is True
+    finally:
+        pool.close()
+        for server in servers:
+            server.shutdown()
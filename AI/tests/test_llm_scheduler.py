@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import threading
+
+import pytest
+
+from bulk_evaluate import create_word_assessment
+from fake_llm import FakeChatModel
+from llm_scheduler import LLMScheduler, SchedulerFull, INTERACTIVE, BACKGROUND, BULK
+from model_warmup import ModelWarmup
+
+
+def test_lanes_served_in_priority_order():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    assert scheduler.enter(INTERACTIVE) is None
+
+    bulk = scheduler.enter(BULK)
+    background = scheduler.enter(BACKGROUND)
+    interactive = scheduler.enter(INTERACTIVE)
+    interactiveLater = scheduler.enter(INTERACTIVE)
+
+    served = []
+    for _ in range(4):
+        scheduler.leave(INTERACTIVE, 0.0)
+        served += [name for name, waiter in (('bulk', bulk), ('background', background), ('interactive', interactive),
+                                              ('interactive later', interactiveLater))
+                   if waiter.granted and name not in served]
+
+    assert served == ['interactive', 'interactive later', 'background', 'bulk']
+
+
+def test_queued_urgent_call_is_not_overtaken():
+    scheduler = LLMScheduler(max_concurrency=2, reserved_interactive=1)
+    assert scheduler.enter(INTERACTIVE) is None
+    assert scheduler.enter(INTERACTIVE) is None
+    waiting = scheduler.enter(INTERACTIVE)
+
+    scheduler.leave(INTERACTIVE, 0.0)
+
+    assert waiting.granted
+    assert scheduler.enter(BACKGROUND) is not None
+
+
+def test_reserved_interactive_slot():
+    scheduler = LLMScheduler(max_concurrency=2, reserved_interactive=1)
+
+    assert scheduler.enter(BACKGROUND) is None
+    background = scheduler.enter(BULK)
+    assert background is not None
+    assert scheduler.enter(INTERACTIVE) is None
+
+    assert scheduler.stats()['running'] == 2
+    assert scheduler.stats()['lanes'][BULK]['waiting'] == 1
+
+
+def test_abandon_queued_waiter():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    assert scheduler.enter(INTERACTIVE) is None
+    waiter = scheduler.enter(BACKGROUND)
+
+    scheduler.abandon(waiter)
+    scheduler.leave(INTERACTIVE, 0.0)
+
+    assert not waiter.granted
+    assert scheduler.stats()['waiting'] == 0
+    assert scheduler.stats()['running'] == 0
+
+
+def test_abandon_granted_waiter_returns_slot():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    assert scheduler.enter(INTERACTIVE) is None
+    waiter = scheduler.enter(INTERACTIVE)
+    scheduler.leave(INTERACTIVE, 0.0)
+    assert waiter.granted
+
+    scheduler.abandon(waiter)
+
+    assert scheduler.stats()['running'] == 0
+
+
+def test_cancelled_aslot_leaves_the_queue():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+
+    async def main():
+        async with scheduler.aslot(INTERACTIVE):
+            task = asyncio.create_task(scheduler.aslot(INTERACTIVE).__aenter__())
+            await asyncio.sleep(0.01)
+            assert scheduler.stats()['waiting'] == 1
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(main())
+
+    assert scheduler.stats()['waiting'] == 0
+    assert scheduler.stats()['running'] == 0
+
+
+def test_slot_hands_over_between_threads():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    order = []
+
+    def call(name):
+        with scheduler.slot(BACKGROUND):
+            order.append(name)
+
+    with scheduler.slot(INTERACTIVE):
+        thread = threading.Thread(target=call, args=("background",))
+        thread.start()
+        while scheduler.stats()['waiting'] == 0:
+            pass
+        order.append("interactive")
+    thread.join(timeout=5)
+
+    assert order == ["interactive", "background"]
+    assert scheduler.stats()['lanes'][BACKGROUND]['queued'] == 1
+
+
+def test_full_queue_rejects_with_retry_after():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=2, reserved_interactive=0)
+    with scheduler.slot(INTERACTIVE):
+        pass
+    scheduler.service_seconds = 10.0
+
+    assert scheduler.enter(INTERACTIVE) is None
+    scheduler.enter(INTERACTIVE)
+    scheduler.check(INTERACTIVE)
+    scheduler.enter(BACKGROUND)
+
+    with pytest.raises(SchedulerFull) as error:
+        scheduler.check(INTERACTIVE)
+
+    assert error.value.retry_after == 20
+    assert scheduler.stats()['lanes'][INTERACTIVE]['rejected'] == 1
+
+
+def test_admitted_calls_still_queue_when_full():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1, reserved_interactive=0)
+    assert scheduler.enter(INTERACTIVE) is None
+    scheduler.enter(INTERACTIVE)
+
+    assert scheduler.enter(INTERACTIVE) is not None
+    assert scheduler.stats()['waiting'] == 2
+
+
+def test_warmup_pings_take_background_slots():
+    scheduler = LLMScheduler(max_concurrency=2)
+    warmup = ModelWarmup(FakeChatModel(latency=0.0), scheduler=scheduler)
+
+    assert warmup.warm_up()
+
+    assert scheduler.stats()['lanes'][BACKGROUND]['admitted'] == 3
+    assert scheduler.stats()['lanes'][INTERACTIVE]['admitted'] == 0
+
+
+def test_bulk_evaluate_scores_in_bulk_lane():
+    args = argparse.Namespace(fake=True, concurrency=4, mode="together", cache=None, fast=False, llm_concurrency=2)
+    word_assessment = create_word_assessment(args)
+
+    word_assessment.evaluate_words(word_assessment.llm, "Things at the beach", {'1': "sand", '2': "shell"})
+
+    lanes = word_assessment.scheduler.stats()['lanes']
+    assert lanes[BULK]['admitted'] > 0
+    assert lanes[INTERACTIVE]['admitted'] == lanes[BACKGROUND]['admitted'] == 0
+    assert word_assessment.scheduler.max_concurrency == 2
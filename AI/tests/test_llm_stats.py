@@ -0,0 +1,39 @@
+from llm_stats import LLMCallStats, METRIC_PREFIX, prometheus_gauges
+
+
+def test_flat_numbers_become_gauges():
+    text = prometheus_gauges("score_cache", {'hits': 3, 'hit_rate': 0.5, 'ready': True, 'model': "qwen3"})
+
+    assert f"{METRIC_PREFIX}_score_cache_hits 3" in text
+    assert f"{METRIC_PREFIX}_score_cache_hit_rate 0.5" in text
+    assert "ready" not in text
+    assert "model" not in text
+
+
+def test_nested_dicts_become_labelled_gauges():
+    text = prometheus_gauges("prompt_pool", {'depth': {'': 2, 'nature': 5, 'say "hi"': 1}, 'hits': 1},
+                             labels={'depth': 'theme'})
+
+    name = f"{METRIC_PREFIX}_prompt_pool_depth"
+    assert text.count(f"# TYPE {name} gauge") == 1
+    assert f'{name}{{theme=""}} 2' in text
+    assert f'{name}{{theme="nature"}} 5' in text
+    assert f'{name}{{theme="say \\"hi\\""}} 1' in text
+
+
+def test_nested_dict_label_defaults_to_key():
+    text = prometheus_gauges("component", {'per_model': {'a': 1, 'b': "not a number"}, 'empty': {}})
+
+    assert f'{METRIC_PREFIX}_component_per_model{{key="a"}} 1' in text
+    assert 'key="b"' not in text
+    assert "empty" not in text
+
+
+def test_call_stats_prometheus():
+    stats = LLMCallStats()
+    stats.record_call("combined", 0.2, 10, 5)
+    stats.record("combined", "fallbacks")
+
+    text = stats.prometheus()
+
+    assert f'{METRIC_PREFIX}_llm_fallbacks_total{{operation="combined"}} 1' in text
@@ -0,0 +1,110 @@
+import sqlite3
+import time
+
+import pytest
+
+from Word_Assesment import Word_Assesment
+from fake_llm import FakeChatModel
+from score_cache import ScoreCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "score_cache.sqlite3")
+
+
+def test_memory_tier_hits_and_misses():
+    cache = ScoreCache()
+    cache.set("commonality", "Dog ", 3.0)
+
+    assert cache.get("commonality", "dog") == 3.0
+    assert cache.get("commonality", "cat") is None
+
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses'], stats['writes']) == (1, 0, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_prompt_only_keys_prompt_dependent_criteria():
+    cache = ScoreCache()
+    cache.set("compatibility", "sand", 9.0, "Things at the  BEACH")
+    cache.set("commonality", "sand", 4.0, "Things at the beach")
+
+    assert cache.get("compatibility", "sand", "things at the beach") == 9.0
+    assert cache.get("compatibility", "sand", "Things in space") is None
+    assert cache.get("commonality", "sand", "Things in space") == 4.0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ScoreCache(max_entries=2)
+    cache.set("commonality", "a", 1.0)
+    cache.set("commonality", "b", 2.0)
+    cache.get("commonality", "a")
+    cache.set("commonality", "c", 3.0)
+
+    assert cache.get("commonality", "b") is None
+    assert cache.get("commonality", "a") == 1.0
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['memory_entries'] == 2
+
+
+def test_disk_tier_backs_evicted_entries(path):
+    cache = ScoreCache(path=path, max_entries=1)
+    cache.set("commonality", "a", 1.0)
+    cache.set("commonality", "b", 2.0)
+
+    assert cache.get("commonality", "a") == 1.0
+    assert cache.stats()['disk_hits'] == 1
+    # The disk hit went back into memory
+    assert cache.get("commonality", "a") == 1.0
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_ttl_expires_both_tiers(path, monkeypatch):
+    cache = ScoreCache(path=path, ttl_seconds=60)
+    cache.set("commonality", "dog", 3.0)
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.get("commonality", "dog") is None
+    assert cache.peek("commonality", "dog") is None
+    assert cache.stats()['memory_entries'] == 0
+    assert cache.clear_expired() == 1
+
+
+def test_wal_file_shared_between_workers(path):
+    ScoreCache(path=path).set("complexity", "rhythm", 8.0)
+
+    other = ScoreCache(path=path)
+
+    assert other.get("complexity", "rhythm") == 8.0
+    assert other.stats()['disk_hits'] == 1
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_peek_counts_nothing(path):
+    cache = ScoreCache(path=path, max_entries=2)
+    cache.set("commonality", "a", 1.0)
+    cache.set("commonality", "b", 2.0)
+
+    assert cache.peek("commonality", "a") == 1.0
+    assert cache.peek("commonality", "missing") is None
+    # Peeking doesn't make "a" recently used, so it is still the one evicted
+    cache.set("commonality", "c", 3.0)
+
+    assert cache.stats()['memory_hits'] == cache.stats()['misses'] == 0
+    assert ("commonality", "a", "", "") not in cache.memory
+    assert cache.peek("commonality", "a") == 1.0
+    assert cache.stats()['disk_hits'] == 0
+
+
+def test_estimates_leave_cache_stats_alone():
+    cache = ScoreCache()
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0), cache=cache)
+
+    word_assessment.estimate_player_score(1, "sand", "Things at the beach")
+    word_assessment.estimate_combined("shell", 2, "Things at the beach")
+
+    assert cache.stats()['misses'] == 0
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "scored"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, "key", call)
+        started.wait(5)
+        followers = [executor.submit(flight.do, "key", call) for _ in range(3)]
+        while flight.stats()['coalesced'] < 3:
+            pass
+        release.set()
+
+        results = [leader.result(5)] + [follower.result(5) for follower in followers]
+
+    assert results == ["scored"] * 4
+    assert len(calls) == 1
+    assert flight.stats()['executed'] == 1
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_thread_error_reaches_every_caller():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def call():
+        started.set()
+        release.wait(5)
+        raise ValueError("malformed reply")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", call)
+        started.wait(5)
+        follower = executor.submit(flight.do, "key", call)
+        while flight.stats()['coalesced'] < 1:
+            pass
+        release.set()
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result(5)
+
+    # A failed call isn't remembered, the next one runs again
+    assert flight.do("key", lambda: "retried") == "retried"
+
+
+def test_coroutines_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "scored"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", call) for _ in range(4)))
+
+    assert asyncio.run(main()) == ["scored"] * 4
+    assert len(calls) == 1
+    assert flight.stats()['coalesced'] == 3
+
+
+def test_coroutine_error_reaches_every_caller():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError("malformed reply")
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelled_leader_leaves_followers_their_result():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.2)
+        return "scored"
+
+    async def main():
+        leader = asyncio.create_task(asyncio.wait_for(flight.ado("key", call), 0.05))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", call))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "scored"
+    assert flight.stats()['executed'] == 1
+
+
+def test_cancelled_follower_leaves_the_call_running():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "scored"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", call))
+        await asyncio.sleep(0.01)
+
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == "scored"
+
+
+def test_thread_follows_coroutine_leader():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    async def call():
+        started.set()
+        await asyncio.sleep(0.1)
+        return "scored"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def follow():
+            started.wait(5)
+            return flight.do("key", lambda: "not shared")
+
+        follower = executor.submit(follow)
+        assert asyncio.run(flight.ado("key", call)) == "scored"
+        assert follower.result(5) == "scored"
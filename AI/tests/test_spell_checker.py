@@ -0,0 +1,43 @@
+import pytest
+
+from Word_Assesment import Word_Assesment
+from fake_llm import FakeChatModel
+from spell_checker import SpellChecker
+
+
+@pytest.fixture
+def checker():
+    return SpellChecker(["bus", "box", "church", "hero", "piano", "berry", "toy", "cake", "dog", "glass", "bass", "busy"])
+
+
+@pytest.mark.parametrize("word", ["dog", "Dogs ", "cakes", "buses", "boxes", "churches", "heroes", "pianos", "berries",
+                                  "toys", "glasses"])
+def test_regular_plurals_are_known(checker, word):
+    assert checker.is_known(word)
+
+
+@pytest.mark.parametrize("word", ["buss", "boxs", "churchs", "berrys", "glasss", "dogses", "doges", "", "cat"])
+def test_misspelled_plurals_are_not(checker, word):
+    assert not checker.is_known(word)
+
+
+def test_suggest_closest_words(checker):
+    assert checker.suggest("buss") == ["bass", "bus", "busy"]
+    assert checker.suggest("dog") == ["dog"]
+    assert checker.suggest("zzzz") == []
+
+
+def test_bundled_dictionary():
+    checker = SpellChecker.load()
+
+    assert checker.is_known("apples")
+    assert not checker.is_known("appless")
+
+
+def test_result_suggests_spellings_for_unknown_words():
+    checker = SpellChecker(["sand", "shell", "beach"])
+    word_assessment = Word_Assesment(FakeChatModel(latency=0.0), spell_checker=checker)
+
+    result = word_assessment.evaluate_words(word_assessment.llm, "Things at the beach", {1: "sand", 2: "shel", 3: "xqzv"})
+
+    assert result['spelling_suggestions'] == {2: ["shell"]}
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from Word_Assesment import Word_Assesment
+from fake_llm import FakeChatModel
+from llm_stats import LLMCallStats
+
+PROMPT = "Things at the beach"
+# Same length and letter patterns, so the local estimates of all three tie
+WORDS = {'1': "cat", '2': "dog", '3': "pig"}
+
+
+def slow_tie_breaks(prompt: str):
+    return {'latency': 2.0} if '"winner"' in prompt else {'latency': 0.0}
+
+
+@pytest.mark.parametrize("scoring_mode", ["together", "separately", "batch"])
+def test_tied_round_stays_within_deadline(scoring_mode):
+    llm = FakeChatModel(latency=2.0)
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(llm, scoring_mode=scoring_mode, call_stats=stats)
+
+    started = time.monotonic()
+    result = word_assessment.evaluate_words(llm, PROMPT, dict(WORDS), deadline_seconds=0.3)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert result['tie_break'] is None
+    assert sorted(result['winners']) == ["Player 1", "Player 2", "Player 3"]
+    assert 'tie_break' not in stats.stats()
+
+
+def test_slow_pairwise_call_is_cut_off_at_deadline():
+    llm = FakeChatModel(per_call=slow_tie_breaks)
+    word_assessment = Word_Assesment(llm)
+    tied = [{'id': player_id, 'word': word, 'criteriaResult': 20.0, 'total': 20.0} for player_id, word in WORDS.items()]
+
+    started = time.monotonic()
+    result = word_assessment.rank_players(llm, PROMPT, tied, deadline=time.monotonic() + 0.3)
+
+    assert time.monotonic() - started < 1.0
+    assert result['tie_break'] is None
+    assert len(result['winners']) == 3
+
+
+def test_pairwise_call_decides_without_deadline():
+    llm = FakeChatModel(latency=0.0)
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(llm, call_stats=stats)
+    tied = [{'id': player_id, 'word': word, 'criteriaResult': 20.0, 'total': 20.0} for player_id, word in WORDS.items()]
+
+    result = word_assessment.rank_players(llm, PROMPT, tied)
+
+    assert stats.stats()['tie_break']['calls'] == 1
+    assert result['playerScores'][0]['id'] in [winner.split()[-1] for winner in result['winners']]
+
+
+def test_sub_scores_decide_before_llm():
+    llm = FakeChatModel(latency=0.0)
+    stats = LLMCallStats()
+    word_assessment = Word_Assesment(llm, call_stats=stats)
+    tied = [
+        {'id': 1, 'word': "sand", 'commonality': 3.0, 'complexity': 2.0, 'compatability': 10.0, 'total': 15.0},
+        {'id': 2, 'word': "shell", 'commonality': 3.0, 'complexity': 3.0, 'compatability': 9.0, 'total': 15.0},
+    ]
+
+    result = word_assessment.rank_players(llm, PROMPT, tied)
+
+    assert result['winners'] == ["Player 1"]
+    assert result['tie_break'] == "compatibility"
+    assert 'tie_break' not in stats.stats()
+
+
+def test_earlier_submission_wins():
+    llm = FakeChatModel(latency=0.0)
+    word_assessment = Word_Assesment(llm)
+    tied = [{'id': player_id, 'word': word, 'criteriaResult': 20.0, 'total': 20.0} for player_id, word in WORDS.items()]
+
+    result = word_assessment.rank_players(llm, PROMPT, tied, submitted={'1': 5.0, '2': 3.0, '3': 4.0})
+
+    assert result['winners'] == ["Player 2"]
+    assert result['tie_break'] == "submission_time"
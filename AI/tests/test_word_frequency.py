@@ -0,0 +1,39 @@
+import pytest
+
+from plurals import singulars
+from word_frequency import WordFrequencyIndex
+
+
+@pytest.fixture
+def index():
+    return WordFrequencyIndex([("bus", 3), ("cat", 2), ("berry", 5), ("hero", 6), ("church", 4), ("horse", 2)])
+
+
+@pytest.mark.parametrize("word, band", [("bus", 3), ("Cat ", 2), ("cats", 2), ("buses", 3), ("berries", 5),
+                                        ("heroes", 6), ("churches", 4), ("horses", 2)])
+def test_plurals_share_the_singular_band(index, word, band):
+    assert index.commonality(word) == band
+
+
+@pytest.mark.parametrize("word", ["buss", "cates", "berrys", "churchs", "dog", ""])
+def test_misspellings_get_no_band(index, word):
+    assert index.commonality(word) is None
+
+
+def test_bundled_bands():
+    index = WordFrequencyIndex.load()
+
+    assert index.commonality("cats") == index.commonality("cat") is not None
+    assert index.commonality("buss") is None
+    assert index.commonality("cates") is None
+
+
+def test_band_out_of_range():
+    with pytest.raises(ValueError):
+        WordFrequencyIndex([("cat", 11)])
+
+
+@pytest.mark.parametrize("word, expected", [("dogs", ["dog"]), ("buses", ["bus", "buse"]), ("berries", ["berry", "berrie"]), ("pies", ["pie"]),
+                                            ("toys", ["toy"]), ("buss", []), ("boxs", []), ("s", []), ("dog", [])])
+def test_singulars(word, expected):
+    assert singulars(word) == expected
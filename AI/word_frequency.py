@@ -0,0 +1,76 @@
+import logging
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Optional, Iterable, Tuple
+
+from plurals import word_forms
+
+logger = logging.getLogger(__name__)
+
+# Bundled commonality bands, same 1-10 scale as the score_word_commonality rubric
+DEFAULT_BANDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'word_commonality.txt')
+
+
+class WordFrequencyIndex:
+    """Maps a word to its 1-10 commonality band with one dict lookup into a byte array"""
+
+    def __init__(self, entries: Iterable[Tuple[str, int]]):
+        self.slots: Dict[str, int] = {}
+        self.bands = array('B')
+
+        for word, band in entries:
+            word = word.strip().lower()
+            if not word or word in self.slots:
+                continue
+
+            if not 1 <= band <= 10:
+                raise ValueError(f"Commonality band for '{word}' must be between 1 and 10, got {band}")
+
+            self.slots[word] = len(self.bands)
+            self.bands.append(band)
+
+        self.load_seconds = 0.0
+        self.memory_bytes = sys.getsizeof(self.slots) + self.bands.buffer_info()[1] * self.bands.itemsize
+
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BANDS_FILE) -> "WordFrequencyIndex":
+        """Read a '## <band>' sectioned word list"""
+
+        started = time.perf_counter()
+
+        entries = []
+        band = None
+        with open(path, encoding='utf-8') as bandsFile:
+            for line in bandsFile:
+                line = line.strip()
+
+                if line.startswith('##'):
+                    band = int(line[2:])
+                elif line and not line.startswith('#') and band is not None:
+                    entries.append((line, band))
+
+        index = cls(entries)
+        index.load_seconds = time.perf_counter() - started
+
+        logger.info("Loaded commonality bands for %d words in %.1fms", len(index), index.load_seconds * 1000)
+
+        return index
+
+
+    def __len__(self) -> int:
+        return len(self.bands)
+
+
+    def commonality(self, word: str) -> Optional[int]:
+        """The 1-10 commonality band, or None when the word isn't in the table"""
+
+        # Regular plurals share their singular's band
+        for form in word_forms(word.strip().lower()):
+            slot = self.slots.get(form)
+            if slot is not None:
+                return self.bands[slot]
+
+        return None
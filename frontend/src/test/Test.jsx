@@ -162,6 +162,9 @@ const Test = () => {
                   {scoreData.criteriaResult && (
                     <p className="detail-score">  - Criteria Result: {scoreData.criteriaResult.toFixed(1)}</p>
                   )}
+                  {evaluationResult.spelling_suggestions?.[scoreData.id] && (
+                    <p className="detail-score">  - Did you mean: {evaluationResult.spelling_suggestions[scoreData.id].join(', ')}?</p>
+                  )}
                 </div>
               ))}
               <h3>Winner(s): {evaluationResult.winners.join(', ')}!</h3>